@@ -0,0 +1,37 @@
+import json
+import os
+from flask import current_app, request, url_for
+
+# Surinkti (build_assets.py) front-end failai: static/dist/<vardas>.<hash>.min.js
+DIST_DIR = 'dist'
+MANIFEST_FILE = 'manifest.json'
+
+_manifest = None
+
+
+def init_app(app):
+    app.jinja_env.globals['asset_url'] = asset_url
+    app.after_request(_cache_hashed_assets)
+
+
+def load_manifest():
+    global _manifest
+    if _manifest is None or current_app.debug:
+        kelias = os.path.join(current_app.static_folder, DIST_DIR, MANIFEST_FILE)
+        try:
+            with open(kelias, encoding='utf-8') as f:
+                _manifest = json.load(f)
+        except FileNotFoundError:
+            raise RuntimeError(f"Nerastas {kelias}. Paleiskite: python build_assets.py")
+    return _manifest
+
+
+def asset_url(vardas):
+    return url_for('static', filename=load_manifest()[vardas])
+
+
+def _cache_hashed_assets(response):
+    # Failų vardai keičiasi kartu su turiniu, todėl naršyklė gali juos laikyti neribotai
+    if request.path.startswith(f"{current_app.static_url_path}/{DIST_DIR}/") and response.status_code == 200:
+        response.headers['Cache-Control'] = 'public, max-age=31536000, immutable'
+    return response
@@ -0,0 +1,96 @@
+"""Parko suvestinės (/admin/fleet) atsakymo laiko matavimas.
+
+Laikiname SQLite faile sukuriama --rides reisų --drivers vairuotojams
+--months mėnesių laikotarpiu, knygos užpildomos totals.rebuild(). Matuojama
+suvestinė be talpyklos (FLEET_CACHE_TTL=0) ir su ja.
+
+Naudojimas:
+    python bench_fleet.py --rides 1000000
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import date
+
+
+def matuoti(client, url, kartai):
+    laikai = []
+    for _ in range(kartai):
+        pradzia = time.perf_counter()
+        atsakymas = client.get(url)
+        laikai.append(time.perf_counter() - pradzia)
+        assert atsakymas.status_code == 200, atsakymas.status_code
+    return statistics.median(laikai) * 1000, max(laikai) * 1000
+
+
+def main(args):
+    from app import create_app
+    from models import db, User, RideResult
+    import totals
+    import vehicles
+
+    random.seed(1)
+    with tempfile.TemporaryDirectory() as katalogas:
+        app = create_app({
+            'SQLALCHEMY_DATABASE_URI': 'sqlite:///' + os.path.join(katalogas, 'bench.db'),
+            'LOG_LEVEL': 'CRITICAL',
+            'PASSWORD_HASH_METHOD': 'pbkdf2:sha256:1000',
+        })
+        with app.app_context():
+            db.create_all()
+            admin = User(username='admin', email='admin@example.com', is_admin=True)
+            admin.set_password('slaptazodis')
+            db.session.add(admin)
+            vairuotojai = [User(username=f'vairuotojas{i}', email=f'v{i}@example.com', password_hash='-')
+                           for i in range(args.drivers)]
+            db.session.add_all(vairuotojai)
+            db.session.commit()
+            ids = [v.id for v in vairuotojai]
+            automobiliai = sorted(vehicles.ensure(f'AUT{i:03d}' for i in range(args.vehicles)).items())
+
+            pradzia = time.perf_counter()
+            for dalis in range(0, args.rides, 100000):
+                eilutes = []
+                for i in range(dalis, min(dalis + 100000, args.rides)):
+                    men = i * args.months // args.rides
+                    diena = date(2022 + men // 12, men % 12 + 1, random.randint(1, 28))
+                    numeris, vehicle_id = random.choice(automobiliai)
+                    eilutes.append({
+                        'user_id': random.choice(ids), 'data': diena, 'vehicle_id': vehicle_id, 'auto_nr': numeris,
+                        'tasku_kiekis': 3, 'km_kiekis': random.randint(50, 400), 'pakrautos_paletes': 30,
+                        'tara': 10, 'atgalines_paletes': 2, 'eur_uz_reisa': random.uniform(80, 160),
+                        'menesis': diena.strftime('%Y-%m'), 'savaitgalis': False,
+                    })
+                db.session.execute(RideResult.__table__.insert(), eilutes)
+                db.session.commit()
+            eiluciu = totals.rebuild()
+            print(f"{args.rides} reisų, knygose {eiluciu} eilučių ({time.perf_counter() - pradzia:.0f} s)")
+
+        client = app.test_client()
+        client.post('/login', data={'username': 'admin', 'password': 'slaptazodis'})
+        urls = {
+            'vairuotojai, visi mėnesiai': '/admin/fleet?nuo=2022-01&iki=2030-12',
+            'automobiliai, 12 mėn.': '/admin/fleet?grupe=automobiliai&nuo=2023-01&iki=2023-12&rikiuoti=km_kiekis',
+            'vairuotojo detalės': f'/admin/fleet?nuo=2022-01&iki=2030-12&user_id={ids[0]}',
+            'automobilio detalės': f'/admin/fleet?grupe=automobiliai&nuo=2022-01&iki=2030-12&vehicle_id={automobiliai[0][1]}',
+        }
+        for ttl in (0, 30):
+            app.config['FLEET_CACHE_TTL'] = ttl
+            for pavadinimas, url in urls.items():
+                p50, didziausias = matuoti(client, url, args.repeat)
+                print(f"{'talpykla' if ttl else 'be talpyklos'}, {pavadinimas}: p50 {p50:.1f} ms, max {didziausias:.1f} ms")
+        with app.app_context():
+            db.engine.dispose()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rides', type=int, default=1000000)
+    parser.add_argument('--drivers', type=int, default=30)
+    parser.add_argument('--vehicles', type=int, default=19)
+    parser.add_argument('--months', type=int, default=36)
+    parser.add_argument('--repeat', type=int, default=20)
+    main(parser.parse_args())
@@ -0,0 +1,126 @@
+"""Reisų importo spartos matavimas.
+
+Sugeneruoja CSV (arba XLSX) failą su N eilučių, importuoja jį į laikiną
+SQLite DB per ride_import ir parodo eilutes per sekundę. Palyginimui
+pamatuojamas ir senas būdas – po vieną įrašą su atskiru commit'u, kaip
+daro index() POST.
+
+Naudojimas:
+    python bench_import.py                 # 100 000 eilučių, CSV
+    python bench_import.py --rows 100000 --format xlsx
+"""
+import argparse
+import csv
+import os
+import random
+import tempfile
+import time
+from datetime import date, timedelta
+
+STULPELIAI = ('data', 'auto_nr', 'km_kiekis', 'tasku_kiekis', 'pakrautos_paletes',
+              'tara', 'atgalines_paletes', 'savaitgalis', 'vartotojas')
+VAIRUOTOJU = 20
+
+
+def generate_rows(kiekis, seed=1):
+    rnd = random.Random(seed)
+    pradzia = date(2022, 1, 1)
+    for _ in range(kiekis):
+        diena = pradzia + timedelta(days=rnd.randrange(3 * 365))
+        yield (
+            diena.isoformat(), f'LCS{rnd.randrange(340, 361)}', rnd.randrange(20, 400),
+            rnd.randrange(1, 12), rnd.randrange(0, 40), rnd.randrange(0, 15),
+            rnd.randrange(0, 10), 'taip' if diena.weekday() >= 5 else 'ne',
+            f'vairuotojas{rnd.randrange(VAIRUOTOJU)}',
+        )
+
+
+def write_file(kelias, formatas, kiekis):
+    if formatas == 'xlsx':
+        from openpyxl import Workbook
+        knyga = Workbook(write_only=True)
+        lapas = knyga.create_sheet()
+        lapas.append(STULPELIAI)
+        for eilute in generate_rows(kiekis):
+            lapas.append(eilute)
+        knyga.save(kelias)
+    else:
+        with open(kelias, 'w', newline='', encoding='utf-8') as f:
+            rasytojas = csv.writer(f)
+            rasytojas.writerow(STULPELIAI)
+            rasytojas.writerows(generate_rows(kiekis))
+
+
+def baseline(app, kiekis):
+    """Po vieną įrašą su atskiru commit'u (senas kelias)."""
+    from models import db, RideResult
+    import rates
+    import totals
+    import vehicles
+    with app.app_context():
+        automobiliai = vehicles.id_map()
+        pradzia = time.perf_counter()
+        for eilute in generate_rows(kiekis, seed=2):
+            diena = date.fromisoformat(eilute[0])
+            irasas = RideResult(
+                user_id=1, data=diena, vehicle_id=automobiliai[eilute[1]], auto_nr=eilute[1], km_kiekis=eilute[2], tasku_kiekis=eilute[3],
+                pakrautos_paletes=eilute[4], tara=eilute[5], atgalines_paletes=eilute[6],
+                savaitgalis=eilute[7] == 'taip', menesis=diena.strftime('%Y-%m'),
+                eur_uz_reisa=rates.compute_one(diena, *eilute[2:7], eilute[7] == 'taip'),
+            )
+            db.session.add(irasas)
+            totals.add_ride(irasas)
+            db.session.commit()
+        return time.perf_counter() - pradzia
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--format', choices=('csv', 'xlsx'), default='csv')
+    parser.add_argument('--chunk-size', type=int, default=5000)
+    parser.add_argument('--baseline-rows', type=int, default=2000, help='0 – nematuoti seno būdo')
+    args = parser.parse_args()
+
+    from app import create_app
+    from models import db, User
+    import ride_import
+    import totals
+    import vehicles
+
+    with tempfile.TemporaryDirectory() as katalogas:
+        kelias = os.path.join(katalogas, f'reisai.{args.format}')
+        pradzia = time.perf_counter()
+        write_file(kelias, args.format, args.rows)
+        print(f"Failas sugeneruotas: {args.rows} eilučių, {os.path.getsize(kelias) / 1e6:.1f} MB, "
+              f"{time.perf_counter() - pradzia:.1f} s")
+
+        app = create_app({
+            'SQLALCHEMY_DATABASE_URI': 'sqlite:///' + os.path.join(katalogas, 'bench.db'),
+            'LOG_LEVEL': 'WARNING',
+        })
+        with app.app_context():
+            db.create_all()
+            for i in range(VAIRUOTOJU):
+                db.session.add(User(username=f'vairuotojas{i}', email=f'v{i}@example.com', password_hash='-'))
+            db.session.commit()
+            vehicles.ensure(f'LCS{nr}' for nr in range(340, 361))
+            vartotojai = dict(db.session.query(User.username, User.id).all())
+
+            with open(kelias, 'rb') as failas:
+                rezultatas = ride_import.import_rides(failas, args.format, None, vartotojai, args.chunk_size)
+            trukme = rezultatas['trukme']
+            print(f"Importas ({args.format}, partija {args.chunk_size}): {rezultatas['importuota']} eilučių per "
+                  f"{trukme:.2f} s – {rezultatas['importuota'] / trukme:,.0f} eil./s")
+            print(f"mėnesių sumos sutampa su ride_result: {'taip' if not totals.find_mismatches() else 'NE'}")
+
+        if args.baseline_rows:
+            trukme = baseline(app, args.baseline_rows)
+            print(f"Po vieną su commit'u: {args.baseline_rows} eilučių per {trukme:.2f} s – "
+                  f"{args.baseline_rows / trukme:,.0f} eil./s")
+        with app.app_context():
+            db.engine.dispose()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+"""Prisijungimų pralaidumo matavimas esant lygiagretumui.
+
+Vienas procesas su keliomis gijomis (kaip gunicorn --threads), kiekviena
+gija su savo test_client nuolat jungiasi (POST /login). Tuo pačiu metu
+viena gija įrašinėja reisus (POST /) – matuojama, kiek prisijungimai
+trukdo kitiems rašymams. Duomenų bazė – laikinas SQLite failas.
+
+Naudojimas:
+    python bench_login.py --threads 8 --seconds 10
+    python bench_login.py --method pbkdf2:sha256:600000 --hash-workers 2
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import threading
+import time
+
+RIDE = {
+    'data': '2024-10-14', 'auto_nr': 'LCS347', 'km_kiekis': '211', 'tasku_kiekis': '3',
+    'pakrautos_paletes': '36', 'tara': '11', 'atgalines_paletes': '0', 'savaitgalis': 'false',
+}
+
+
+def percentile(reiksmes, p):
+    reiksmes = sorted(reiksmes)
+    return reiksmes[min(int(len(reiksmes) * p), len(reiksmes) - 1)] if reiksmes else 0.0
+
+
+def main(args):
+    from app import create_app
+    from models import db, User
+    import vehicles
+
+    with tempfile.TemporaryDirectory() as katalogas:
+        app = create_app({
+            'SQLALCHEMY_DATABASE_URI': 'sqlite:///' + os.path.join(katalogas, 'bench.db'),
+            'LOG_LEVEL': 'CRITICAL',
+            'PASSWORD_HASH_METHOD': args.method,
+            'PASSWORD_HASH_WORKERS': args.hash_workers,
+        })
+        with app.app_context():
+            db.create_all()
+            for i in range(args.threads + 1):
+                user = User(username=f'vairuotojas{i}', email=f'v{i}@example.com')
+                user.set_password('slaptazodis')
+                db.session.add(user)
+            db.session.commit()
+            vehicles.ensure([RIDE['auto_nr']])
+
+        prisijungimai = [[] for _ in range(args.threads)]
+        rasymai = []
+        startas = threading.Barrier(args.threads + 2)
+        pabaiga = []
+
+        def jungtis(i):
+            client = app.test_client()
+            startas.wait()
+            while time.perf_counter() < pabaiga[0]:
+                pradzia = time.perf_counter()
+                atsakymas = client.post('/login', data={'username': f'vairuotojas{i}', 'password': 'slaptazodis'})
+                assert atsakymas.status_code == 302, atsakymas.status_code
+                prisijungimai[i].append(time.perf_counter() - pradzia)
+
+        def rasyti():
+            client = app.test_client()
+            client.post('/login', data={'username': f'vairuotojas{args.threads}', 'password': 'slaptazodis'})
+            startas.wait()
+            while time.perf_counter() < pabaiga[0]:
+                pradzia = time.perf_counter()
+                client.post('/', data=RIDE)
+                rasymai.append(time.perf_counter() - pradzia)
+                time.sleep(0.05)
+
+        gijos = [threading.Thread(target=jungtis, args=(i,)) for i in range(args.threads)]
+        gijos.append(threading.Thread(target=rasyti))
+        for gija in gijos:
+            gija.start()
+        pabaiga.append(time.perf_counter() + args.seconds)
+        startas.wait()
+        for gija in gijos:
+            gija.join()
+
+        visi = [t for sarasas in prisijungimai for t in sarasas]
+        print(f"{args.method}, gijų {args.threads}, maišos baseinas {args.hash_workers or '-'}: "
+              f"{len(visi) / args.seconds:.1f} prisijungimų/s, "
+              f"p50 {statistics.median(visi) * 1000:.0f} ms, p95 {percentile(visi, 0.95) * 1000:.0f} ms; "
+              f"reiso įrašymas p50 {statistics.median(rasymai) * 1000:.0f} ms, "
+              f"p95 {percentile(rasymai, 0.95) * 1000:.0f} ms")
+        with app.app_context():
+            db.engine.dispose()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--seconds', type=float, default=10)
+    parser.add_argument('--method', default='scrypt')
+    parser.add_argument('--hash-workers', type=int, default=0)
+    main(parser.parse_args())
@@ -0,0 +1,97 @@
+"""ride_result užklausų greitis be indeksų ir su jais.
+
+Naudojimas: python bench_ride_indexes.py [eilučių_kiekis ...]
+Pagal nutylėjimą matuoja 10k, 100k ir 1M eilučių.
+"""
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+from sqlalchemy import create_engine, insert, text
+
+from models import db, User, Vehicle, RideResult
+
+VARTOTOJU = 50
+KARTOJIMU = 30
+
+UZKLAUSOS = {
+    'index (user_id, menesis)': "SELECT * FROM ride_result WHERE user_id = :user_id AND menesis = :menesis",
+    'grafikai (user_id)': "SELECT * FROM ride_result WHERE user_id = :user_id",
+    'delete totals (user_id, SUM)': "SELECT SUM(eur_uz_reisa) FROM ride_result WHERE user_id = :user_id",
+    'datų intervalas (user_id, data)': "SELECT COUNT(*) FROM ride_result WHERE user_id = :user_id AND data BETWEEN :nuo AND :iki",
+}
+
+
+def uzpildyti(engine, kiekis):
+    db.metadata.create_all(engine, tables=[User.__table__, Vehicle.__table__, RideResult.__table__])
+    for indeksas in RideResult.__table__.indexes:
+        indeksas.drop(engine)
+
+    random.seed(1)
+    pradzia = date(2020, 1, 1)
+    with engine.begin() as conn:
+        conn.execute(insert(User.__table__), [
+            {'id': i, 'username': f'vairuotojas{i}', 'email': f'v{i}@example.com', 'password_hash': '-'}
+            for i in range(1, VARTOTOJU + 1)
+        ])
+        conn.execute(insert(Vehicle.__table__), [{'id': 1, 'numeris': 'LCS347', 'aktyvus': True}])
+        partija = []
+        for _ in range(kiekis):
+            diena = pradzia + timedelta(days=random.randrange(5 * 365))
+            partija.append({
+                'user_id': random.randint(1, VARTOTOJU), 'data': diena, 'vehicle_id': 1, 'auto_nr': 'LCS347',
+                'tasku_kiekis': 5, 'km_kiekis': 200, 'pakrautos_paletes': 20, 'tara': 2,
+                'atgalines_paletes': 3, 'eur_uz_reisa': 43.3, 'menesis': diena.strftime('%Y-%m'),
+                'savaitgalis': False,
+            })
+            if len(partija) == 10000:
+                conn.execute(insert(RideResult.__table__), partija)
+                partija = []
+        if partija:
+            conn.execute(insert(RideResult.__table__), partija)
+
+
+def matuoti(engine):
+    rezultatai = {}
+    with engine.connect() as conn:
+        for pavadinimas, sql in UZKLAUSOS.items():
+            laikai = []
+            for _ in range(KARTOJIMU):
+                metai = random.randint(2020, 2024)
+                parametrai = {
+                    'user_id': random.randint(1, VARTOTOJU),
+                    'menesis': f'{metai}-{random.randint(1, 12):02d}',
+                    'nuo': date(metai, 3, 1), 'iki': date(metai, 5, 31),
+                }
+                pradzia = time.perf_counter()
+                conn.execute(text(sql), parametrai).fetchall()
+                laikai.append((time.perf_counter() - pradzia) * 1000)
+            rezultatai[pavadinimas] = statistics.median(laikai)
+    return rezultatai
+
+
+def main(kiekiai):
+    for kiekis in kiekiai:
+        with tempfile.TemporaryDirectory() as katalogas:
+            engine = create_engine('sqlite:///' + os.path.join(katalogas, 'bench.db'))
+            uzpildyti(engine, kiekis)
+            be_indeksu = matuoti(engine)
+            for indeksas in RideResult.__table__.indexes:
+                indeksas.create(engine)
+            with engine.connect() as conn:
+                conn.execute(text('ANALYZE'))
+            su_indeksais = matuoti(engine)
+            engine.dispose()
+
+        print(f"\n{kiekis} eilučių (mediana, ms)")
+        print(f"{'užklausa':34} {'be indeksų':>12} {'su indeksais':>13}")
+        for pavadinimas in UZKLAUSOS:
+            print(f"{pavadinimas:34} {be_indeksu[pavadinimas]:12.2f} {su_indeksais[pavadinimas]:13.2f}")
+
+
+if __name__ == '__main__':
+    main([int(a) for a in sys.argv[1:]] or [10_000, 100_000, 1_000_000])
@@ -0,0 +1,51 @@
+"""Aplikacijos paleidimo (importo) trukmė ir DB prisijungimai jo metu.
+
+Kiekvienas matavimas – naujas Python procesas, kaip gunicorn worker'is
+ar `flask` CLI komanda.
+
+Naudojimas: python bench_startup.py [kartojimų_kiekis]
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+basedir = os.path.abspath(os.path.dirname(__file__))
+
+MATAVIMAS = """
+import json, time
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+prisijungimai = []
+event.listen(Engine, 'connect', lambda *a: prisijungimai.append(1))
+pradzia = time.perf_counter()
+import app
+importas = time.perf_counter() - pradzia
+pradzia = time.perf_counter()
+for _ in range(20):
+    app.create_app()
+create_app = (time.perf_counter() - pradzia) / 20
+print(json.dumps({'importas': importas, 'create_app': create_app, 'prisijungimai': len(prisijungimai)}))
+"""
+
+
+def main(kartojimu):
+    importai, kurimai, prisijungimai = [], [], []
+    for _ in range(kartojimu):
+        rezultatas = subprocess.run(
+            [sys.executable, '-c', MATAVIMAS], cwd=basedir,
+            capture_output=True, text=True, check=True
+        )
+        duomenys = json.loads(rezultatas.stdout.strip().splitlines()[-1])
+        importai.append(duomenys['importas'] * 1000)
+        kurimai.append(duomenys['create_app'] * 1000)
+        prisijungimai.append(duomenys['prisijungimai'])
+
+    print(f"import app:           mediana {statistics.median(importai):.1f} ms, min {min(importai):.1f} ms")
+    print(f"create_app():         mediana {statistics.median(kurimai):.2f} ms")
+    print(f"DB prisijungimai importuojant: {max(prisijungimai)}")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10)
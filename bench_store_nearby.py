@@ -0,0 +1,63 @@
+"""Artimiausių parduotuvių paieškos matavimas: KD medis ir perrinkimas.
+
+Sugeneruoja N atsitiktinių taškų Lietuvos ribose, pastato geo.StoreLocator
+ir kiekvienai užklausai palygina rezultatą su visų taškų perrinkimu pagal
+haversine atstumą (turi sutapti) bei abiejų būdų trukmę.
+
+Naudojimas: python bench_store_nearby.py [taškų_kiekis]
+"""
+import math
+import random
+import statistics
+import sys
+import time
+
+UZKLAUSU = 200
+KIEK = 10
+
+
+def haversine_km(platuma1, ilguma1, platuma2, ilguma2):
+    fi1, fi2 = math.radians(platuma1), math.radians(platuma2)
+    dfi, dlambda = fi2 - fi1, math.radians(ilguma2 - ilguma1)
+    a = math.sin(dfi / 2) ** 2 + math.cos(fi1) * math.cos(fi2) * math.sin(dlambda / 2) ** 2
+    return 2 * 6371.0088 * math.asin(math.sqrt(a))
+
+
+def main(kiekis):
+    import geo
+
+    rnd = random.Random(1)
+    taskai = [(i, f'Parduotuvė {i}', '', rnd.uniform(53.9, 56.45), rnd.uniform(21.0, 26.8)) for i in range(kiekis)]
+    pradzia = time.perf_counter()
+    locator = geo.StoreLocator(taskai)
+    print(f"Taškų: {kiekis}, KD medis pastatytas per {(time.perf_counter() - pradzia) * 1000:.0f} ms")
+
+    medis_ms, perrinkimas_ms, spindulys_ms = [], [], []
+    for _ in range(UZKLAUSU):
+        platuma, ilguma = rnd.uniform(53.9, 56.45), rnd.uniform(21.0, 26.8)
+
+        pradzia = time.perf_counter()
+        rasti = locator.nearest(platuma, ilguma, KIEK)
+        medis_ms.append((time.perf_counter() - pradzia) * 1000)
+
+        pradzia = time.perf_counter()
+        visi = sorted((haversine_km(platuma, ilguma, p[3], p[4]), p[0]) for p in taskai)[:KIEK]
+        perrinkimas_ms.append((time.perf_counter() - pradzia) * 1000)
+
+        if [p['id'] for p in rasti] != [i for _, i in visi]:
+            raise SystemExit(f"Nesutampa ties ({platuma}, {ilguma})")
+        for p, (atstumas, _) in zip(rasti, visi):
+            assert abs(p['atstumas_km'] - atstumas) < 0.01
+
+        pradzia = time.perf_counter()
+        spinduly = locator.nearest(platuma, ilguma, 1000, spindulys_km=5)
+        spindulys_ms.append((time.perf_counter() - pradzia) * 1000)
+        assert len(spinduly) == sum(1 for p in taskai if haversine_km(platuma, ilguma, p[3], p[4]) <= 5)
+
+    print(f"{KIEK} artimiausių: KD medis {statistics.median(medis_ms):.3f} ms, "
+          f"perrinkimas {statistics.median(perrinkimas_ms):.1f} ms (medianos, {UZKLAUSU} užklausų, rezultatai sutampa)")
+    print(f"Visos 5 km spinduliu: KD medis {statistics.median(spindulys_ms):.3f} ms")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
@@ -0,0 +1,88 @@
+"""Parduotuvių paieškos spartos matavimas: ILIKE '%q%', FTS5 ir atminties indeksas.
+
+Sukuria laikiną SQLite DB per migracijas (kartu su store_fts ir
+trigeriais), prideda N sugeneruotų parduotuvių ir kiekvienai užklausai
+pamatuoja seną ILIKE paiešką (be limito, kaip buvo store_search(), ir su
+tuo pačiu limitu), FTS5 paiešką ir autocomplete trigramų indeksą
+(store_index), bei rastų įrašų skaičių.
+
+Naudojimas: python bench_store_search.py [parduotuvių_kiekis]
+"""
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+TINKLAI = ['Maxima', 'IKI', 'Rimi', 'Lidl', 'Norfa', 'Aibė', 'Šilas', 'Čia market', 'Vynoteka', 'Express market']
+MIESTAI = ['Vilnius', 'Kaunas', 'Klaipėda', 'Šiauliai', 'Panevėžys', 'Alytus', 'Marijampolė', 'Mažeikiai',
+           'Jonava', 'Utena', 'Kėdainiai', 'Telšiai', 'Tauragė', 'Ukmergė', 'Visaginas', 'Plungė',
+           'Kretinga', 'Šilutė', 'Radviliškis', 'Palanga']
+GATVES = ['Vilniaus g.', 'Žalgirio g.', 'Šiaulių g.', 'Liepų g.', 'Taikos pr.', 'Savanorių pr.',
+          'Ąžuolų g.', 'Pušų g.', 'Kęstučio g.', 'Gedimino pr.', 'Basanavičiaus g.', 'Čiurlionio g.']
+UZKLAUSOS = ['Maxima', 'siauliai', 'Šiauliai', 'zalgirio', 'kaun', 'iki kedainiai', 'Lidl Klaip', 'norfa taikos',
+              'maksima', 'siaulei', 'kedainei']
+KARTOJIMU = 5
+
+
+def generate_stores(kiekis, seed=1):
+    rnd = random.Random(seed)
+    for i in range(kiekis):
+        miestas = rnd.choice(MIESTAI)
+        yield {
+            'pavadinimas': f'{rnd.choice(TINKLAI)} {miestas} {i}',
+            'adresas': f'{rnd.choice(GATVES)} {rnd.randrange(1, 200)}, {miestas}',
+            'apskritis': f'{miestas} apskr.',
+        }
+
+
+def measure(funkcija):
+    trukmes = []
+    for _ in range(KARTOJIMU):
+        pradzia = time.perf_counter()
+        rezultatai = funkcija()
+        trukmes.append((time.perf_counter() - pradzia) * 1000)
+    return statistics.median(trukmes), len(rezultatai)
+
+
+def main(kiekis):
+    from flask_migrate import upgrade
+    from sqlalchemy import insert
+    from app import create_app, basedir
+    from models import db, Store
+    import store_index
+    import store_search
+
+    with tempfile.TemporaryDirectory() as katalogas:
+        app = create_app({
+            'SQLALCHEMY_DATABASE_URI': 'sqlite:///' + os.path.join(katalogas, 'bench.db'),
+            'LOG_LEVEL': 'WARNING',
+        })
+        with app.app_context():
+            upgrade(directory=os.path.join(basedir, 'migrations'))
+            pradzia = time.perf_counter()
+            db.session.execute(insert(Store), list(generate_stores(kiekis)))
+            db.session.commit()
+            print(f"Parduotuvių: {kiekis}, įrašyta (su FTS trigeriais) per {time.perf_counter() - pradzia:.1f} s")
+
+            pradzia = time.perf_counter()
+            indeksas = store_index.build()
+            print(f"Indeksas sukurtas per {time.perf_counter() - pradzia:.2f} s, trigramų: {len(indeksas.trigramos)}")
+
+            limitas = store_search.RESULT_LIMIT
+            print(f"{'užklausa':<16} {'ILIKE ms':>9} {'rasta':>6} {f'ILIKE/{limitas} ms':>12} {'FTS5 ms':>9} {'rasta':>6}"
+                  f" {'indeksas ms':>12} {'rasta':>6}")
+            for uzklausa in UZKLAUSOS:
+                # Sena paieška – be limito, ir ta pati su tuo pačiu limitu kaip FTS
+                like_ms, like_rasta = measure(lambda: store_search.search_like(uzklausa, None))
+                like_lim_ms, _ = measure(lambda: store_search.search_like(uzklausa, limitas))
+                fts_ms, fts_rasta = measure(lambda: store_search.search_fts(uzklausa, limitas))
+                idx_ms, idx_rasta = measure(lambda: indeksas.search(uzklausa, limitas))
+                print(f"{uzklausa:<16} {like_ms:>9.1f} {like_rasta:>6} {like_lim_ms:>12.1f} {fts_ms:>9.1f} {fts_rasta:>6}"
+                      f" {idx_ms:>12.2f} {idx_rasta:>6}")
+            db.engine.dispose()
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50000)
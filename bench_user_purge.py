@@ -0,0 +1,121 @@
+"""Vartotojo trynimo su daug reisų matavimas.
+
+Laikiname SQLite faile sukuriamas vartotojas su --rides reisų. Administratorius
+jį ištrina (POST /admin/delete_user/<id>), o tuo metu kitas vairuotojas nuolat
+įrašinėja reisus (POST /) – matuojama trynimo trukmė ir kiek jis trukdo
+kitiems rašymams.
+
+Naudojimas:
+    python bench_user_purge.py --rides 200000
+    python bench_user_purge.py --rides 200000 --chunk-size 500 --pause 0
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+
+RIDE = {
+    'data': '2024-10-14', 'auto_nr': 'LCS347', 'km_kiekis': '211', 'tasku_kiekis': '3',
+    'pakrautos_paletes': '36', 'tara': '11', 'atgalines_paletes': '0', 'savaitgalis': 'false',
+}
+
+
+def percentile(reiksmes, p):
+    reiksmes = sorted(reiksmes)
+    return reiksmes[min(int(len(reiksmes) * p), len(reiksmes) - 1)] if reiksmes else 0.0
+
+
+def main(args):
+    from app import create_app
+    from models import db, User, RideResult, BackgroundJob
+    import totals
+    import user_purge
+    import vehicles
+
+    user_purge.CHUNK_SIZE = args.chunk_size
+    user_purge.PAUSE = args.pause
+    with tempfile.TemporaryDirectory() as katalogas:
+        app = create_app({
+            'SQLALCHEMY_DATABASE_URI': 'sqlite:///' + os.path.join(katalogas, 'bench.db'),
+            'LOG_LEVEL': 'CRITICAL',
+            'PASSWORD_HASH_METHOD': 'pbkdf2:sha256:1000',
+        })
+        with app.app_context():
+            db.create_all()
+            vartotojai = []
+            for vardas, admin in (('admin', True), ('trinamas', False), ('vairuotojas', False)):
+                user = User(username=vardas, email=f'{vardas}@example.com', is_admin=admin)
+                user.set_password('slaptazodis')
+                db.session.add(user)
+                vartotojai.append(user)
+            db.session.commit()
+            trinamas_id = vartotojai[1].id
+            vehicle_id = vehicles.ensure([RIDE['auto_nr']])[RIDE['auto_nr']]
+            pradzia = date(2020, 1, 1)
+            eilutes = []
+            for i in range(args.rides):
+                diena = pradzia + timedelta(days=i % 1500)
+                eilutes.append({
+                    'user_id': trinamas_id, 'data': diena, 'vehicle_id': vehicle_id, 'auto_nr': 'LCS347', 'tasku_kiekis': 3,
+                    'km_kiekis': 211, 'pakrautos_paletes': 36, 'tara': 11, 'atgalines_paletes': 0,
+                    'eur_uz_reisa': 100.0, 'menesis': diena.strftime('%Y-%m'), 'savaitgalis': False,
+                })
+            db.session.execute(RideResult.__table__.insert(), eilutes)
+            db.session.commit()
+            totals.rebuild()
+
+        rasymai = []
+        baigta = threading.Event()
+
+        def rasyti():
+            client = app.test_client()
+            client.post('/login', data={'username': 'vairuotojas', 'password': 'slaptazodis'})
+            while not baigta.is_set():
+                pradzia = time.perf_counter()
+                client.post('/', data=RIDE)
+                rasymai.append(time.perf_counter() - pradzia)
+                time.sleep(0.02)
+
+        admin = app.test_client()
+        admin.post('/login', data={'username': 'admin', 'password': 'slaptazodis'})
+        gija = threading.Thread(target=rasyti)
+        gija.start()
+        time.sleep(0.5)
+
+        pradzia = time.perf_counter()
+        atsakymas = admin.post(f'/admin/delete_user/{trinamas_id}')
+        atsakymo_laikas = time.perf_counter() - pradzia
+        assert atsakymas.status_code == 302, atsakymas.status_code
+        with app.app_context():
+            job_id = db.session.scalar(db.select(BackgroundJob.id).order_by(BackgroundJob.id.desc()))
+            while True:
+                job = db.session.get(BackgroundJob, job_id)
+                busena = job.busena
+                db.session.rollback()
+                if busena in ('baigta', 'klaida'):
+                    break
+                time.sleep(0.05)
+            trukme = time.perf_counter() - pradzia
+            liko = db.session.scalar(db.select(db.func.count(RideResult.id)).where(RideResult.user_id == trinamas_id))
+            assert busena == 'baigta' and liko == 0 and db.session.get(User, trinamas_id) is None
+            db.session.rollback()
+        baigta.set()
+        gija.join()
+
+        print(f"{args.rides} reisų, dalis {args.chunk_size}, pauzė {args.pause} s: atsakymas {atsakymo_laikas * 1000:.0f} ms, "
+              f"trynimas {trukme:.2f} s; kito vairuotojo reiso įrašymas "
+              f"p50 {statistics.median(rasymai) * 1000:.0f} ms, p95 {percentile(rasymai, 0.95) * 1000:.0f} ms, "
+              f"max {max(rasymai) * 1000:.0f} ms")
+        with app.app_context():
+            db.engine.dispose()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rides', type=int, default=200000)
+    parser.add_argument('--chunk-size', type=int, default=2000)
+    parser.add_argument('--pause', type=float, default=0.05)
+    main(parser.parse_args())
@@ -0,0 +1,65 @@
+"""Front-end komponentų surinkimas.
+
+JSX paverčiamas į paprastą JS (esbuild transform), minifikuojamas ir
+įrašomas į static/dist/<vardas>.<hash>.min.js. Šablonai failus randa per
+static/dist/manifest.json (žr. assets.py), todėl naršyklėje nebereikia Babel.
+
+React, ReactDOM, Recharts ir Chart.js imami iš globalių production UMD
+skriptų, įtrauktų šablonuose.
+
+Naudojimas: python build_assets.py
+"""
+import glob
+import hashlib
+import json
+import os
+import sys
+
+import rjsmin
+from esbuild_py import transform
+
+basedir = os.path.abspath(os.path.dirname(__file__))
+STATIC_DIR = os.path.join(basedir, 'static')
+DIST_DIR = os.path.join(STATIC_DIR, 'dist')
+
+ENTRIES = {
+    'index': 'js/src/index.jsx',
+    'grafikai': 'js/src/grafikai.jsx',
+    'edit': 'js/src/edit.jsx',
+    'app': 'js/App.js',
+}
+
+
+def build_entry(vardas, saltinis):
+    with open(os.path.join(STATIC_DIR, saltinis), encoding='utf-8') as f:
+        kodas = f.read()
+    js = transform(kodas)
+    if js is None:
+        raise SystemExit(f"Nepavyko sukompiliuoti {saltinis}")
+    # Kiekvienas paketas savo srityje, kad kintamieji nepatektų į window
+    js = rjsmin.jsmin(f"(function(){{'use strict';{js}\n}})();\n")
+    hash_ = hashlib.sha256(js.encode('utf-8')).hexdigest()[:10]
+    failas = f"{vardas}.{hash_}.min.js"
+    with open(os.path.join(DIST_DIR, failas), 'w', encoding='utf-8') as f:
+        f.write(js)
+    return failas, len(kodas), len(js)
+
+
+def main():
+    os.makedirs(DIST_DIR, exist_ok=True)
+    for senas in glob.glob(os.path.join(DIST_DIR, '*.min.js')):
+        os.remove(senas)
+
+    manifest = {}
+    for vardas, saltinis in ENTRIES.items():
+        failas, pradinis, galutinis = build_entry(vardas, saltinis)
+        manifest[vardas] = f"dist/{failas}"
+        print(f"{saltinis} -> dist/{failas} ({pradinis} -> {galutinis} B)")
+
+    with open(os.path.join(DIST_DIR, 'manifest.json'), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,137 @@
+"""Paprasta talpykla retai kintantiems duomenims (parduotuvių katalogas ir pan.).
+
+Numatytai – procese laikomas LRU su galiojimo laiku. Kai nustatytas
+CACHE_REDIS_URL, naudojamas bendras Redis, kad visi worker'iai matytų tą
+patį turinį ir tą patį invalidavimą (reikia `pip install redis`).
+
+Invalidavimas – per vardų sritis: cache.bump('stores') padidina srities
+versiją, o versija įeina į kiekvieną raktą, todėl seni įrašai tiesiog
+nebenaudojami ir išstumiami LRU/TTL.
+"""
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+
+class LocalBackend:
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.irasai = OrderedDict()
+        # Versijos laikomos atskirai, kad LRU jų neišstumtų
+        self.versijos = {}
+        self.lock = threading.Lock()
+
+    def get(self, raktas):
+        with self.lock:
+            irasas = self.irasai.get(raktas)
+            if irasas is None:
+                return None
+            reiksme, galioja_iki = irasas
+            if galioja_iki is not None and galioja_iki < time.monotonic():
+                del self.irasai[raktas]
+                return None
+            self.irasai.move_to_end(raktas)
+            return reiksme
+
+    def set(self, raktas, reiksme, ttl):
+        with self.lock:
+            self.irasai[raktas] = (reiksme, time.monotonic() + ttl if ttl else None)
+            self.irasai.move_to_end(raktas)
+            while len(self.irasai) > self.maxsize:
+                self.irasai.popitem(last=False)
+
+    def version(self, sritis):
+        return self.versijos.get(sritis, 0)
+
+    def bump(self, sritis):
+        with self.lock:
+            self.versijos[sritis] = self.versijos.get(sritis, 0) + 1
+            return self.versijos[sritis]
+
+    def clear(self):
+        with self.lock:
+            self.irasai.clear()
+            self.versijos.clear()
+
+
+class RedisBackend:
+    def __init__(self, url, prefiksas):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("Nustatytas CACHE_REDIS_URL, bet neįdiegtas redis paketas: pip install redis")
+        self.client = redis.Redis.from_url(url)
+        self.prefiksas = prefiksas
+
+    def get(self, raktas):
+        reiksme = self.client.get(self.prefiksas + raktas)
+        return None if reiksme is None else json.loads(reiksme)
+
+    def set(self, raktas, reiksme, ttl):
+        self.client.set(self.prefiksas + raktas, json.dumps(reiksme), ex=ttl or None)
+
+    def version(self, sritis):
+        return int(self.client.get(f'{self.prefiksas}v:{sritis}') or 0)
+
+    def bump(self, sritis):
+        return self.client.incr(f'{self.prefiksas}v:{sritis}')
+
+    def clear(self):
+        for raktas in self.client.scan_iter(self.prefiksas + '*'):
+            self.client.delete(raktas)
+
+
+class Cache:
+    def __init__(self, app=None):
+        self.backend = None
+        self.default_ttl = 300
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('CACHE_REDIS_URL', None)
+        app.config.setdefault('CACHE_MAXSIZE', 1024)
+        app.config.setdefault('CACHE_DEFAULT_TTL', 300)
+        app.config.setdefault('CACHE_KEY_PREFIX', 'rivona:')
+        self.default_ttl = app.config['CACHE_DEFAULT_TTL']
+        if app.config['CACHE_REDIS_URL']:
+            self.backend = RedisBackend(app.config['CACHE_REDIS_URL'], app.config['CACHE_KEY_PREFIX'])
+        else:
+            self.backend = LocalBackend(app.config['CACHE_MAXSIZE'])
+        app.extensions['cache'] = self
+
+    def cached(self, sritis, raktas, kurti, ttl=None):
+        """Grąžina reikšmę iš talpyklos arba ją sukuria su kurti() ir išsaugo.
+
+        Reikšmė turi būti JSON tipo (dėl Redis). Talpyklos klaida netrukdo
+        atsakymui – tada reikšmė tiesiog sukuriama iš naujo.
+        """
+        try:
+            pilnas_raktas = f'{sritis}:{self.backend.version(sritis)}:{raktas}'
+            reiksme = self.backend.get(pilnas_raktas)
+        except Exception:
+            logger.warning("Talpykla nepasiekiama, skaitome iš DB", exc_info=True)
+            return kurti()
+        if reiksme is not None:
+            return reiksme
+
+        reiksme = kurti()
+        try:
+            self.backend.set(pilnas_raktas, reiksme, self.default_ttl if ttl is None else ttl)
+        except Exception:
+            logger.warning("Nepavyko įrašyti į talpyklą", exc_info=True)
+        return reiksme
+
+    def bump(self, sritis):
+        """Pažymi visus srities įrašus kaip pasenusius."""
+        try:
+            self.backend.bump(sritis)
+        except Exception:
+            logger.error("Nepavyko invaliduoti talpyklos srities %s", sritis, exc_info=True)
+
+    def clear(self):
+        self.backend.clear()
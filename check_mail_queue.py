@@ -0,0 +1,199 @@
+"""Patikrina laiškų eilės siuntimą (mail_queue.send_batch) su vietiniu SMTP serveriu.
+
+Kaip ir check_db_backend.py, atstoja testų rinkinį, kurio repozitorijoje
+nėra: CI paleidžia `python check_mail_queue.py` ir žiūri į išėjimo kodą
+(0 – sėkmingai, 1 – nepavyko bent vienas žingsnis, 2 – nepavyko paruošti
+DB ar SMTP serverio).
+
+Laiškai siunčiami tikram SMTP serveriui šiame procese (SmtpStandIn,
+127.0.0.1, laisvas prievadas) per Flask-Mail ir smtplib, kaip gamyboje.
+Serveris ATMESTI gavėjui atsako 550, o gavus NUTRAUKTI gavėją nutraukia
+prisijungimą. Tikrinama:
+
+  - partija išsiunčiama per vieną prisijungimą;
+  - 550 vienam gavėjui atideda tik tą laišką, kiti išsiunčiami;
+  - nutrūkus prisijungimui siunčiamas laiškas laikomas bandytu, o likę
+    grąžinami į eilę nepadidinus bandymų skaičiaus.
+
+DB visada laikina SQLite (DATABASE_URL nenaudojamas): send_batch paima
+visus laukiančius laiškus, tad bendroje DB išsiųstų ir tikrus.
+"""
+import os
+import socketserver
+import sys
+import tempfile
+import threading
+import traceback
+from datetime import datetime
+
+from flask_migrate import upgrade
+
+from app import create_app, basedir
+from check_db_backend import Patikra
+from models import db, OutboundMail
+import mail_queue
+
+DOMENAS = 'patikra.example'
+ATMESTI = 'atmesti@' + DOMENAS
+NUTRAUKTI = 'nutraukti@' + DOMENAS
+
+
+class _SmtpHandler(socketserver.StreamRequestHandler):
+    """Tiek SMTP, kiek reikia smtplib.sendmail: EHLO, MAIL, RCPT, DATA, RSET, QUIT."""
+
+    def atsakyti(self, eilute):
+        self.wfile.write(eilute.encode('ascii') + b'\r\n')
+
+    def handle(self):
+        with self.server.lock:
+            self.server.prisijungimai += 1
+        self.atsakyti('220 patikra ESMTP')
+        gavejai = []
+        for eilute in self.rfile:
+            komanda = eilute.decode('utf-8', 'replace').strip()
+            veiksmas = komanda[:4].upper()
+            if veiksmas in ('EHLO', 'HELO'):
+                self.atsakyti('250 patikra')
+            elif veiksmas == 'MAIL':
+                gavejai = []
+                self.atsakyti('250 OK')
+            elif veiksmas == 'RCPT':
+                adresas = komanda.split(':', 1)[1].split()[0].strip('<>')
+                if adresas == NUTRAUKTI:
+                    # Prisijungimas nutraukiamas neatsakius
+                    return
+                if adresas == ATMESTI:
+                    self.atsakyti('550 5.1.1 No such user')
+                else:
+                    gavejai.append(adresas)
+                    self.atsakyti('250 OK')
+            elif veiksmas == 'DATA':
+                self.atsakyti('354 End data with <CR><LF>.<CR><LF>')
+                for turinys in self.rfile:
+                    if turinys.rstrip(b'\r\n') == b'.':
+                        break
+                with self.server.lock:
+                    self.server.gauti.extend(gavejai)
+                self.atsakyti('250 OK')
+            elif veiksmas == 'QUIT':
+                self.atsakyti('221 Bye')
+                return
+            else:
+                self.atsakyti('250 OK')
+
+
+class SmtpStandIn(socketserver.ThreadingTCPServer):
+    """Vietinis SMTP serveris: skaičiuoja prisijungimus ir gautų laiškų gavėjus."""
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), _SmtpHandler)
+        self.lock = threading.Lock()
+        self.prisijungimai = 0
+        self.gauti = []
+
+    @property
+    def port(self):
+        return self.server_address[1]
+
+    def reset(self):
+        with self.lock:
+            self.prisijungimai = 0
+            self.gauti = []
+
+
+def adresas(vardas):
+    return f'{vardas}@{DOMENAS}'
+
+
+def busenos(gavejai):
+    """gavėjas -> (būsena, bandymai, ar atidėtas į ateitį)."""
+    dabar = datetime.utcnow()
+    eilutes = db.session.execute(
+        db.select(OutboundMail.gavejas, OutboundMail.busena, OutboundMail.bandymai, OutboundMail.kitas_bandymas)
+        .where(OutboundMail.gavejas.in_(gavejai))
+    ).all()
+    db.session.rollback()
+    return {gavejas: (busena, bandymai, kitas > dabar) for gavejas, busena, bandymai, kitas in eilutes}
+
+
+def check(app, serveris, patikra):
+    def siusti(gavejai):
+        serveris.reset()
+        for gavejas in gavejai:
+            mail_queue.enqueue(gavejas, 'Patikra', 'Tekstas')
+        return mail_queue.send_batch()
+
+    def viena_partija():
+        gavejai = [adresas(f'vairuotojas{i}') for i in range(5)]
+        rezultatas = siusti(gavejai)
+        assert rezultatas == (5, 0), f"send_batch grąžino {rezultatas}, tikėtasi (5, 0)"
+        assert serveris.prisijungimai == 1, f"prisijungimų {serveris.prisijungimai}, tikėtasi 1"
+        assert sorted(serveris.gauti) == sorted(gavejai), f"serveris gavo {serveris.gauti}"
+        liko = {g: b for g, b in busenos(gavejai).items() if b[:2] != ('issiusta', 1)}
+        assert not liko, f"neišsiųsti: {liko}"
+
+    def atmestas_gavejas():
+        pirmas, antras = adresas('pirmas'), adresas('antras')
+        rezultatas = siusti([pirmas, ATMESTI, antras])
+        assert rezultatas == (2, 1), f"send_batch grąžino {rezultatas}, tikėtasi (2, 1)"
+        assert serveris.prisijungimai == 1, f"prisijungimų {serveris.prisijungimai}, tikėtasi 1"
+        assert sorted(serveris.gauti) == sorted([pirmas, antras]), f"serveris gavo {serveris.gauti}"
+        b = busenos([pirmas, ATMESTI, antras])
+        assert b[ATMESTI] == ('laukia', 1, True), f"atmestas laiškas: {b[ATMESTI]}, tikėtasi atidėtas su 1 bandymu"
+        assert b[pirmas][0] == b[antras][0] == 'issiusta', f"kiti laiškai: {b}"
+
+    def nutrukes_prisijungimas():
+        pries, po = adresas('pries'), [adresas('po1'), adresas('po2')]
+        rezultatas = siusti([pries, NUTRAUKTI, *po])
+        assert rezultatas == (1, 3), f"send_batch grąžino {rezultatas}, tikėtasi (1, 3)"
+        assert serveris.gauti == [pries], f"serveris gavo {serveris.gauti}"
+        b = busenos([pries, NUTRAUKTI, *po])
+        assert b[pries][0] == 'issiusta', f"laiškas prieš nutrūkimą: {b[pries]}"
+        assert b[NUTRAUKTI] == ('laukia', 1, True), f"siųstas nutrūkus: {b[NUTRAUKTI]}, tikėtasi 1 bandymas"
+        for gavejas in po:
+            assert b[gavejas][:2] == ('laukia', 0), f"{gavejas}: {b[gavejas]}, tikėtasi grąžintas be bandymo"
+
+    patikra.zingsnis("partija siunčiama per vieną SMTP prisijungimą", viena_partija)
+    patikra.zingsnis("550 vienam gavėjui atideda tik jo laišką", atmestas_gavejas)
+    patikra.zingsnis("nutrūkus prisijungimui likę laiškai grąžinami be bandymo", nutrukes_prisijungimas)
+
+
+def main():
+    patikra = Patikra()
+    with tempfile.TemporaryDirectory() as katalogas:
+        try:
+            serveris = SmtpStandIn()
+            threading.Thread(target=serveris.serve_forever, daemon=True).start()
+            app = create_app({
+                'LOG_LEVEL': 'WARNING',
+                'SQLALCHEMY_DATABASE_URI': 'sqlite:///' + os.path.join(katalogas, 'patikra.db'),
+                'MAIL_SERVER': '127.0.0.1', 'MAIL_PORT': serveris.port,
+                'MAIL_USE_TLS': False, 'MAIL_USE_SSL': False, 'MAIL_USERNAME': None, 'MAIL_PASSWORD': None,
+                'MAIL_DEFAULT_SENDER': adresas('rivona'), 'MAIL_SUPPRESS_SEND': False,
+                'MAIL_QUEUE_THREAD': False,
+            })
+            with app.app_context():
+                upgrade(directory=os.path.join(basedir, 'migrations'))
+        except Exception:
+            traceback.print_exc()
+            print("Nepavyko paruošti DB ar SMTP serverio.")
+            return 2
+
+        try:
+            with app.app_context():
+                check(app, serveris, patikra)
+                db.engine.dispose()
+        finally:
+            serveris.shutdown()
+            serveris.server_close()
+
+    if patikra.klaidos:
+        print(f"Nepavyko: {len(patikra.klaidos)} – {', '.join(patikra.klaidos)}")
+        return 1
+    print("Visi patikrinimai sėkmingi.")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
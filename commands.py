@@ -0,0 +1,290 @@
+import click
+from flask.cli import with_appcontext
+from sqlalchemy import inspect
+from models import db, User, PayRate, BackgroundJob, Store, OutboundMail
+from extensions import cache
+import totals
+import ride_import
+import ride_export
+import rates
+import jobs
+import reprice
+import geo
+import mail_queue
+import versions
+
+
+def register_commands(app):
+    app.cli.add_command(db_info_command)
+    app.cli.add_command(create_admin_command)
+    app.cli.add_command(rebuild_totals_command)
+    app.cli.add_command(import_rides_command)
+    app.cli.add_command(export_rides_command)
+    app.cli.add_command(rates_group)
+    app.cli.add_command(reprice_command)
+    app.cli.add_command(jobs_group)
+    app.cli.add_command(geocode_stores_command)
+    app.cli.add_command(mail_queue_group)
+
+
+@click.command('db-info')
+@with_appcontext
+def db_info_command():
+    """Parodo duomenų bazės lenteles ir vartotojus."""
+    inspector = inspect(db.engine)
+    click.echo(f"Lentelės duomenų bazėje: {inspector.get_table_names()}")
+    users = User.query.all()
+    click.echo(f"Vartotojai duomenų bazėje: {[u.username for u in users]}")
+
+
+@click.command('create-admin')
+@with_appcontext
+def create_admin_command():
+    """Sukuria administratoriaus paskyrą, jei jos dar nėra."""
+    create_admin_if_not_exists()
+
+
+@click.command('rebuild-totals')
+@click.option('--check', is_flag=True, help='Tik palyginti su ride_result, nieko nekeisti.')
+@with_appcontext
+def rebuild_totals_command(check):
+    """Perskaičiuoja monthly_total ir vehicle_monthly_total lenteles iš ride_result."""
+    skirtumai = totals.find_mismatches()
+    for lentele, raktas, laukas, knygoje, tikra in skirtumai:
+        click.echo(f"{lentele} {raktas} {laukas}: knygoje {knygoje}, pagal įrašus {tikra}")
+    if check:
+        click.echo(f"Rasta neatitikimų: {len(skirtumai)}")
+        if skirtumai:
+            raise SystemExit(1)
+        return
+    eiluciu = totals.rebuild()
+    click.echo(f"Mėnesių sumos perskaičiuotos: {eiluciu} eilučių.")
+
+
+@click.command('import-rides')
+@click.argument('failas', type=click.File('rb'))
+@click.option('--user', 'username', help='Vartotojas, kuriam priskirti eilutes be stulpelio vartotojas.')
+@click.option('--chunk-size', default=ride_import.CHUNK_SIZE, show_default=True, help='Eilučių vienoje transakcijoje.')
+@with_appcontext
+def import_rides_command(failas, username, chunk_size):
+    """Importuoja reisus iš CSV arba XLSX failo."""
+    user_id = None
+    if username:
+        user = User.query.filter_by(username=username, istrinta=None).first()
+        if user is None:
+            raise click.ClickException(f"Vartotojas {username} nerastas")
+        user_id = user.id
+    vartotojai = dict(db.session.query(User.username, User.id).filter(User.istrinta.is_(None)).all())
+    try:
+        rezultatas = ride_import.import_rides(
+            failas, ride_import.detect_format(failas.name), user_id, vartotojai, chunk_size
+        )
+    except ValueError as e:
+        raise click.ClickException(str(e))
+    for eilute, zinute in rezultatas['klaidos']:
+        click.echo(f"Eilutė {eilute}: {zinute}")
+    click.echo(
+        f"Importuota reisų: {rezultatas['importuota']}, praleista eilučių: {rezultatas['praleista']}, "
+        f"{rezultatas['trukme']:.1f} s ({rezultatas['importuota'] / max(rezultatas['trukme'], 1e-9):.0f} eil./s)"
+    )
+
+
+@click.command('export-rides')
+@click.argument('failas', type=click.File('wb'))
+@click.option('--user', 'username', help='Tik šio vartotojo reisai (numatyta – visi).')
+@click.option('--nuo', help='Nuo mėnesio YYYY-MM imtinai.')
+@click.option('--iki', help='Iki mėnesio YYYY-MM imtinai.')
+@click.option('--format', 'formatas', type=click.Choice(['csv', 'xlsx']), help='Numatyta – pagal failo plėtinį.')
+@with_appcontext
+def export_rides_command(failas, username, nuo, iki, formatas):
+    """Eksportuoja reisus į CSV arba XLSX failą ('-' – CSV į stdout)."""
+    user_id = None
+    if username:
+        user = User.query.filter_by(username=username).first()
+        if user is None:
+            raise click.ClickException(f"Vartotojas {username} nerastas")
+        user_id = user.id
+    if formatas is None:
+        formatas = 'xlsx' if failas.name.lower().endswith('.xlsx') else 'csv'
+    eilutes = ride_export.iter_rows(ride_export.rides_query(user_id, nuo, iki))
+    ride_export.export_file(formatas, eilutes, failas)
+
+
+@click.group('rates')
+def rates_group():
+    """Įkainių versijos (pay_rate)."""
+
+
+@rates_group.command('list')
+@with_appcontext
+def rates_list_command():
+    """Parodo visas įkainių versijas."""
+    for irasas in PayRate.query.order_by(PayRate.galioja_nuo):
+        reiksmes = ', '.join(f"{laukas}={getattr(irasas, laukas)}" for laukas in rates.LAUKAI)
+        click.echo(f"nuo {irasas.galioja_nuo}: {reiksmes}, savaitgalio_koef={irasas.savaitgalio_koef}"
+                   f"{' – ' + irasas.pastaba if irasas.pastaba else ''}")
+
+
+@rates_group.command('add')
+@click.argument('galioja_nuo', type=click.DateTime(formats=['%Y-%m-%d']))
+@click.option('--km', 'km_kiekis', type=float, help='€ už km')
+@click.option('--taskas', 'tasku_kiekis', type=float, help='€ už tašką')
+@click.option('--paletes', 'pakrautos_paletes', type=float, help='€ už pakrautą paletę')
+@click.option('--tara', type=float, help='€ už tarą')
+@click.option('--atgalines', 'atgalines_paletes', type=float, help='€ už atgalinę paletę')
+@click.option('--savaitgalio-koef', type=float, help='Savaitgalio daugiklis (tarai netaikomas)')
+@click.option('--pastaba')
+@click.option('--replace', is_flag=True, help='Pakeisti jau esamą tos datos versiją.')
+@with_appcontext
+def rates_add_command(galioja_nuo, pastaba, replace, **reiksmes):
+    """Prideda įkainių versiją, galiojančią nuo GALIOJA_NUO (YYYY-MM-DD).
+
+    Nenurodyti įkainiai perimami iš tą dieną galiojusios versijos.
+    Jau įrašytų reisų sumos nesikeičia, kol jie neperskaičiuojami.
+    """
+    try:
+        irasas = rates.add_rate(galioja_nuo.date(), pastaba, replace, **reiksmes)
+    except ValueError as e:
+        raise click.ClickException(f"{e} (naudokite --replace)")
+    click.echo(f"Įkainiai nuo {irasas.galioja_nuo} išsaugoti.")
+
+
+def follow_job(job_id):
+    """Vykdo darbą atskiroje gijoje ir rodo jo eigą, kol baigsis."""
+    # CLI transakcijos rašančios (BEGIN IMMEDIATE), todėl laukdami jos neliekame atidarę;
+    # nauja transakcija taip pat mato darbo gijos įrašytą eigą
+    db.session.rollback()
+    gija = jobs.start_thread(job_id)
+    while gija.is_alive():
+        gija.join(2)
+        job = db.session.get(BackgroundJob, job_id, populate_existing=True)
+        click.echo(f"#{job.id} {job.busena}: {job.apdorota}/{job.viso or '?'} ({job.progresas:.0f}%), pakeista {job.pakeista}")
+        db.session.rollback()
+    job = db.session.get(BackgroundJob, job_id, populate_existing=True)
+    if job.busena != 'baigta':
+        raise click.ClickException(f"Darbas #{job.id}: {job.busena} {job.klaida or ''} (tęsti: flask jobs resume {job.id})")
+
+
+@click.command('reprice')
+@click.option('--nuo', help='Nuo datos YYYY-MM-DD imtinai.')
+@click.option('--iki', help='Iki datos YYYY-MM-DD imtinai.')
+@click.option('--user', 'username', help='Tik šio vartotojo reisai.')
+@click.option('--chunk-size', default=reprice.CHUNK_SIZE, show_default=True, help='Įrašų vienoje transakcijoje.')
+@click.option('--pauze', default=0.0, show_default=True, help='Sekundės tarp dalių (mažiau trukdo kitiems rašymams).')
+@with_appcontext
+def reprice_command(nuo, iki, username, chunk_size, pauze):
+    """Perskaičiuoja eur_uz_reisa pagal dabartinius įkainius."""
+    user_id = None
+    if username:
+        user = User.query.filter_by(username=username).first()
+        if user is None:
+            raise click.ClickException(f"Vartotojas {username} nerastas")
+        user_id = user.id
+    job = reprice.create_reprice_job(nuo, iki, user_id, chunk_size, pauze)
+    click.echo(f"Sukurtas darbas #{job.id}: {job.viso} reisų.")
+    follow_job(job.id)
+
+
+@click.group('jobs')
+def jobs_group():
+    """Foniniai darbai (background_job)."""
+
+
+@jobs_group.command('list')
+@with_appcontext
+def jobs_list_command():
+    """Parodo paskutinius darbus."""
+    for job in BackgroundJob.query.order_by(BackgroundJob.id.desc()).limit(20):
+        click.echo(f"#{job.id} {job.tipas} {job.busena} {job.apdorota}/{job.viso or '?'} "
+                   f"pakeista {job.pakeista} {job.parametrai}{' – ' + job.klaida if job.klaida else ''}")
+
+
+@jobs_group.command('resume')
+@click.argument('job_id', type=int)
+@with_appcontext
+def jobs_resume_command(job_id):
+    """Tęsia nutrūkusį darbą nuo paskutinės išsaugotos dalies."""
+    if db.session.get(BackgroundJob, job_id) is None:
+        raise click.ClickException(f"Darbas #{job_id} nerastas")
+    follow_job(job_id)
+
+
+@click.command('geocode-stores')
+@click.option('--all', 'visos', is_flag=True, help='Perskaičiuoti ir jau turinčias koordinates.')
+@click.option('--resolve', is_flag=True, help='Išskleisti trumpąsias Google Maps nuorodas (reikia interneto).')
+@with_appcontext
+def geocode_stores_command(visos, resolve):
+    """Užpildo parduotuvių koordinates iš Google Maps nuorodų ir apskritis lauko."""
+    uzklausa = Store.query if visos else Store.query.filter(Store.platuma.is_(None))
+    rasta = nerasta = 0
+    for store in uzklausa.order_by(Store.id).all():
+        if not geo.update_coordinates(store) and resolve and store.google_maps_nuoroda:
+            try:
+                koordinates = geo.parse_coordinates(geo.resolve_link(store.google_maps_nuoroda))
+            except OSError as e:
+                click.echo(f"#{store.id} {store.pavadinimas}: nepavyko išskleisti nuorodos ({e})")
+                koordinates = None
+            if koordinates:
+                store.platuma, store.ilguma = koordinates
+        if store.platuma is None:
+            nerasta += 1
+            click.echo(f"#{store.id} {store.pavadinimas}: koordinačių nerasta")
+        else:
+            rasta += 1
+    versions.bump(versions.STORES)
+    db.session.commit()
+    cache.bump('stores')
+    click.echo(f"Koordinatės nustatytos: {rasta}, nerasta: {nerasta}.")
+
+
+@click.group('mail-queue')
+def mail_queue_group():
+    """Siunčiamų laiškų eilė (outbound_mail)."""
+
+
+@mail_queue_group.command('list')
+@click.option('--visi', is_flag=True, help='Rodyti ir išsiųstus.')
+@with_appcontext
+def mail_queue_list_command(visi):
+    """Parodo neišsiųstus laiškus."""
+    uzklausa = OutboundMail.query if visi else OutboundMail.query.filter(OutboundMail.busena != 'issiusta')
+    for laiskas in uzklausa.order_by(OutboundMail.id.desc()).limit(50):
+        click.echo(f"#{laiskas.id} {laiskas.busena} {laiskas.gavejas} \"{laiskas.tema}\" bandymų {laiskas.bandymai}, "
+                   f"kitas {laiskas.kitas_bandymas:%Y-%m-%d %H:%M:%S}{' – ' + laiskas.klaida if laiskas.klaida else ''}")
+
+
+@mail_queue_group.command('send')
+@with_appcontext
+def mail_queue_send_command():
+    """Išsiunčia visus dabar laukiančius laiškus ir baigia (pvz. iš cron)."""
+    viso_issiusta = viso_nepavyko = 0
+    while True:
+        issiusta, nepavyko = mail_queue.send_batch()
+        viso_issiusta += issiusta
+        viso_nepavyko += nepavyko
+        if not issiusta:
+            break
+    click.echo(f"Išsiųsta: {viso_issiusta}, atidėta ar nepavyko: {viso_nepavyko}.")
+
+
+@mail_queue_group.command('worker')
+@with_appcontext
+def mail_queue_worker_command():
+    """Nuolat siunčia laiškus iš eilės (naudoti su MAIL_QUEUE_THREAD=0)."""
+    click.echo("Laiškų siuntėjas paleistas (Ctrl+C – sustabdyti).")
+    try:
+        mail_queue.run_worker()
+    except KeyboardInterrupt:
+        pass
+
+
+def create_admin_if_not_exists():
+    admin = User.query.filter_by(is_admin=True).first()
+    if not admin:
+        new_admin = User(username='admin', email='admin@example.com', is_admin=True)
+        new_admin.set_password('admin123')  # Pakeiskite į saugesnį slaptažodį
+        db.session.add(new_admin)
+        db.session.commit()
+        print("Administratoriaus paskyra sukurta!")
+    else:
+        print("Administratoriaus paskyra jau egzistuoja.")
@@ -0,0 +1,10 @@
+from flask_login import LoginManager
+from flask_mail import Mail
+from flask_migrate import Migrate
+from cache import Cache
+
+mail = Mail()
+migrate = Migrate()
+login_manager = LoginManager()
+cache = Cache()
+login_manager.login_view = 'main.login'
@@ -0,0 +1,134 @@
+"""Parko suvestinė administratoriui (/admin/fleet).
+
+Reisų, km, paletių ir eur sumos pasirinktų mėnesių intervalui pagal
+vairuotoją arba automobilį, o pasirinkus vieną iš jų – dar ir pagal mėnesį
+bei kitą dimensiją. Skaičiuojama SQL GROUP BY ne per ride_result, o per
+knygas: monthly_total (vartotojas, mėnuo) ir vehicle_monthly_total
+(mėnuo, vehicle_id, vartotojas), kurias totals.py atnaujina kartu su
+reisais. Jose eilučių tiek, kiek mėnesio, automobilio ir vairuotojo
+derinių, todėl užklausos trunka milisekundes ir esant milijonams reisų.
+
+Rezultatas laikomas talpykloje FLEET_CACHE_TTL sekundžių – suvestinė gali
+vėluoti tiek, bet reisų įrašymas talpyklos neinvaliduoja.
+"""
+import re
+from datetime import date
+from flask import current_app
+from sqlalchemy import func, select
+from extensions import cache
+from models import db, User, Vehicle, MonthlyTotal, VehicleMonthlyTotal
+import totals
+
+SRITIS = 'fleet'
+DEFAULT_TTL = 30
+MENESIU = 12
+GRUPES = ('vairuotojai', 'automobiliai')
+STULPELIAI = ('irasu_kiekis',) + totals.SUMUOJAMI_LAUKAI
+RIKIAVIMAS = ('pavadinimas',) + STULPELIAI
+PAVADINIMAI = {
+    'irasu_kiekis': 'Reisai', 'tasku_kiekis': 'Taškai', 'km_kiekis': 'KM', 'pakrautos_paletes': 'Paletės',
+    'tara': 'Tara', 'atgalines_paletes': 'Atg. paletės', 'eur_uz_reisa': 'EUR',
+}
+
+MENESIO_FORMATAS = re.compile(r'^\d{4}-(0[1-9]|1[0-2])$')
+
+
+def parse_month(reiksme):
+    """'YYYY-MM' arba None; kitokia reikšmė – ValueError."""
+    if not reiksme:
+        return None
+    if not MENESIO_FORMATAS.match(reiksme):
+        raise ValueError(f'Neteisingas mėnuo "{reiksme}", tikimasi YYYY-MM')
+    return reiksme
+
+
+def shift_month(menesis, n):
+    metai, men = int(menesis[:4]), int(menesis[5:])
+    indeksas = metai * 12 + men - 1 + n
+    return f'{indeksas // 12:04d}-{indeksas % 12 + 1:02d}'
+
+
+def default_range():
+    """Paskutiniai MENESIU mėnesių iki naujausio mėnesio su reisais."""
+    iki = db.session.scalar(select(func.max(MonthlyTotal.menesis)).where(MonthlyTotal.irasu_kiekis > 0))
+    iki = iki or date.today().strftime('%Y-%m')
+    return shift_month(iki, -(MENESIU - 1)), iki
+
+
+def _eilute(raktas, pavadinimas, reiksmes=None):
+    reiksmes = reiksmes or [0] * len(STULPELIAI)
+    return dict(raktas=raktas, pavadinimas=pavadinimas,
+                **{laukas: (int if laukas == 'irasu_kiekis' else float)(reiksme or 0)
+                   for laukas, reiksme in zip(STULPELIAI, reiksmes)})
+
+
+def _aggregate(grupuoti, nuo, iki, user_id=None, vehicle_id=None):
+    """Sumos pagal 'vairuotojas', 'automobilis' arba 'menesis'.
+
+    Be automobilio filtro vairuotojų ir mėnesių sumos imamos iš mažesnės
+    monthly_total, kitaip – iš vehicle_monthly_total.
+    """
+    knyga = MonthlyTotal if vehicle_id is None and grupuoti != 'automobilis' else VehicleMonthlyTotal
+    if grupuoti == 'vairuotojas':
+        grupe = (knyga.user_id, User.username)
+    elif grupuoti == 'automobilis':
+        grupe = (knyga.vehicle_id, Vehicle.numeris)
+    else:
+        grupe = (knyga.menesis, knyga.menesis)
+    uzklausa = (
+        select(*grupe, *[func.sum(getattr(knyga, laukas)) for laukas in STULPELIAI])
+        .join(User, User.id == knyga.user_id)
+        # Trinamų vartotojų (user.istrinta) sumos nerodomos
+        .where(knyga.menesis >= nuo, knyga.menesis <= iki, User.istrinta.is_(None))
+        .group_by(*grupe)
+        .having(func.sum(knyga.irasu_kiekis) > 0)
+    )
+    if grupuoti == 'automobilis':
+        uzklausa = uzklausa.join(Vehicle, Vehicle.id == knyga.vehicle_id)
+    if user_id is not None:
+        uzklausa = uzklausa.where(knyga.user_id == user_id)
+    if vehicle_id is not None:
+        uzklausa = uzklausa.where(knyga.vehicle_id == vehicle_id)
+    return [_eilute(eilute[0], eilute[1], eilute[2:]) for eilute in db.session.execute(uzklausa)]
+
+
+def _summary(grupe, nuo, iki, user_id, vehicle_id):
+    grupuoti = 'vairuotojas' if grupe == 'vairuotojai' else 'automobilis'
+    eilutes = _aggregate(grupuoti, nuo, iki)
+    if grupuoti == 'automobilis':
+        # Aktyvūs automobiliai rodomi ir be reisų – matosi, kuris stovi
+        esami = {eilute['raktas'] for eilute in eilutes}
+        eilutes += [
+            _eilute(v.id, v.numeris)
+            for v in db.session.execute(select(Vehicle.id, Vehicle.numeris).where(Vehicle.aktyvus))
+            if v.id not in esami
+        ]
+
+    viso = _eilute(None, 'Iš viso', [sum(eilute[laukas] for eilute in eilutes) for laukas in STULPELIAI])
+    suvestine = {'nuo': nuo, 'iki': iki, 'grupe': grupe, 'eilutes': eilutes, 'viso': viso}
+    if user_id is not None:
+        suvestine['pasirinkta'] = db.session.scalar(select(User.username).where(User.id == user_id))
+    elif vehicle_id is not None:
+        suvestine['pasirinkta'] = db.session.scalar(select(Vehicle.numeris).where(Vehicle.id == vehicle_id))
+    if user_id is not None or vehicle_id is not None:
+        suvestine['menesiai'] = _aggregate('menesis', nuo, iki, user_id, vehicle_id)
+        suvestine['detales'] = _aggregate('automobilis' if user_id is not None else 'vairuotojas',
+                                          nuo, iki, user_id, vehicle_id)
+    return suvestine
+
+
+def summary(grupe, nuo, iki, user_id=None, vehicle_id=None):
+    """Suvestinė (žodynas, JSON tipo) iš talpyklos arba knygų."""
+    def kurti():
+        return _summary(grupe, nuo, iki, user_id, vehicle_id)
+
+    ttl = current_app.config.get('FLEET_CACHE_TTL', DEFAULT_TTL)
+    if ttl:
+        return cache.cached(SRITIS, f'{grupe}:{nuo}:{iki}:{user_id}:{vehicle_id}', kurti, ttl=ttl)
+    return kurti()
+
+
+def sort_rows(eilutes, rikiuoti, mazejanciai):
+    if rikiuoti == 'pavadinimas':
+        return sorted(eilutes, key=lambda e: str(e['pavadinimas']).casefold(), reverse=mazejanciai)
+    return sorted(eilutes, key=lambda e: (e[rikiuoti], str(e['pavadinimas'])), reverse=mazejanciai)
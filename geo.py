@@ -0,0 +1,188 @@
+"""Parduotuvių koordinatės ir artimiausių parduotuvių paieška.
+
+Koordinatės (store.platuma, store.ilguma) išgaunamos iš google_maps_nuoroda
+(pilnos nuorodos turi ".../@54.68,25.27,17z", "!3d54.68!4d25.27" arba
+"?q=54.68,25.27"), o jei ten jų nėra – iš apskritis lauko, kur dalis
+parduotuvių turi įrašytas "54.68, 25.27". Trumposios maps.app.goo.gl
+nuorodos koordinačių neturi – jas galima išskleisti su
+`flask geocode-stores --resolve`.
+
+Paieškai procese laikomas KD medis: taškai verčiami į vienetinės sferos
+3D koordinates, kur tiesinis atstumas monotoniškai susijęs su atstumu
+sferos paviršiumi, todėl artimiausi randami tiksliai. Medis perkuriamas
+kaip ir store_index – pasikeitus 'stores' talpyklos versijai.
+"""
+import heapq
+import math
+import re
+import threading
+import time
+import urllib.request
+from extensions import cache
+from models import db, Store
+
+ZEMES_SPINDULYS_KM = 6371.0088
+# Ta pati sritis kaip store_routes.STORES_CACHE
+SRITIS = 'stores'
+MAX_AGE = 300
+
+SKAICIUS = r'(-?\d{1,3}\.\d+)'
+NUORODOS_SABLONAI = [
+    re.compile(r'!3d' + SKAICIUS + r'!4d' + SKAICIUS),
+    re.compile(r'@' + SKAICIUS + ',' + SKAICIUS),
+    re.compile(r'[?&](?:q|ll|query|destination)=' + SKAICIUS + r'(?:,|%2C)\s*' + SKAICIUS),
+]
+KOORDINATES = re.compile(r'^\s*' + SKAICIUS + r'\s*[,;]\s*' + SKAICIUS + r'\s*$')
+
+_lock = threading.Lock()
+_tree = {'medis': None, 'versija': None, 'sukurta': 0.0}
+
+
+def valid(platuma, ilguma):
+    return -90 <= platuma <= 90 and -180 <= ilguma <= 180
+
+
+def parse_coordinates(tekstas):
+    """Grąžina (platuma, ilguma) iš Google Maps nuorodos arba "lat, lng" teksto, kitaip None."""
+    if not tekstas:
+        return None
+    # !3d/!4d – pati vieta, @ – žemėlapio centras, todėl tikrinama šia tvarka
+    for sablonas in NUORODOS_SABLONAI:
+        rasta = sablonas.search(tekstas)
+        if rasta:
+            break
+    else:
+        rasta = KOORDINATES.match(tekstas)
+    if not rasta:
+        return None
+    platuma, ilguma = float(rasta.group(1)), float(rasta.group(2))
+    return (platuma, ilguma) if valid(platuma, ilguma) else None
+
+
+def store_coordinates(store):
+    return parse_coordinates(store.google_maps_nuoroda) or parse_coordinates(store.apskritis)
+
+
+def resolve_link(nuoroda, timeout=10):
+    """Išskleidžia trumpąją nuorodą (maps.app.goo.gl) į pilną, kurioje yra koordinatės."""
+    uzklausa = urllib.request.Request(nuoroda, method='HEAD', headers={'User-Agent': 'Mozilla/5.0'})
+    with urllib.request.urlopen(uzklausa, timeout=timeout) as atsakymas:
+        return atsakymas.geturl()
+
+
+def update_coordinates(store):
+    """Nustato store.platuma/ilguma pagal nuorodą ar apskritį. Grąžina True, jei koordinatės rastos."""
+    koordinates = store_coordinates(store)
+    store.platuma, store.ilguma = koordinates or (None, None)
+    return koordinates is not None
+
+
+def to_xyz(platuma, ilguma):
+    fi, lambda_ = math.radians(platuma), math.radians(ilguma)
+    return (math.cos(fi) * math.cos(lambda_), math.cos(fi) * math.sin(lambda_), math.sin(fi))
+
+
+def chord_to_km(styga):
+    return 2 * ZEMES_SPINDULYS_KM * math.asin(min(styga / 2, 1.0))
+
+
+def km_to_chord(km):
+    return 2 * math.sin(min(km / ZEMES_SPINDULYS_KM, math.pi) / 2)
+
+
+class KDTree:
+    """Statinis 3D KD medis: mazgas – (taškas, indeksas, ašis, kairė, dešinė)."""
+
+    def __init__(self, taskai):
+        self.dydis = len(taskai)
+        self.saknis = self._build(list(enumerate(taskai)), 0)
+
+    def _build(self, elementai, gylis):
+        if not elementai:
+            return None
+        asis = gylis % 3
+        elementai.sort(key=lambda e: e[1][asis])
+        vidurys = len(elementai) // 2
+        indeksas, taskas = elementai[vidurys]
+        return (taskas, indeksas, asis,
+                self._build(elementai[:vidurys], gylis + 1),
+                self._build(elementai[vidurys + 1:], gylis + 1))
+
+    def nearest(self, taskas, k, max_atstumas=math.inf):
+        """k artimiausių (atstumas, indeksas) ne toliau nei max_atstumas, nuo artimiausio."""
+        # Max-heap per neigiamus atstumus: viršuje – tolimiausias iš rastų
+        rasti = []
+        riba2 = max_atstumas * max_atstumas
+        stekas = [self.saknis]
+        while stekas:
+            mazgas = stekas.pop()
+            if mazgas is None:
+                continue
+            taskas_m, indeksas, asis, kaire, desine = mazgas
+            dx, dy, dz = taskas[0] - taskas_m[0], taskas[1] - taskas_m[1], taskas[2] - taskas_m[2]
+            d2 = dx * dx + dy * dy + dz * dz
+            if d2 <= riba2:
+                if len(rasti) < k:
+                    heapq.heappush(rasti, (-d2, indeksas))
+                elif d2 < -rasti[0][0]:
+                    heapq.heapreplace(rasti, (-d2, indeksas))
+                if len(rasti) == k:
+                    riba2 = -rasti[0][0]
+            skirtumas = taskas[asis] - taskas_m[asis]
+            arti, toli = (kaire, desine) if skirtumas < 0 else (desine, kaire)
+            # Tolimoji pusė tikrinama tik jei dalijanti plokštuma arčiau nei riba
+            if skirtumas * skirtumas <= riba2:
+                stekas.append(toli)
+            stekas.append(arti)
+        return sorted((math.sqrt(-d2), indeksas) for d2, indeksas in rasti)
+
+
+class StoreLocator:
+    def __init__(self, parduotuves):
+        """parduotuves – (id, pavadinimas, adresas, platuma, ilguma) sąrašas."""
+        self.parduotuves = [
+            {'id': store_id, 'pavadinimas': pavadinimas, 'adresas': adresas, 'platuma': platuma, 'ilguma': ilguma}
+            for store_id, pavadinimas, adresas, platuma, ilguma in parduotuves
+        ]
+        self.medis = KDTree([to_xyz(p['platuma'], p['ilguma']) for p in self.parduotuves])
+
+    def __len__(self):
+        return len(self.parduotuves)
+
+    def nearest(self, platuma, ilguma, kiek=10, spindulys_km=None):
+        max_atstumas = km_to_chord(spindulys_km) if spindulys_km is not None else math.inf
+        return [
+            dict(self.parduotuves[indeksas], atstumas_km=round(chord_to_km(atstumas), 3))
+            for atstumas, indeksas in self.medis.nearest(to_xyz(platuma, ilguma), kiek, max_atstumas)
+        ]
+
+
+def build():
+    eilutes = db.session.execute(
+        db.select(Store.id, Store.pavadinimas, Store.adresas, Store.platuma, Store.ilguma)
+        .where(Store.platuma.isnot(None), Store.ilguma.isnot(None))
+    ).all()
+    return StoreLocator(eilutes)
+
+
+def _stale(versija):
+    return (_tree['medis'] is None or _tree['versija'] != versija
+            or _tree['sukurta'] + MAX_AGE < time.monotonic())
+
+
+def get_locator():
+    try:
+        versija = cache.backend.version(SRITIS)
+    except Exception:
+        versija = _tree['versija']
+    if _stale(versija):
+        with _lock:
+            if _stale(versija):
+                _tree['medis'] = build()
+                _tree['versija'] = versija
+                _tree['sukurta'] = time.monotonic()
+    return _tree['medis']
+
+
+def nearby(platuma, ilguma, kiek=10, spindulys_km=None):
+    return get_locator().nearest(platuma, ilguma, kiek, spindulys_km)
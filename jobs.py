@@ -0,0 +1,99 @@
+"""Foniniai darbai (background_job), vykdomi dalimis.
+
+Darbo tipo funkcija registruojama su @handler('tipas') ir kviečiama su
+BackgroundJob objektu. Ji pati apdoroja duomenis dalimis ir po kiekvienos
+dalies kviečia save_progress(), kuris kartu su dalies pakeitimais
+padaro commit'ą – nutrūkęs darbas tęsiamas nuo paskutinio_id.
+
+Darbą vienu metu vykdo tik vienas procesas: claim() jį pasiima tik jei
+jis laukia, baigėsi klaida arba seniau nei STALE_AFTER nebeatnaujinamas.
+"""
+import json
+import logging
+import threading
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import or_, update
+from models import db, BackgroundJob
+
+logger = logging.getLogger(__name__)
+
+HANDLERS = {}
+STALE_AFTER = timedelta(minutes=5)
+
+
+def handler(tipas):
+    def registruoti(funkcija):
+        HANDLERS[tipas] = funkcija
+        return funkcija
+    return registruoti
+
+
+def create_job(tipas, parametrai, viso=None):
+    job = BackgroundJob(tipas=tipas, parametrai=json.dumps(parametrai), viso=viso, busena='laukia',
+                        paskutinis_id=0, apdorota=0, pakeista=0)
+    db.session.add(job)
+    db.session.commit()
+    return job
+
+
+def claim(job_id):
+    dabar = datetime.utcnow()
+    rezultatas = db.session.execute(
+        update(BackgroundJob)
+        .where(
+            BackgroundJob.id == job_id,
+            or_(
+                BackgroundJob.busena.in_(('laukia', 'klaida')),
+                (BackgroundJob.busena == 'vykdoma') & (BackgroundJob.atnaujinta < dabar - STALE_AFTER),
+            )
+        )
+        .values(busena='vykdoma', klaida=None, atnaujinta=dabar)
+        .execution_options(synchronize_session=False)
+    )
+    db.session.commit()
+    return rezultatas.rowcount == 1
+
+
+def save_progress(job, paskutinis_id, apdorota, pakeista=0):
+    """Atnaujina darbo eigą ir padaro commit'ą kartu su dalies pakeitimais."""
+    job.paskutinis_id = paskutinis_id
+    job.apdorota += apdorota
+    job.pakeista += pakeista
+    job.atnaujinta = datetime.utcnow()
+    db.session.commit()
+
+
+def run_job(job_id):
+    """Vykdo darbą šiame procese. Grąžina False, jei jį jau vykdo kitas."""
+    if not claim(job_id):
+        return False
+    job = db.session.get(BackgroundJob, job_id)
+    logger.info("Pradedamas darbas #%d (%s) nuo id %d", job.id, job.tipas, job.paskutinis_id)
+    try:
+        HANDLERS[job.tipas](job)
+        job.busena = 'baigta'
+        job.atnaujinta = datetime.utcnow()
+        db.session.commit()
+        logger.info("Darbas #%d baigtas: apdorota %d, pakeista %d", job.id, job.apdorota, job.pakeista)
+    except Exception as e:
+        db.session.rollback()
+        logger.exception("Darbas #%d nutrūko ties id %d", job_id, job.paskutinis_id)
+        job = db.session.get(BackgroundJob, job_id)
+        job.busena = 'klaida'
+        job.klaida = str(e)
+        db.session.commit()
+    return True
+
+
+def start_thread(job_id):
+    """Paleidžia darbą atskiroje gijoje su savo aplikacijos kontekstu."""
+    app = current_app._get_current_object()
+
+    def vykdyti():
+        with app.app_context():
+            run_job(job_id)
+
+    gija = threading.Thread(target=vykdyti, name=f'job-{job_id}', daemon=True)
+    gija.start()
+    return gija
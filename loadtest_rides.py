@@ -0,0 +1,121 @@
+"""Lygiagrečių reisų įrašymo apkrovos testas su SQLite.
+
+Kiekvienas procesas – atskiras "worker'is" su savo aplikacija ir
+prisijungimų telkiniu, prisijungęs kaip atskiras vairuotojas, kuris
+nuolat siunčia naujus įrašus (POST /). Duomenų bazė – laikinas failas.
+
+Naudojimas:
+    python loadtest_rides.py --workers 8 --seconds 10
+    python loadtest_rides.py --workers 8 --seconds 10 --no-tuning
+"""
+import argparse
+import multiprocessing
+import os
+import tempfile
+import time
+from collections import Counter
+
+# Be SQLite nustatymų – kaip anksčiau: rollback journal, numatytasis pysqlite 5 s timeout
+NO_TUNING = {
+    'SQLITE_JOURNAL_MODE': 'DELETE',
+    'SQLITE_SYNCHRONOUS': None,
+    'SQLITE_BUSY_TIMEOUT': None,
+    'SQLITE_MMAP_SIZE': None,
+    'SQLITE_CACHE_SIZE': None,
+    'SQLITE_BEGIN_MODE': None,
+}
+
+RIDE = {
+    'data': '2024-10-14', 'auto_nr': 'LCS347', 'km_kiekis': '211', 'tasku_kiekis': '3',
+    'pakrautos_paletes': '36', 'tara': '11', 'atgalines_paletes': '0', 'savaitgalis': 'false',
+}
+
+
+def make_config(db_path, tuning):
+    config = {'SQLALCHEMY_DATABASE_URI': 'sqlite:///' + db_path, 'LOG_LEVEL': 'CRITICAL'}
+    if not tuning:
+        config.update(NO_TUNING)
+    return config
+
+
+def prepare(db_path, workers, tuning):
+    from app import create_app
+    from models import db, User
+    app = create_app(make_config(db_path, tuning))
+    with app.app_context():
+        db.create_all()
+        for i in range(workers):
+            user = User(username=f'vairuotojas{i}', email=f'v{i}@example.com')
+            user.set_password('slaptazodis')
+            db.session.add(user)
+        db.session.commit()
+        db.engine.dispose()
+
+
+def worker(i, db_path, tuning, seconds, pasiruose, startas, rezultatai):
+    from app import create_app
+    app = create_app(make_config(db_path, tuning))
+    client = app.test_client()
+    client.post('/login', data={'username': f'vairuotojas{i}', 'password': 'slaptazodis'})
+
+    statistika = Counter()
+    latencies = []
+    pasiruose.put(i)
+    startas.wait()
+    pabaiga = time.time() + seconds
+    while time.time() < pabaiga:
+        pradzia = time.perf_counter()
+        response = client.post('/', data=RIDE)
+        latencies.append(time.perf_counter() - pradzia)
+        if response.status_code == 200 and response.get_json().get('success'):
+            statistika['ok'] += 1
+        else:
+            zinute = (response.get_json() or {}).get('message', str(response.status_code))
+            statistika['locked' if 'locked' in zinute else 'error'] += 1
+    rezultatai.put((dict(statistika), latencies))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--seconds', type=float, default=10)
+    parser.add_argument('--no-tuning', action='store_true', help='SQLite be WAL ir kitų nustatymų')
+    args = parser.parse_args()
+    tuning = not args.no_tuning
+
+    with tempfile.TemporaryDirectory() as katalogas:
+        db_path = os.path.join(katalogas, 'loadtest.db')
+        prepare(db_path, args.workers, tuning)
+
+        # spawn – kiekvienas worker'is be tėvinio proceso DB prisijungimų, kaip gunicorn
+        ctx = multiprocessing.get_context('spawn')
+        pasiruose, rezultatai, startas = ctx.Queue(), ctx.Queue(), ctx.Event()
+        procesai = [
+            ctx.Process(target=worker, args=(i, db_path, tuning, args.seconds, pasiruose, startas, rezultatai))
+            for i in range(args.workers)
+        ]
+        for procesas in procesai:
+            procesas.start()
+        # Visi worker'iai pradeda kartu, kai prisijungia
+        for _ in procesai:
+            pasiruose.get(timeout=120)
+        startas.set()
+        viso = Counter()
+        latencies = []
+        for _ in procesai:
+            statistika, trukmes = rezultatai.get(timeout=args.seconds + 120)
+            viso.update(statistika)
+            latencies.extend(trukmes)
+        for procesas in procesai:
+            procesas.join()
+
+    latencies.sort()
+    p = lambda q: latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000 if latencies else 0
+    print(f"Profilis: {'WAL ir kiti nustatymai' if tuning else 'be nustatymų'}, worker'ių: {args.workers}, {args.seconds:.0f} s")
+    print(f"Sėkmingi įrašai: {viso['ok']} ({viso['ok'] / args.seconds:.1f}/s)")
+    print(f"'database is locked': {viso['locked']}, kitos klaidos: {viso['error']}")
+    print(f"Trukmė: p50 {p(0.5):.1f} ms, p95 {p(0.95):.1f} ms, p99 {p(0.99):.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+import atexit
+import logging
+import logging.handlers
+import queue
+import random
+import sys
+import time
+from flask import g, has_request_context, request
+
+LOG_FORMAT = '%(asctime)s %(levelname)s [%(name)s] %(message)s'
+
+request_logger = logging.getLogger('app.request')
+
+_listener = None
+
+
+class RequestSampleFilter(logging.Filter):
+    """Užklausos metu DEBUG/INFO įrašus praleidžia tik atrinktoms užklausoms."""
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING or not has_request_context():
+            return True
+        return g.get('log_sampled', True)
+
+
+def stop_listener():
+    # Išrašo eilėje likusius įrašus; kviečiama ir išeinant iš proceso
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(stop_listener)
+
+
+def parse_levels(reiksme):
+    # "app=DEBUG,sqlalchemy.engine=INFO" -> {'app': 'DEBUG', 'sqlalchemy.engine': 'INFO'}
+    lygiai = {}
+    for dalis in (reiksme or '').split(','):
+        if '=' in dalis:
+            vardas, lygis = dalis.split('=', 1)
+            lygiai[vardas.strip()] = lygis.strip().upper()
+    return lygiai
+
+
+def configure_logging(app):
+    """Nustato lygius ir neblokuojantį (eilės) handler'į visam procesui.
+
+    Įrašai iš užklausos gijos tik padedami į eilę, o į stderr juos rašo
+    atskira QueueListener gija.
+    """
+    global _listener
+
+    root = logging.getLogger()
+    if _listener is not None:
+        stop_listener()
+        for handler in [h for h in root.handlers if isinstance(h, logging.handlers.QueueHandler)]:
+            root.removeHandler(handler)
+
+    stream_handler = logging.StreamHandler(sys.stderr)
+    stream_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+
+    eile = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(eile)
+    queue_handler.addFilter(RequestSampleFilter())
+    root.addHandler(queue_handler)
+    root.setLevel(app.config['LOG_LEVEL'].upper())
+
+    for vardas, lygis in parse_levels(app.config['LOG_LEVELS']).items():
+        logging.getLogger(vardas).setLevel(lygis)
+
+    _listener = logging.handlers.QueueListener(eile, stream_handler, respect_handler_level=True)
+    _listener.start()
+
+    sample_rate = app.config['LOG_SAMPLE_RATE']
+
+    @app.before_request
+    def _sample_request():
+        g.log_sampled = sample_rate >= 1 or random.random() < sample_rate
+        g.request_started = time.perf_counter()
+
+    @app.after_request
+    def _log_request(response):
+        pradzia = g.get('request_started')
+        if pradzia is not None and request_logger.isEnabledFor(logging.DEBUG):
+            trukme = (time.perf_counter() - pradzia) * 1000
+            request_logger.debug("%s %s %s %.1f ms", request.method, request.path, response.status_code, trukme)
+        return response
@@ -0,0 +1,204 @@
+"""Siunčiamų el. laiškų eilė (outbound_mail).
+
+Užklausa laišką tik įrašo į eilę (enqueue) ir iškart atsako. Laiškus
+siunčia fono gija (paleidžiama pirmą kartą įdėjus laišką, jei
+MAIL_QUEUE_THREAD) arba `flask mail-queue worker` / `send`: paimama iki
+MAIL_BATCH_SIZE laiškų ir visi siunčiami per vieną SMTP prisijungimą.
+
+Nepavykęs laiškas grąžinamas į eilę su atidėjimu MAIL_RETRY_BASE * 2^n
+sekundžių (ne daugiau kaip valanda), po MAIL_MAX_ATTEMPTS bandymų lieka
+būsenoje 'klaida'. Laiškus paima vienas worker'is (paimta žymė), o
+"siunciama" būsenoje užstrigę (nutrūkus procesui) po STALE_AFTER
+grąžinami į eilę.
+"""
+import logging
+import random
+import smtplib
+import threading
+import uuid
+from datetime import datetime, timedelta
+from flask import current_app
+from flask_mail import Message
+from sqlalchemy import select, update
+from extensions import mail
+from models import db, OutboundMail
+
+logger = logging.getLogger(__name__)
+
+STALE_AFTER = timedelta(minutes=10)
+MAX_DELAY = 3600
+
+_lock = threading.Lock()
+_worker = {'gija': None, 'pazadinti': threading.Event()}
+
+
+def _config(raktas, numatyta):
+    return current_app.config.get(raktas, numatyta)
+
+
+def enqueue(gavejas, tema, tekstas, siuntejas=None):
+    """Įrašo laišką į eilę (su commit) ir pažadina siuntėją."""
+    laiskas = OutboundMail(gavejas=gavejas, tema=tema, tekstas=tekstas, siuntejas=siuntejas,
+                           busena='laukia', bandymai=0, kitas_bandymas=datetime.utcnow())
+    db.session.add(laiskas)
+    db.session.commit()
+    if _config('MAIL_QUEUE_THREAD', True):
+        ensure_worker()
+    _worker['pazadinti'].set()
+    return laiskas
+
+
+def retry_delay(bandymai):
+    bazinis = _config('MAIL_RETRY_BASE', 30)
+    # ±20 %, kad po SMTP sutrikimo laiškai negrįžtų visi vienu metu
+    return min(bazinis * 2 ** (bandymai - 1), MAX_DELAY) * random.uniform(0.8, 1.2)
+
+
+def _claimable(dabar):
+    return (
+        ((OutboundMail.busena == 'laukia') & (OutboundMail.kitas_bandymas <= dabar))
+        | ((OutboundMail.busena == 'siunciama') & (OutboundMail.atnaujinta < dabar - STALE_AFTER))
+    )
+
+
+def claim_batch(kiekis):
+    """Paima iki kiekis laukiančių laiškų šiam worker'iui. Grąžina jų kopijas (ne ORM objektus)."""
+    dabar = datetime.utcnow()
+    zyme = uuid.uuid4().hex
+    laukiantys = select(OutboundMail.id).where(_claimable(dabar)).order_by(OutboundMail.id).limit(kiekis)
+    db.session.execute(
+        update(OutboundMail)
+        # Sąlyga kartojama: PostgreSQL ją patikrina iš naujo, jei eilutę ką tik paėmė kitas worker'is
+        .where(OutboundMail.id.in_(laukiantys.scalar_subquery()), _claimable(dabar))
+        .values(busena='siunciama', paimta=zyme, atnaujinta=dabar)
+        .execution_options(synchronize_session=False)
+    )
+    laiskai = db.session.execute(
+        select(OutboundMail.id, OutboundMail.gavejas, OutboundMail.siuntejas, OutboundMail.tema,
+               OutboundMail.tekstas, OutboundMail.bandymai)
+        .where(OutboundMail.paimta == zyme)
+        .order_by(OutboundMail.id)
+    ).all()
+    db.session.commit()
+    return laiskai
+
+
+def _mark_sent(laiskas):
+    db.session.execute(
+        update(OutboundMail).where(OutboundMail.id == laiskas.id)
+        .values(busena='issiusta', issiusta=datetime.utcnow(), atnaujinta=datetime.utcnow(),
+                bandymai=laiskas.bandymai + 1, klaida=None, paimta=None)
+    )
+    db.session.commit()
+
+
+def _mark_failed(laiskai, klaida, skaiciuoti=True):
+    """Grąžina laiškus į eilę su atidėjimu; skaiciuoti=False – bandymas nebuvo pradėtas."""
+    dabar = datetime.utcnow()
+    max_bandymu = _config('MAIL_MAX_ATTEMPTS', 8)
+    for laiskas in laiskai:
+        bandymai = laiskas.bandymai + (1 if skaiciuoti else 0)
+        galutine = bandymai >= max_bandymu
+        db.session.execute(
+            update(OutboundMail).where(OutboundMail.id == laiskas.id)
+            .values(busena='klaida' if galutine else 'laukia', bandymai=bandymai, klaida=str(klaida)[:1000],
+                    kitas_bandymas=dabar + timedelta(seconds=retry_delay(max(bandymai, 1))),
+                    atnaujinta=dabar, paimta=None)
+        )
+        if galutine:
+            logger.error("Laiškas #%d (%s) neišsiųstas po %d bandymų: %s", laiskas.id, laiskas.gavejas, bandymai, klaida)
+    db.session.commit()
+
+
+def _connection_lost(klaida):
+    """Ar nutrūko pats prisijungimas, o ne serveris atmetė laišką (SMTPException – OSError poklasis)."""
+    if isinstance(klaida, smtplib.SMTPServerDisconnected):
+        return True
+    return isinstance(klaida, OSError) and not isinstance(klaida, smtplib.SMTPException)
+
+
+def send_batch(kiekis=None):
+    """Išsiunčia vieną laiškų partiją per vieną SMTP prisijungimą. Grąžina (išsiųsta, nepavyko)."""
+    laiskai = claim_batch(kiekis or _config('MAIL_BATCH_SIZE', 50))
+    if not laiskai:
+        return 0, 0
+    issiusta = nepavyko = 0
+    liko = list(laiskai)
+    try:
+        with mail.connect() as prisijungimas:
+            while liko:
+                laiskas = liko.pop(0)
+                try:
+                    prisijungimas.send(Message(
+                        laiskas.tema, recipients=[laiskas.gavejas], body=laiskas.tekstas,
+                        sender=laiskas.siuntejas or current_app.config.get('MAIL_DEFAULT_SENDER')
+                    ))
+                except Exception as e:
+                    if _connection_lost(e):
+                        # Prisijungimas nutrūko – šis ir likusieji tvarkomi žemiau
+                        liko.insert(0, laiskas)
+                        raise
+                    # Pvz. gavėjo adresą atmetė serveris – kiti laiškai siunčiami toliau
+                    _mark_failed([laiskas], e)
+                    nepavyko += 1
+                    logger.warning("Laiškas #%d (%s) neišsiųstas: %s", laiskas.id, laiskas.gavejas, e)
+                else:
+                    _mark_sent(laiskas)
+                    issiusta += 1
+    except Exception as e:
+        if liko:
+            # Pirmasis neišsiųstas laikomas bandytu, kiti dar nebandyti
+            _mark_failed(liko[:1], e)
+            _mark_failed(liko[1:], e, skaiciuoti=False)
+            nepavyko += len(liko)
+            logger.warning("SMTP %s klaida, %d laiškų atidėta: %s", current_app.config.get('MAIL_SERVER'), len(liko), e)
+    logger.info("Išsiųsta laiškų: %d, nepavyko: %d", issiusta, nepavyko)
+    return issiusta, nepavyko
+
+
+def next_due():
+    """Sekundės iki artimiausio laukiančio laiško (None – eilė tuščia)."""
+    artimiausias = db.session.scalar(
+        select(OutboundMail.kitas_bandymas).where(OutboundMail.busena == 'laukia')
+        .order_by(OutboundMail.kitas_bandymas).limit(1)
+    )
+    # Transakcija baigiama prieš laukimą: kitas ciklas turi matyti naujai įdėtus laiškus
+    db.session.rollback()
+    if artimiausias is None:
+        return None
+    return max((artimiausias - datetime.utcnow()).total_seconds(), 0)
+
+
+def run_worker(stop=None, intervalas=None):
+    """Siunčia laiškus, kol nustatomas stop (threading.Event); laukia pažadinimo ar artimiausio bandymo."""
+    stop = stop or threading.Event()
+    intervalas = intervalas or _config('MAIL_QUEUE_INTERVAL', 10)
+    while not stop.is_set():
+        _worker['pazadinti'].clear()
+        try:
+            while send_batch()[0]:
+                pass
+            laukti = next_due()
+        except Exception:
+            db.session.rollback()
+            logger.exception("Laiškų eilės klaida")
+            laukti = intervalas
+        laukti = intervalas if laukti is None else min(laukti, intervalas)
+        _worker['pazadinti'].wait(max(laukti, 0.1))
+
+
+def ensure_worker():
+    """Paleidžia siuntimo giją šiame procese, jei ji dar neveikia."""
+    if _worker['gija'] is not None and _worker['gija'].is_alive():
+        return
+    with _lock:
+        if _worker['gija'] is not None and _worker['gija'].is_alive():
+            return
+        app = current_app._get_current_object()
+
+        def vykdyti():
+            with app.app_context():
+                run_worker()
+
+        _worker['gija'] = threading.Thread(target=vykdyti, name='mail-queue', daemon=True)
+        _worker['gija'].start()
@@ -0,0 +1,735 @@
+import calendar
+import logging
+from functools import wraps
+from datetime import date, datetime, timedelta
+from flask import Blueprint, Response, current_app, render_template, request, redirect, url_for, flash, jsonify, stream_with_context
+from flask_login import login_user, login_required, logout_user, current_user
+from itsdangerous import URLSafeTimedSerializer
+from sqlalchemy import func, tuple_
+from extensions import login_manager
+from models import db, User, RideResult, BackgroundJob, Vehicle, VehicleMonthlyTotal
+import totals
+import rates
+import ride_import
+import ride_export
+import jobs
+import reprice
+import user_purge
+import fleet
+import vehicles
+import passwords
+import user_cache
+import mail_queue
+import versions
+
+logger = logging.getLogger(__name__)
+
+main_bp = Blueprint('main', __name__)
+
+RIDES_PAGE_SIZE = 50
+RIDES_PAGE_MAX = 500
+
+def get_serializer():
+    return URLSafeTimedSerializer(current_app.config['SECRET_KEY'])
+
+@login_manager.user_loader
+def load_user(user_id):
+    return user_cache.load(int(user_id))
+
+def admin_required(f):
+    @wraps(f)
+    @login_required
+    def decorated_function(*args, **kwargs):
+        if not user_cache.confirmed_admin():
+            flash('Tik administratorius gali pasiekti šį puslapį.', 'danger')
+            return redirect(url_for('main.index'))
+        return f(*args, **kwargs)
+    return decorated_function
+
+def ride_dict(irasas):
+    return {
+        'id': irasas.id,
+        'data': irasas.data.strftime('%Y-%m-%d'),
+        'vehicle_id': irasas.vehicle_id,
+        'auto_nr': irasas.auto_nr,
+        'tasku_kiekis': float(irasas.tasku_kiekis or 0),
+        'km_kiekis': float(irasas.km_kiekis or 0),
+        'pakrautos_paletes': float(irasas.pakrautos_paletes or 0),
+        'tara': float(irasas.tara or 0),
+        'atgalines_paletes': float(irasas.atgalines_paletes or 0),
+        'eur_uz_reisa': float(irasas.eur_uz_reisa or 0),
+        'savaitgalis': bool(irasas.savaitgalis)
+    }
+
+@main_bp.route('/', methods=['GET', 'POST'])
+@login_required
+def index():
+    user_id = current_user.id
+    selected_month = request.args.get('month', date.today().strftime('%Y-%m'))
+    
+    if request.method == 'POST':
+        try:
+            if request.is_json:
+                data = request.json
+            else:
+                data = request.form.to_dict()
+            
+            if not data:
+                return jsonify({"success": False, "message": "Nėra duomenų"})
+            
+            logger.debug("Gauti duomenys: %s", data)
+            
+            data['data'] = datetime.strptime(data['data'], '%Y-%m-%d').date()
+            data['savaitgalis'] = data.get('savaitgalis') == 'true'
+            # Formos siunčia vehicle_id, seni klientai – auto_nr (numerį)
+            vehicle_id, auto_nr = vehicles.resolve(data.get('vehicle_id'), data.get('auto_nr'))
+            
+            eur_uz_reisa = rates.compute_one(
+                data['data'],
+                float(data['km_kiekis']),
+                float(data['tasku_kiekis']),
+                float(data['pakrautos_paletes']),
+                float(data['tara']),
+                float(data['atgalines_paletes']),
+                data['savaitgalis']
+            )
+
+            menesis = data['data'].strftime('%Y-%m')
+            naujas_irasas = RideResult(
+                user_id=user_id, 
+                data=data['data'], 
+                vehicle_id=vehicle_id,
+                auto_nr=auto_nr, 
+                tasku_kiekis=float(data['tasku_kiekis']),
+                km_kiekis=float(data['km_kiekis']), 
+                pakrautos_paletes=float(data['pakrautos_paletes']),
+                tara=float(data['tara']), 
+                atgalines_paletes=float(data['atgalines_paletes']),
+                eur_uz_reisa=eur_uz_reisa, 
+                menesis=menesis, 
+                savaitgalis=data['savaitgalis']
+            )
+
+            db.session.add(naujas_irasas)
+            totals.add_ride(naujas_irasas)
+            db.session.commit()
+
+            new_record = ride_dict(naujas_irasas)
+
+            # Bendra suma imama iš mėnesio sumų lentelės
+            bendra_suma = totals.get_totals(user_id, menesis)
+
+            return jsonify({
+                "success": True,
+                "message": "Įrašas sėkmingai pridėtas!",
+                "newRecord": new_record,
+                "newTotal": bendra_suma
+            })
+        except Exception as e:
+            db.session.rollback()
+            logger.exception("Klaida pridedant įrašą")
+            return jsonify({"success": False, "message": f"Klaida pridedant įrašą: {str(e)}"})
+
+    user_info = {
+        'id': current_user.id,
+        'username': current_user.username,
+        'email': current_user.email,
+        'is_admin': current_user.is_admin
+    }
+    current_date = date.today()
+
+    # Nepasikeitus reisams naršyklė gauna 304 – mėnesio sumos neskaičiuojamos
+    zyme = versions.stamp([versions.rides_key(user_id)], selected_month, current_date, user_info,
+                          sablonas='index.html')
+    atsakymas = versions.not_modified(zyme)
+    if atsakymas is not None:
+        return atsakymas
+
+    # Patys įrašai kraunami puslapiais per /api/rides
+    bendra_suma = totals.get_totals(user_id, selected_month)
+
+    available_months = []
+    for i in range(12):
+        month_date = current_date - timedelta(days=current_date.day - 1) - timedelta(days=30*i)
+        month_value = month_date.strftime('%Y-%m')
+        month_label = f"{calendar.month_name[month_date.month]} {month_date.year}"
+        available_months.append({'value': month_value, 'label': month_label})
+
+    return versions.with_stamp(render_template('index.html', page_data={
+        'bendra_suma': bendra_suma,
+        'selected_month': selected_month,
+        'vehicles_url': url_for('main.vehicles_api'),
+        'user': user_info,
+        'available_months': available_months,
+        'index_url': url_for('main.index'),
+        'export_url': url_for('main.export_rides'),
+        'rides_url': url_for('main.rides_api')
+    }), zyme)
+
+@main_bp.route('/admin')
+@admin_required
+def admin_panel():
+    users = User.query.all()
+    darbai = BackgroundJob.query.order_by(BackgroundJob.id.desc()).limit(10).all()
+    return render_template('admin_panel.html', users=users, darbai=darbai)
+
+@main_bp.route('/admin/fleet')
+@admin_required
+def admin_fleet():
+    try:
+        nuo = fleet.parse_month(request.args.get('nuo'))
+        iki = fleet.parse_month(request.args.get('iki'))
+    except ValueError as e:
+        flash(str(e), 'danger')
+        nuo = iki = None
+    if nuo is None or iki is None:
+        numatytas_nuo, numatytas_iki = fleet.default_range()
+        nuo, iki = nuo or numatytas_nuo, iki or numatytas_iki
+    nuo, iki = min(nuo, iki), max(nuo, iki)
+    grupe = request.args.get('grupe')
+    if grupe not in fleet.GRUPES:
+        grupe = fleet.GRUPES[0]
+    rikiuoti = request.args.get('rikiuoti')
+    if rikiuoti not in fleet.RIKIAVIMAS:
+        rikiuoti = 'eur_uz_reisa'
+    tvarka = 'asc' if request.args.get('tvarka') == 'asc' else 'desc'
+    user_id = request.args.get('user_id', type=int)
+    vehicle_id = None if user_id is not None else request.args.get('vehicle_id', type=int)
+
+    suvestine = fleet.summary(grupe, nuo, iki, user_id, vehicle_id)
+    # Talpykloje laikomas žodynas nekeičiamas – rikiuojamos kopijos
+    suvestine = dict(suvestine, eilutes=fleet.sort_rows(suvestine['eilutes'], rikiuoti, tvarka == 'desc'))
+    if 'detales' in suvestine:
+        suvestine['detales'] = fleet.sort_rows(suvestine['detales'], rikiuoti, tvarka == 'desc')
+    if request.args.get('format') == 'json':
+        return jsonify(suvestine)
+    parametrai = {'nuo': nuo, 'iki': iki, 'grupe': grupe, 'rikiuoti': rikiuoti, 'tvarka': tvarka}
+    return render_template('admin_fleet.html', suvestine=suvestine, parametrai=parametrai,
+                           user_id=user_id, vehicle_id=vehicle_id, stulpeliai=fleet.PAVADINIMAI)
+
+@main_bp.route('/admin/vehicles', methods=['GET', 'POST'])
+@admin_required
+def admin_vehicles():
+    if request.method == 'POST':
+        try:
+            numeris = vehicles.validate(request.form.get('numeris'))
+        except ValueError as e:
+            flash(str(e), 'danger')
+            return redirect(url_for('main.admin_vehicles'))
+        if Vehicle.query.filter_by(numeris=numeris).first():
+            flash(f'Automobilis {numeris} jau yra sąraše.', 'warning')
+        else:
+            db.session.add(Vehicle(numeris=numeris, pastaba=(request.form.get('pastaba') or '').strip() or None))
+            db.session.commit()
+            vehicles.invalidate()
+            flash(f'Automobilis {numeris} pridėtas.', 'success')
+        return redirect(url_for('main.admin_vehicles'))
+
+    automobiliai = Vehicle.query.order_by(Vehicle.aktyvus.desc(), Vehicle.numeris).all()
+    # Reisų skaičius imamas iš knygos, ne COUNT per ride_result
+    reisai = dict(
+        db.session.query(VehicleMonthlyTotal.vehicle_id, func.sum(VehicleMonthlyTotal.irasu_kiekis))
+        .group_by(VehicleMonthlyTotal.vehicle_id).all()
+    )
+    return render_template('admin_vehicles.html', automobiliai=automobiliai, reisai=reisai)
+
+@main_bp.route('/admin/vehicles/<int:vehicle_id>/toggle', methods=['POST'])
+@admin_required
+def toggle_vehicle(vehicle_id):
+    automobilis = Vehicle.query.get_or_404(vehicle_id)
+    automobilis.aktyvus = not automobilis.aktyvus
+    db.session.commit()
+    vehicles.invalidate()
+    flash(f'Automobilis {automobilis.numeris} {"grąžintas į sąrašą" if automobilis.aktyvus else "nebenaudojamas"}.', 'success')
+    return redirect(url_for('main.admin_vehicles'))
+
+@main_bp.route('/admin/vehicles/<int:vehicle_id>/delete', methods=['POST'])
+@admin_required
+def delete_vehicle(vehicle_id):
+    automobilis = Vehicle.query.get_or_404(vehicle_id)
+    if db.session.query(RideResult.id).filter_by(vehicle_id=vehicle_id).first():
+        flash(f'Automobilis {automobilis.numeris} turi reisų – jį galima tik padaryti neaktyviu.', 'danger')
+    else:
+        VehicleMonthlyTotal.query.filter_by(vehicle_id=vehicle_id).delete()
+        db.session.delete(automobilis)
+        db.session.commit()
+        vehicles.invalidate()
+        flash(f'Automobilis {automobilis.numeris} ištrintas.', 'success')
+    return redirect(url_for('main.admin_vehicles'))
+
+@main_bp.route('/admin/reprice', methods=['POST'])
+@admin_required
+def admin_reprice():
+    nuo = request.form.get('nuo') or None
+    iki = request.form.get('iki') or None
+    try:
+        for reiksme in (nuo, iki):
+            if reiksme:
+                date.fromisoformat(reiksme)
+    except ValueError:
+        flash('Neteisingas datos formatas, tikimasi YYYY-MM-DD', 'danger')
+        return redirect(url_for('main.admin_panel'))
+    job = reprice.create_reprice_job(nuo, iki)
+    jobs.start_thread(job.id)
+    flash(f'Perskaičiavimas pradėtas (darbas #{job.id}).', 'success')
+    return redirect(url_for('main.admin_panel'))
+
+@main_bp.route('/admin/jobs/<int:job_id>')
+@admin_required
+def admin_job_status(job_id):
+    job = BackgroundJob.query.get_or_404(job_id)
+    return jsonify({
+        'id': job.id,
+        'tipas': job.tipas,
+        'busena': job.busena,
+        'apdorota': job.apdorota,
+        'pakeista': job.pakeista,
+        'viso': job.viso,
+        'progresas': round(job.progresas, 1),
+        'klaida': job.klaida
+    })
+
+@main_bp.route('/admin/jobs/<int:job_id>/resume', methods=['POST'])
+@admin_required
+def admin_job_resume(job_id):
+    BackgroundJob.query.get_or_404(job_id)
+    jobs.start_thread(job_id)
+    return redirect(url_for('main.admin_panel'))
+
+@main_bp.route('/admin/delete_user/<int:user_id>', methods=['POST'])
+@admin_required
+def delete_user(user_id):
+    user = User.query.get_or_404(user_id)
+    if user.is_admin:
+        flash('Negalima ištrinti administratoriaus paskyros.', 'danger')
+    elif user.istrinta is not None:
+        flash(f'Vartotojas {user.username} jau trinamas.', 'info')
+    else:
+        # Vartotojas iškart pažymimas ištrintu, o jo reisai trinami fone dalimis (user_purge.py)
+        user.istrinta = datetime.utcnow()
+        db.session.commit()
+        user_cache.invalidate(user.id)
+        job = user_purge.create_purge_job(user)
+        jobs.start_thread(job.id)
+        flash(f'Vartotojas {user.username} ištrintas, jo įrašai trinami fone (darbas #{job.id}).', 'success')
+    return redirect(url_for('main.admin_panel'))
+
+@main_bp.route('/grafikai')
+@login_required
+def grafikai():
+    # Duomenys kraunami per /api/grafikai, puslapis priklauso tik nuo šablono
+    zyme = versions.stamp([], sablonas='grafikai.html')
+    atsakymas = versions.not_modified(zyme)
+    if atsakymas is not None:
+        return atsakymas
+    return versions.with_stamp(render_template('grafikai.html', page_data={
+        'vehicles_url': url_for('main.vehicles_api'),
+        'api_url': url_for('main.grafikai_api')
+    }), zyme)
+
+@main_bp.route('/api/grafikai')
+@login_required
+def grafikai_api():
+    try:
+        nuo = request.args.get('nuo')
+        iki = request.args.get('iki')
+        nuo = datetime.strptime(nuo, '%Y-%m-%d').date() if nuo else None
+        iki = datetime.strptime(iki, '%Y-%m-%d').date() if iki else None
+    except ValueError:
+        return jsonify({"success": False, "message": "Neteisingas datos formatas, tikimasi YYYY-MM-DD"}), 400
+
+    vehicle_id = None
+    if request.args.get('vehicle_id') or request.args.get('auto_nr'):
+        try:
+            vehicle_id = vehicles.resolve(request.args.get('vehicle_id'), request.args.get('auto_nr'), tik_aktyvus=False)[0]
+        except ValueError as e:
+            return jsonify({"success": False, "message": str(e)}), 400
+
+    zyme = versions.stamp([versions.rides_key(current_user.id)], nuo, iki, vehicle_id)
+    atsakymas = versions.not_modified(zyme)
+    if atsakymas is not None:
+        return atsakymas
+    menesiai = totals.monthly_series(current_user.id, nuo=nuo, iki=iki, vehicle_id=vehicle_id)
+    return versions.with_stamp(jsonify({"success": True, "menesiai": menesiai}), zyme)
+
+@main_bp.route('/api/vehicles')
+@login_required
+def vehicles_api():
+    """Automobilių pasirinkimo sąrašas; naršyklė jį perklausia su If-None-Match."""
+    sarasas = vehicles.picker()
+    atsakymas = jsonify(sarasas['automobiliai'])
+    atsakymas.set_etag(sarasas['etag'])
+    atsakymas.headers['Cache-Control'] = 'private, no-cache'
+    return atsakymas.make_conditional(request)
+
+@main_bp.route('/api/rides')
+@login_required
+def rides_api():
+    """Reisų puslapis, rūšiuotas pagal (data, id).
+
+    Parametrai: menesis (YYYY-MM) arba nuo/iki (YYYY-MM-DD), kryptis
+    (desc/asc), limit ir po – ankstesnio atsakymo "kitas" žymeklis.
+    """
+    kryptis = request.args.get('kryptis', 'desc')
+    if kryptis not in ('asc', 'desc'):
+        return jsonify({"success": False, "message": "kryptis turi būti asc arba desc"}), 400
+    try:
+        limit = min(max(int(request.args.get('limit', RIDES_PAGE_SIZE)), 1), RIDES_PAGE_MAX)
+        menesis = request.args.get('menesis')
+        if menesis:
+            datetime.strptime(menesis, '%Y-%m')
+        nuo = request.args.get('nuo')
+        iki = request.args.get('iki')
+        nuo = date.fromisoformat(nuo) if nuo else None
+        iki = date.fromisoformat(iki) if iki else None
+        po = request.args.get('po')
+        if po:
+            po_data, po_id = po.split(',')
+            po = (date.fromisoformat(po_data), int(po_id))
+    except ValueError:
+        return jsonify({"success": False, "message": "Neteisingi parametrai"}), 400
+
+    user_id = current_user.id
+    vardas = request.args.get('vartotojas')
+    if vardas and user_cache.confirmed_admin():
+        user_id = User.query.filter_by(username=vardas).first_or_404().id
+
+    uzklausa = RideResult.query.filter(RideResult.user_id == user_id)
+    if menesis:
+        uzklausa = uzklausa.filter(RideResult.menesis == menesis)
+    if nuo:
+        uzklausa = uzklausa.filter(RideResult.data >= nuo)
+    if iki:
+        uzklausa = uzklausa.filter(RideResult.data <= iki)
+    raktas = tuple_(RideResult.data, RideResult.id)
+    if kryptis == 'desc':
+        if po:
+            uzklausa = uzklausa.filter(raktas < po)
+        uzklausa = uzklausa.order_by(RideResult.data.desc(), RideResult.id.desc())
+    else:
+        if po:
+            uzklausa = uzklausa.filter(raktas > po)
+        uzklausa = uzklausa.order_by(RideResult.data, RideResult.id)
+
+    # Viena eilutė daugiau – kad žinotume, ar yra kitas puslapis
+    irasai = uzklausa.limit(limit + 1).all()
+    kitas = None
+    if len(irasai) > limit:
+        irasai = irasai[:limit]
+        kitas = f"{irasai[-1].data.isoformat()},{irasai[-1].id}"
+    return jsonify({"success": True, "irasai": [ride_dict(irasas) for irasas in irasai], "kitas": kitas})
+
+@main_bp.route('/register', methods=['GET', 'POST'])
+def register():
+    if request.method == 'POST':
+        username = request.form['username']
+        email = request.form['email']
+        password = request.form['password']
+        # Maiša skaičiuojama prieš rašančią transakciją (žr. login)
+        password_hash = passwords.hash_password(password)
+        
+        # Patikrinkite, ar vartotojo vardas jau egzistuoja
+        if User.query.filter_by(username=username).first():
+            flash('Vartotojo vardas jau užimtas.', 'danger')
+            return redirect(url_for('main.register'))
+        
+        # Patikrinkite, ar el. paštas jau užregistruotas
+        if User.query.filter_by(email=email).first():
+            flash('El. paštas jau užregistruotas.', 'danger')
+            return redirect(url_for('main.register'))
+        
+        # Sukurkite naują vartotoją
+        new_user = User(username=username, email=email, password_hash=password_hash)
+        
+        # Išsaugokite naują vartotoją duomenų bazėje
+        db.session.add(new_user)
+        db.session.commit()
+        
+        
+        
+        flash('Registracija sėkminga! Galite prisijungti.', 'success')
+        return redirect(url_for('main.login'))
+    
+    # Jei tai GET užklausa, tiesiog parodykite registracijos formą
+    return render_template('register.html')
+    
+
+@main_bp.route('/login', methods=['GET', 'POST'])
+def login():
+    if request.method == 'POST':
+        username = request.form.get('username')
+        password = request.form.get('password')
+        logger.debug("Bandoma prisijungti su vartotoju: %s", username)
+        
+        user = User.query.filter_by(username=username, istrinta=None).first()
+        if user:
+            # POST transakcija rašanti (BEGIN IMMEDIATE), todėl ją baigiame prieš lėtą
+            # maišos tikrinimą; permaišytas slaptažodis įrašomas nauja transakcija
+            db.session.expunge(user)
+            db.session.rollback()
+            if user.check_password(password):
+                # Išsaugoma, jei check_password permaišė slaptažodį nauju metodu
+                db.session.add(user)
+                db.session.commit()
+                login_user(user)
+                logger.debug("Vartotojas prisijungė: %s (admin: %s)", user.username, user.is_admin)
+                return redirect(url_for('main.index'))
+            else:
+                logger.info("Neteisingas slaptažodis vartotojui %s", username)
+        else:
+            logger.info("Vartotojas nerastas: %s", username)
+        
+        flash('Neteisingas vartotojo vardas arba slaptažodis.', 'danger')
+    return render_template('login.html')
+
+@main_bp.route('/logout')
+@login_required
+def logout():
+    logout_user()
+    flash('Sėkmingai atsijungėte!', 'success')
+    return redirect(url_for('main.login'))
+
+@main_bp.route('/reset_password_request', methods=['GET', 'POST'])
+def reset_password_request():
+    if request.method == 'POST':
+        email = request.form['email']
+        user = User.query.filter_by(email=email, istrinta=None).first()
+        if user:
+            send_password_reset_email(user)
+            flash('Patikrinkite savo el. paštą dėl instrukcijų, kaip atstatyti slaptažodį.', 'info')
+        else:
+            flash('Nerastas vartotojas su šiuo el. paštu.', 'warning')
+        return redirect(url_for('main.login'))
+    return render_template('reset_password_request.html')
+
+@main_bp.route('/reset_password/<token>', methods=['GET', 'POST'])
+def reset_password(token):
+    try:
+        email = get_serializer().loads(token, salt='password-reset-salt', max_age=3600)
+    except:
+        flash('Netinkama arba pasibaigusi nuoroda', 'warning')
+        return redirect(url_for('main.reset_password_request'))
+    
+    if request.method == 'POST':
+        # Maiša skaičiuojama prieš rašančią transakciją (žr. login)
+        password_hash = passwords.hash_password(request.form['password'])
+
+    user = User.query.filter_by(email=email, istrinta=None).first()
+    if not user:
+        flash('Vartotojas nerastas', 'warning')
+        return redirect(url_for('main.reset_password_request'))
+    
+    if request.method == 'POST':
+        user.password_hash = password_hash
+        db.session.commit()
+        user_cache.invalidate(user.id)
+        flash('Jūsų slaptažodis buvo atnaujintas!', 'success')
+        return redirect(url_for('main.login'))
+    
+    return render_template('reset_password.html')
+
+def send_password_reset_email(user):
+    token = get_serializer().dumps(user.email, salt='password-reset-salt')
+    reset_url = url_for('main.reset_password', token=token, _external=True)
+    subject = 'Slaptažodžio Atstatymas'
+    body = f'''
+    Norėdami atstatyti slaptažodį, spauskite šią nuorodą:
+    {reset_url}
+
+    Jei neprašėte atstatyti slaptažodžio, ignoruokite šį laišką.
+    '''
+    # Siunčia mail_queue fono gija ar `flask mail-queue worker` – užklausa SMTP nelaukia
+    mail_queue.enqueue(user.email, subject, body, current_app.config['MAIL_USERNAME'])
+
+@main_bp.route('/edit/<int:id>', methods=['GET', 'POST'])
+@login_required
+def edit(id):
+    irasas = RideResult.query.get_or_404(id)
+    if irasas.user_id != current_user.id:
+        flash('Jūs neturite teisės redaguoti šio įrašo.', 'danger')
+        return redirect(url_for('main.index'))
+    
+    if request.method == 'POST':
+        try:
+            totals.remove_ride(irasas)
+            irasas.data = datetime.strptime(request.form['data'], '%Y-%m-%d').date()
+            irasas.vehicle_id, irasas.auto_nr = vehicles.resolve(
+                request.form.get('vehicle_id'), request.form.get('auto_nr'), leisti_id=irasas.vehicle_id
+            )
+            irasas.km_kiekis = float(request.form['km_kiekis'])
+            irasas.tasku_kiekis = float(request.form['tasku_kiekis'])
+            irasas.pakrautos_paletes = float(request.form['pakrautos_paletes'])
+            irasas.atgalines_paletes = float(request.form['atgalines_paletes'])
+            irasas.tara = float(request.form['tara'])
+            irasas.savaitgalis = request.form.get('savaitgalis') == 'true'
+
+            irasas.eur_uz_reisa = rates.compute_one(
+                irasas.data,
+                irasas.km_kiekis,
+                irasas.tasku_kiekis,
+                irasas.pakrautos_paletes,
+                irasas.tara,
+                irasas.atgalines_paletes,
+                irasas.savaitgalis
+            )
+
+            irasas.menesis = irasas.data.strftime('%Y-%m')
+            totals.add_ride(irasas)
+
+            db.session.commit()
+            flash('Įrašas sėkmingai atnaujintas!', 'success')
+            return redirect(url_for('main.index'))
+        except Exception as e:
+            db.session.rollback()
+            flash(f'Klaida atnaujinant įrašą: {str(e)}', 'danger')
+    return render_template('edit.html', page_data={
+        'irasas': {
+            'id': irasas.id,
+            'data': irasas.data.strftime('%Y-%m-%d'),
+            'vehicle_id': irasas.vehicle_id,
+            'auto_nr': irasas.auto_nr,
+            'tasku_kiekis': irasas.tasku_kiekis,
+            'km_kiekis': irasas.km_kiekis,
+            'pakrautos_paletes': irasas.pakrautos_paletes,
+            'tara': irasas.tara,
+            'atgalines_paletes': irasas.atgalines_paletes,
+            'savaitgalis': bool(irasas.savaitgalis)
+        },
+        'vehicles_url': url_for('main.vehicles_api'),
+        'action_url': url_for('main.edit', id=irasas.id),
+        'index_url': url_for('main.index')
+    })
+
+@main_bp.route('/delete/<int:id>')
+@login_required
+def delete(id):
+    irasas = RideResult.query.get_or_404(id)
+    if irasas.user_id != current_user.id:
+        return jsonify({"success": False, "message": 'Jūs neturite teisės ištrinti šio įrašo.'})
+    
+    try:
+        # Išsaugome įrašo duomenis prieš jį ištrindami
+        deleted_record = {
+            'tasku_kiekis': irasas.tasku_kiekis,
+            'km_kiekis': irasas.km_kiekis,
+            'pakrautos_paletes': irasas.pakrautos_paletes,
+            'tara': irasas.tara,
+            'atgalines_paletes': irasas.atgalines_paletes,
+            'eur_uz_reisa': irasas.eur_uz_reisa
+        }
+        
+        menesis = irasas.menesis
+        totals.remove_ride(irasas)
+        db.session.delete(irasas)
+        db.session.commit()
+        
+        # Nauja ištrinto įrašo mėnesio suma
+        new_total = totals.get_totals(current_user.id, menesis)
+        
+        return jsonify({
+            "success": True, 
+            "message": 'Įrašas sėkmingai ištrintas!',
+            "deletedRecord": deleted_record,
+            "newTotal": new_total
+        })
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({"success": False, "message": f'Klaida trinant įrašą: {str(e)}'})
+
+@main_bp.route('/import', methods=['GET', 'POST'])
+@login_required
+def import_rides():
+    if request.method == 'GET':
+        return render_template('import.html')
+
+    failas = request.files.get('failas')
+    if not failas or not failas.filename:
+        return render_template('import.html', klaida='Pasirinkite failą.')
+
+    # Administratorius gali importuoti ir kitų vartotojų reisus (stulpelis vartotojas)
+    vartotojai = None
+    if current_user.is_admin:
+        vartotojai = dict(db.session.query(User.username, User.id).filter(User.istrinta.is_(None)).all())
+    try:
+        rezultatas = ride_import.import_rides(
+            failas.stream, ride_import.detect_format(failas.filename), current_user.id, vartotojai
+        )
+    except ValueError as e:
+        return render_template('import.html', klaida=str(e))
+    except Exception as e:
+        logger.exception("Klaida importuojant reisus")
+        return render_template('import.html', klaida=f'Klaida importuojant: {str(e)}')
+    return render_template('import.html', rezultatas=rezultatas)
+
+@main_bp.route('/export')
+@login_required
+def export_rides():
+    formatas = request.args.get('format', 'csv')
+    nuo = request.args.get('nuo') or None
+    iki = request.args.get('iki') or None
+    if formatas not in ride_export.MIMETYPES:
+        return 'Palaikomi formatai: csv, xlsx', 400
+    try:
+        for menesis in (nuo, iki):
+            if menesis:
+                datetime.strptime(menesis, '%Y-%m')
+    except ValueError:
+        return 'Neteisingas mėnesio formatas, tikimasi YYYY-MM', 400
+
+    # Administratorius gali eksportuoti bet kurį vairuotoją arba visus (vartotojas=visi)
+    user_id, kam = current_user.id, current_user.username
+    vardas = request.args.get('vartotojas')
+    if vardas and user_cache.confirmed_admin():
+        kam = vardas
+        if vardas == 'visi':
+            user_id = None
+        else:
+            user_id = User.query.filter_by(username=vardas).first_or_404().id
+
+    # Sesijos transakcija baigiama: siuntimo metu laikomas tik eksporto skaitymo prisijungimas
+    db.session.rollback()
+    eilutes = ride_export.iter_rows(ride_export.rides_query(user_id, nuo, iki))
+    generatorius = ride_export.iter_xlsx(eilutes) if formatas == 'xlsx' else ride_export.iter_csv(eilutes)
+    failo_vardas = f"reisai_{kam}_{nuo or 'pradzia'}_{iki or 'dabar'}.{formatas}"
+    return Response(
+        stream_with_context(generatorius),
+        mimetype=ride_export.MIMETYPES[formatas],
+        headers={'Content-Disposition': f'attachment; filename="{failo_vardas}"'}
+    )
+
+@main_bp.app_template_filter('date_format')
+def date_format(value, format='%Y-%m-%d'):
+    if isinstance(value, str):
+        return datetime.strptime(value, '%Y-%m-%d').strftime(format)
+    return value.strftime(format)
+
+@main_bp.app_errorhandler(404)
+def page_not_found(e):
+    return render_template('404.html'), 404
+
+@main_bp.app_errorhandler(500)
+def internal_server_error(e):
+    return render_template('500.html'), 500
+
+@main_bp.route('/reset_admin', methods=['GET', 'POST'])
+def reset_admin():
+    if request.method == 'POST':
+        username = request.form['username']
+        password = request.form['password']
+        # Maiša skaičiuojama prieš transakciją (žr. login)
+        password_hash = passwords.hash_password(password)
+        
+        admin = User.query.filter_by(is_admin=True).first()
+        if admin:
+            admin.username = username
+            admin.password_hash = password_hash
+        else:
+            admin = User(username=username, email='admin@example.com', is_admin=True, password_hash=password_hash)
+            db.session.add(admin)
+        
+        db.session.commit()
+        user_cache.invalidate(admin.id)
+        flash('Administratoriaus paskyra atnaujinta arba sukurta!', 'success')
+        return redirect(url_for('main.login'))
+    
+    return render_template('reset_admin.html')
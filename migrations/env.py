@@ -97,14 +97,26 @@ def run_migrations_online():
     connectable = get_engine()
 
     with connectable.connect() as connection:
+        sqlite = connection.dialect.name == 'sqlite'
+        # SQLite nemoka ALTER COLUMN/CONSTRAINT – tokie pakeitimai daromi per batch režimą
+        conf_args.setdefault('render_as_batch', sqlite)
+        if sqlite:
+            # Batch režimas lentelę perkuria (DROP TABLE): su foreign_keys=ON tai nepavyktų
+            # ar per ON DELETE CASCADE ištrintų susijusias eilutes. PRAGMA veikia tik už
+            # transakcijos ribų, todėl vykdoma tiesiai per DBAPI prisijungimą.
+            connection.connection.driver_connection.execute('PRAGMA foreign_keys=OFF')
         context.configure(
             connection=connection,
             target_metadata=get_metadata(),
             **conf_args
         )
 
-        with context.begin_transaction():
-            context.run_migrations()
+        try:
+            with context.begin_transaction():
+                context.run_migrations()
+        finally:
+            if sqlite and current_app.config.get('SQLITE_FOREIGN_KEYS'):
+                connection.connection.driver_connection.execute('PRAGMA foreign_keys=ON')
 
 
 if context.is_offline_mode():
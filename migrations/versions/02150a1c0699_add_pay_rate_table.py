@@ -0,0 +1,49 @@
+"""Add pay_rate table with the current rates
+
+Revision ID: 02150a1c0699
+Revises: fb4d8eb3d9c3
+Create Date: 2026-10-18 12:05:13.204117
+
+"""
+from datetime import date
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '02150a1c0699'
+down_revision = 'fb4d8eb3d9c3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    pay_rate = op.create_table('pay_rate',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('galioja_nuo', sa.Date(), nullable=False),
+    sa.Column('km_kiekis', sa.Float(), nullable=False),
+    sa.Column('tasku_kiekis', sa.Float(), nullable=False),
+    sa.Column('pakrautos_paletes', sa.Float(), nullable=False),
+    sa.Column('tara', sa.Float(), nullable=False),
+    sa.Column('atgalines_paletes', sa.Float(), nullable=False),
+    sa.Column('savaitgalio_koef', sa.Float(), nullable=False),
+    sa.Column('pastaba', sa.String(length=200), nullable=True),
+    sa.Column('sukurta', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('galioja_nuo')
+    )
+    # Iki šiol kode buvę įkainiai galioja visiems esamiems reisams
+    op.bulk_insert(pay_rate, [{
+        'galioja_nuo': date(2000, 1, 1),
+        'km_kiekis': 0.1,
+        'tasku_kiekis': 1.7,
+        'pakrautos_paletes': 0.64,
+        'tara': 0.5,
+        'atgalines_paletes': 0.64,
+        'savaitgalio_koef': 1.2,
+        'pastaba': 'Pradiniai įkainiai',
+    }])
+
+
+def downgrade():
+    op.drop_table('pay_rate')
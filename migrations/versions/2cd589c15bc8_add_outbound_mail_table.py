@@ -0,0 +1,41 @@
+"""Add outbound_mail queue table
+
+Revision ID: 2cd589c15bc8
+Revises: d5ed93d18ecb
+Create Date: 2026-10-18 16:41:08.552907
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '2cd589c15bc8'
+down_revision = 'd5ed93d18ecb'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('outbound_mail',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('gavejas', sa.String(length=120), nullable=False),
+    sa.Column('siuntejas', sa.String(length=120), nullable=True),
+    sa.Column('tema', sa.String(length=200), nullable=False),
+    sa.Column('tekstas', sa.Text(), nullable=False),
+    sa.Column('busena', sa.String(length=20), nullable=False),
+    sa.Column('bandymai', sa.Integer(), nullable=False),
+    sa.Column('kitas_bandymas', sa.DateTime(), nullable=False),
+    sa.Column('paimta', sa.String(length=32), nullable=True),
+    sa.Column('klaida', sa.Text(), nullable=True),
+    sa.Column('sukurta', sa.DateTime(), nullable=True),
+    sa.Column('atnaujinta', sa.DateTime(), nullable=True),
+    sa.Column('issiusta', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_outbound_mail_busena_kitas', 'outbound_mail', ['busena', 'kitas_bandymas'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_outbound_mail_busena_kitas', table_name='outbound_mail')
+    op.drop_table('outbound_mail')
@@ -0,0 +1,29 @@
+"""Add data_version table
+
+Revision ID: 3263e6a046e0
+Revises: 35bce8e40580
+Create Date: 2026-10-18 21:34:52.106735
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3263e6a046e0'
+down_revision = '35bce8e40580'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('data_version',
+    sa.Column('raktas', sa.String(length=50), nullable=False),
+    sa.Column('versija', sa.Integer(), nullable=False),
+    sa.Column('pakeista', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('raktas')
+    )
+
+
+def downgrade():
+    op.drop_table('data_version')
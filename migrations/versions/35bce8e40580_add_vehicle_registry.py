@@ -0,0 +1,115 @@
+"""Add vehicle registry and ride_result.vehicle_id
+
+Revision ID: 35bce8e40580
+Revises: 56bdd3655d21
+Create Date: 2026-10-18 20:41:37.518204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '35bce8e40580'
+down_revision = '56bdd3655d21'
+branch_labels = None
+depends_on = None
+
+# Buvęs main_routes.CAR_NUMBERS – šie automobiliai lieka aktyvūs
+CAR_NUMBERS = [
+    'FFH433', 'FGB047', 'GJM253', 'GJM332', 'GUN418', 'JEH745', 'JEH746', 'KTT023', 'KTT029', 'KUL631',
+    'KUL633', 'KUL637', 'KUM239', 'KZL604', 'LCS347', 'LCS352', 'LCS353', 'LCS360', 'LCS358',
+]
+
+SUMOS = """COUNT(id),
+               COALESCE(SUM(tasku_kiekis), 0), COALESCE(SUM(km_kiekis), 0),
+               COALESCE(SUM(pakrautos_paletes), 0), COALESCE(SUM(tara), 0),
+               COALESCE(SUM(atgalines_paletes), 0), COALESCE(SUM(eur_uz_reisa), 0)"""
+SUMU_STULPELIAI = "irasu_kiekis, tasku_kiekis, km_kiekis, pakrautos_paletes, tara, atgalines_paletes, eur_uz_reisa"
+
+
+def _sumu_stulpeliai():
+    return [
+        sa.Column('irasu_kiekis', sa.Integer(), nullable=False),
+        sa.Column('tasku_kiekis', sa.Float(), nullable=False),
+        sa.Column('km_kiekis', sa.Float(), nullable=False),
+        sa.Column('pakrautos_paletes', sa.Float(), nullable=False),
+        sa.Column('tara', sa.Float(), nullable=False),
+        sa.Column('atgalines_paletes', sa.Float(), nullable=False),
+        sa.Column('eur_uz_reisa', sa.Float(), nullable=False),
+    ]
+
+
+def upgrade():
+    vehicle = op.create_table('vehicle',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('numeris', sa.String(length=20), nullable=False),
+    sa.Column('aktyvus', sa.Boolean(), nullable=False),
+    sa.Column('pastaba', sa.String(length=200), nullable=True),
+    sa.Column('sukurta', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('numeris')
+    )
+
+    # Registras: sąrašo automobiliai aktyvūs, kiti reisuose rasti numeriai – neaktyvūs
+    conn = op.get_bind()
+    esami = [eilute[0] for eilute in conn.execute(sa.text('SELECT DISTINCT auto_nr FROM ride_result'))]
+    op.bulk_insert(
+        vehicle,
+        [{'numeris': numeris, 'aktyvus': True} for numeris in CAR_NUMBERS]
+        + [{'numeris': numeris, 'aktyvus': False} for numeris in sorted(set(esami) - set(CAR_NUMBERS))]
+    )
+
+    op.add_column('ride_result', sa.Column('vehicle_id', sa.Integer(), nullable=True))
+    op.execute('UPDATE ride_result SET vehicle_id = (SELECT id FROM vehicle WHERE vehicle.numeris = ride_result.auto_nr)')
+    with op.batch_alter_table('ride_result') as batch_op:
+        batch_op.alter_column('vehicle_id', existing_type=sa.Integer(), nullable=False)
+        batch_op.create_foreign_key('fk_ride_result_vehicle_id_vehicle', 'vehicle', ['vehicle_id'], ['id'])
+        batch_op.create_index('ix_ride_result_vehicle_data', ['vehicle_id', 'data'], unique=False)
+
+    # Automobilio knyga perkuriama su vehicle_id raktu
+    op.drop_table('vehicle_monthly_total')
+    op.create_table('vehicle_monthly_total',
+    sa.Column('menesis', sa.String(length=7), nullable=False),
+    sa.Column('vehicle_id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    *_sumu_stulpeliai(),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], name='fk_vehicle_monthly_total_user_id_user', ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['vehicle_id'], ['vehicle.id'], name='fk_vehicle_monthly_total_vehicle_id_vehicle'),
+    sa.PrimaryKeyConstraint('menesis', 'vehicle_id', 'user_id')
+    )
+    op.create_index('ix_vehicle_monthly_total_user_menesis', 'vehicle_monthly_total', ['user_id', 'menesis'], unique=False)
+    op.create_index('ix_vehicle_monthly_total_vehicle_menesis', 'vehicle_monthly_total', ['vehicle_id', 'menesis'], unique=False)
+    op.execute(f"""
+        INSERT INTO vehicle_monthly_total (menesis, vehicle_id, user_id, {SUMU_STULPELIAI})
+        SELECT menesis, vehicle_id, user_id, {SUMOS}
+        FROM ride_result
+        GROUP BY menesis, vehicle_id, user_id
+    """)
+
+
+def downgrade():
+    op.drop_table('vehicle_monthly_total')
+    op.create_table('vehicle_monthly_total',
+    sa.Column('menesis', sa.String(length=7), nullable=False),
+    sa.Column('auto_nr', sa.String(length=20), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    *_sumu_stulpeliai(),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], name='fk_vehicle_monthly_total_user_id_user', ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('menesis', 'auto_nr', 'user_id')
+    )
+    op.create_index('ix_vehicle_monthly_total_user_menesis', 'vehicle_monthly_total', ['user_id', 'menesis'], unique=False)
+    op.create_index('ix_vehicle_monthly_total_auto_menesis', 'vehicle_monthly_total', ['auto_nr', 'menesis'], unique=False)
+    op.execute(f"""
+        INSERT INTO vehicle_monthly_total (menesis, auto_nr, user_id, {SUMU_STULPELIAI})
+        SELECT menesis, auto_nr, user_id, {SUMOS}
+        FROM ride_result
+        GROUP BY menesis, auto_nr, user_id
+    """)
+
+    with op.batch_alter_table('ride_result') as batch_op:
+        batch_op.drop_index('ix_ride_result_vehicle_data')
+        batch_op.drop_constraint('fk_ride_result_vehicle_id_vehicle', type_='foreignkey')
+        batch_op.drop_column('vehicle_id')
+
+    op.drop_table('vehicle')
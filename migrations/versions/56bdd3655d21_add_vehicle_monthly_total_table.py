@@ -0,0 +1,53 @@
+"""Add vehicle_monthly_total table
+
+Revision ID: 56bdd3655d21
+Revises: 77ef7b24aeff
+Create Date: 2026-10-18 19:26:10.835412
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '56bdd3655d21'
+down_revision = '77ef7b24aeff'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('vehicle_monthly_total',
+    sa.Column('menesis', sa.String(length=7), nullable=False),
+    sa.Column('auto_nr', sa.String(length=20), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('irasu_kiekis', sa.Integer(), nullable=False),
+    sa.Column('tasku_kiekis', sa.Float(), nullable=False),
+    sa.Column('km_kiekis', sa.Float(), nullable=False),
+    sa.Column('pakrautos_paletes', sa.Float(), nullable=False),
+    sa.Column('tara', sa.Float(), nullable=False),
+    sa.Column('atgalines_paletes', sa.Float(), nullable=False),
+    sa.Column('eur_uz_reisa', sa.Float(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], name='fk_vehicle_monthly_total_user_id_user', ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('menesis', 'auto_nr', 'user_id')
+    )
+    op.create_index('ix_vehicle_monthly_total_user_menesis', 'vehicle_monthly_total', ['user_id', 'menesis'], unique=False)
+    op.create_index('ix_vehicle_monthly_total_auto_menesis', 'vehicle_monthly_total', ['auto_nr', 'menesis'], unique=False)
+
+    # Užpildome sumas iš jau esamų įrašų
+    op.execute("""
+        INSERT INTO vehicle_monthly_total (menesis, auto_nr, user_id, irasu_kiekis, tasku_kiekis, km_kiekis,
+                                           pakrautos_paletes, tara, atgalines_paletes, eur_uz_reisa)
+        SELECT menesis, auto_nr, user_id, COUNT(id),
+               COALESCE(SUM(tasku_kiekis), 0), COALESCE(SUM(km_kiekis), 0),
+               COALESCE(SUM(pakrautos_paletes), 0), COALESCE(SUM(tara), 0),
+               COALESCE(SUM(atgalines_paletes), 0), COALESCE(SUM(eur_uz_reisa), 0)
+        FROM ride_result
+        GROUP BY menesis, auto_nr, user_id
+    """)
+
+
+def downgrade():
+    op.drop_index('ix_vehicle_monthly_total_auto_menesis', table_name='vehicle_monthly_total')
+    op.drop_index('ix_vehicle_monthly_total_user_menesis', table_name='vehicle_monthly_total')
+    op.drop_table('vehicle_monthly_total')
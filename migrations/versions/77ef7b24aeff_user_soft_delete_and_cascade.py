@@ -0,0 +1,51 @@
+"""Add user.istrinta and ON DELETE CASCADE on user foreign keys
+
+Revision ID: 77ef7b24aeff
+Revises: 2cd589c15bc8
+Create Date: 2026-10-18 18:02:44.193520
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '77ef7b24aeff'
+down_revision = '2cd589c15bc8'
+branch_labels = None
+depends_on = None
+
+# SQLite FK dažnai neturi vardo – batch režimui jis sudaromas pagal šią taisyklę
+NAMING_CONVENTION = {"fk": "fk_%(table_name)s_%(column_0_name)s_%(referred_table_name)s"}
+LENTELES = ('ride_result', 'monthly_total')
+
+
+def _user_fk_name(lentele):
+    for fk in sa.inspect(op.get_bind()).get_foreign_keys(lentele):
+        if fk['referred_table'] == 'user' and fk['constrained_columns'] == ['user_id']:
+            return fk['name'] or f'fk_{lentele}_user_id_user'
+    return None
+
+
+def _replace_user_fk(lentele, ondelete):
+    senas = _user_fk_name(lentele)
+    with op.batch_alter_table(lentele, naming_convention=NAMING_CONVENTION) as batch_op:
+        if senas:
+            batch_op.drop_constraint(senas, type_='foreignkey')
+        batch_op.create_foreign_key(f'fk_{lentele}_user_id_user', 'user', ['user_id'], ['id'], ondelete=ondelete)
+
+
+def upgrade():
+    op.add_column('user', sa.Column('istrinta', sa.DateTime(), nullable=True))
+
+    # Ankstesnių trynimų likučiai (vartotojo nebėra) neleistų sukurti FK
+    for lentele in LENTELES:
+        op.execute(f'DELETE FROM {lentele} WHERE user_id NOT IN (SELECT id FROM "user")')
+        _replace_user_fk(lentele, 'CASCADE')
+
+
+def downgrade():
+    for lentele in LENTELES:
+        _replace_user_fk(lentele, None)
+
+    op.drop_column('user', 'istrinta')
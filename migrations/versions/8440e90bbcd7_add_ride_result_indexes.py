@@ -0,0 +1,25 @@
+"""Add ride_result indexes
+
+Revision ID: 8440e90bbcd7
+Revises: b80f5bb329e5
+Create Date: 2026-10-18 10:03:54.118620
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '8440e90bbcd7'
+down_revision = 'b80f5bb329e5'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_ride_result_user_menesis_data', 'ride_result', ['user_id', 'menesis', 'data'], unique=False)
+    op.create_index('ix_ride_result_user_data', 'ride_result', ['user_id', 'data'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_ride_result_user_data', table_name='ride_result')
+    op.drop_index('ix_ride_result_user_menesis_data', table_name='ride_result')
@@ -0,0 +1,37 @@
+"""Add background_job table
+
+Revision ID: 98b2f15ea363
+Revises: 02150a1c0699
+Create Date: 2026-10-18 12:41:52.860231
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '98b2f15ea363'
+down_revision = '02150a1c0699'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('background_job',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('tipas', sa.String(length=50), nullable=False),
+    sa.Column('busena', sa.String(length=20), nullable=False),
+    sa.Column('parametrai', sa.Text(), nullable=False),
+    sa.Column('paskutinis_id', sa.Integer(), nullable=False),
+    sa.Column('apdorota', sa.Integer(), nullable=False),
+    sa.Column('pakeista', sa.Integer(), nullable=False),
+    sa.Column('viso', sa.Integer(), nullable=True),
+    sa.Column('klaida', sa.Text(), nullable=True),
+    sa.Column('sukurta', sa.DateTime(), nullable=True),
+    sa.Column('atnaujinta', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade():
+    op.drop_table('background_job')
@@ -0,0 +1,61 @@
+"""Add store_fts full-text index (SQLite FTS5)
+
+Revision ID: ad9fe8536303
+Revises: 98b2f15ea363
+Create Date: 2026-10-18 13:22:07.415892
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'ad9fe8536303'
+down_revision = '98b2f15ea363'
+branch_labels = None
+depends_on = None
+
+STULPELIAI = 'pavadinimas, adresas, apskritis'
+NAUJI = 'new.pavadinimas, new.adresas, new.apskritis'
+SENI = 'old.pavadinimas, old.adresas, old.apskritis'
+
+
+def upgrade():
+    # Tik SQLite; kitose DB paieška lieka per ILIKE
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+
+    # Išorinio turinio FTS5 lentelė: tekstas laikomas tik store, čia – indeksas.
+    # remove_diacritics 2 – "siauliai" randa "Šiauliai"
+    op.execute(f"""
+        CREATE VIRTUAL TABLE store_fts USING fts5(
+            {STULPELIAI},
+            content='store', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2'
+        )
+    """)
+    op.execute(f"""
+        CREATE TRIGGER store_fts_ai AFTER INSERT ON store BEGIN
+            INSERT INTO store_fts(rowid, {STULPELIAI}) VALUES (new.id, {NAUJI});
+        END
+    """)
+    op.execute(f"""
+        CREATE TRIGGER store_fts_ad AFTER DELETE ON store BEGIN
+            INSERT INTO store_fts(store_fts, rowid, {STULPELIAI}) VALUES ('delete', old.id, {SENI});
+        END
+    """)
+    op.execute(f"""
+        CREATE TRIGGER store_fts_au AFTER UPDATE ON store BEGIN
+            INSERT INTO store_fts(store_fts, rowid, {STULPELIAI}) VALUES ('delete', old.id, {SENI});
+            INSERT INTO store_fts(rowid, {STULPELIAI}) VALUES (new.id, {NAUJI});
+        END
+    """)
+    op.execute("INSERT INTO store_fts(store_fts) VALUES ('rebuild')")
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    op.execute("DROP TRIGGER IF EXISTS store_fts_au")
+    op.execute("DROP TRIGGER IF EXISTS store_fts_ad")
+    op.execute("DROP TRIGGER IF EXISTS store_fts_ai")
+    op.execute("DROP TABLE IF EXISTS store_fts")
@@ -0,0 +1,28 @@
+"""Add store coordinates
+
+Revision ID: b1012321c831
+Revises: ad9fe8536303
+Create Date: 2026-10-18 15:04:41.208317
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b1012321c831'
+down_revision = 'ad9fe8536303'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Be batch_alter_table: SQLite lentelės perkūrimas panaikintų store_fts trigerius.
+    # Koordinatės užpildomos su `flask geocode-stores`.
+    op.add_column('store', sa.Column('platuma', sa.Float(), nullable=True))
+    op.add_column('store', sa.Column('ilguma', sa.Float(), nullable=True))
+
+
+def downgrade():
+    op.drop_column('store', 'ilguma')
+    op.drop_column('store', 'platuma')
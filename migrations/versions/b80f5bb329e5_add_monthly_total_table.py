@@ -0,0 +1,48 @@
+"""Add monthly_total table
+
+Revision ID: b80f5bb329e5
+Revises: c013e9214462
+Create Date: 2026-10-18 09:12:31.402117
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b80f5bb329e5'
+down_revision = 'c013e9214462'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('monthly_total',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('menesis', sa.String(length=7), nullable=False),
+    sa.Column('irasu_kiekis', sa.Integer(), nullable=False),
+    sa.Column('tasku_kiekis', sa.Float(), nullable=False),
+    sa.Column('km_kiekis', sa.Float(), nullable=False),
+    sa.Column('pakrautos_paletes', sa.Float(), nullable=False),
+    sa.Column('tara', sa.Float(), nullable=False),
+    sa.Column('atgalines_paletes', sa.Float(), nullable=False),
+    sa.Column('eur_uz_reisa', sa.Float(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('user_id', 'menesis')
+    )
+
+    # Užpildome sumas iš jau esamų įrašų
+    op.execute("""
+        INSERT INTO monthly_total (user_id, menesis, irasu_kiekis, tasku_kiekis, km_kiekis,
+                                   pakrautos_paletes, tara, atgalines_paletes, eur_uz_reisa)
+        SELECT user_id, menesis, COUNT(id),
+               COALESCE(SUM(tasku_kiekis), 0), COALESCE(SUM(km_kiekis), 0),
+               COALESCE(SUM(pakrautos_paletes), 0), COALESCE(SUM(tara), 0),
+               COALESCE(SUM(atgalines_paletes), 0), COALESCE(SUM(eur_uz_reisa), 0)
+        FROM ride_result
+        GROUP BY user_id, menesis
+    """)
+
+
+def downgrade():
+    op.drop_table('monthly_total')
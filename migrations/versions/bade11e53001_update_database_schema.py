@@ -17,9 +17,9 @@ depends_on = None
 
 
 def upgrade():
-    # ### commands auto generated by Alembic - please adjust! ###
-    op.drop_table('store')
-    # ### end Alembic commands ###
+    # Naujoje DB store lentelės dar nėra (ji sukuriama tik c013e9214462)
+    if 'store' in sa.inspect(op.get_bind()).get_table_names():
+        op.drop_table('store')
 
 
 def downgrade():
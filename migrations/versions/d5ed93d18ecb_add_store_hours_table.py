@@ -0,0 +1,162 @@
+"""Add store_hours table and backfill it from store text fields
+
+Revision ID: d5ed93d18ecb
+Revises: b1012321c831
+Create Date: 2026-10-18 15:52:19.640118
+
+"""
+import logging
+import re
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd5ed93d18ecb'
+down_revision = 'b1012321c831'
+branch_labels = None
+depends_on = None
+
+logger = logging.getLogger('alembic.runtime.migration')
+
+# Skaidymas užšaldytas, koks buvo store_hours.py kuriant šią migraciją –
+# vėlesni store_hours.py pakeitimai neturi keisti to, ką daro ši migracija.
+DARBO = 'darbo'
+PRIEMIMO = 'priemimo'
+PAROS_MINUTES = 24 * 60
+DARBO_DIENOS = range(5)
+
+LAIKAS = r'(\d{1,2})(?:[.:](\d{2}))?'
+INTERVALAS = re.compile(LAIKAS + r'\s*[-–—]\s*' + LAIKAS)
+VIENAS_LAIKAS = re.compile(r'^\s*' + LAIKAS + r'\s*$')
+VISA_PARA = re.compile(r'^\s*(24/7|24\s*h|visą parą|visa para)\s*$', re.I)
+NEDIRBA = re.compile(r'^\s*(nedirba|uždaryta|uzdaryta|ne)\s*\.?\s*$', re.I)
+
+
+class Neatpazinta(ValueError):
+    pass
+
+
+def minutes(valandos, minutes_):
+    valandos, minutes_ = int(valandos), int(minutes_ or 0)
+    if valandos > 24 or minutes_ > 59 or (valandos == 24 and minutes_):
+        raise Neatpazinta(f"Neteisingas laikas {valandos}:{minutes_:02d}")
+    return valandos * 60 + minutes_
+
+
+def parse(tekstas):
+    """Grąžina [(nuo, iki), ...] minutėmis; iki gali būti None (žinoma tik pradžia).
+
+    None – laikas nežinomas, [] – nedirba. iki < nuo reiškia darbą per vidurnaktį.
+    Neatpažintam tekstui – Neatpazinta.
+    """
+    tekstas = (tekstas or '').strip()
+    if not tekstas or tekstas.strip('?') == '':
+        return None
+    if NEDIRBA.match(tekstas):
+        return []
+    if VISA_PARA.match(tekstas):
+        return [(0, PAROS_MINUTES)]
+    vienas = VIENAS_LAIKAS.match(tekstas)
+    if vienas:
+        return [(minutes(*vienas.groups()), None)]
+    intervalai = [
+        (minutes(v1, m1), minutes(v2, m2))
+        for v1, m1, v2, m2 in INTERVALAS.findall(tekstas)
+    ]
+    # Likęs tekstas turi būti tik skyrikliai, kitaip kažko nesupratome
+    if not intervalai or re.sub(r'[\s,;]', '', INTERVALAS.sub('', tekstas)):
+        raise Neatpazinta(f"Neatpažintas darbo laikas: {tekstas!r}")
+    return intervalai
+
+
+def day_rows(diena, nuo, iki):
+    """(diena, nuo, iki) eilutės; intervalas per vidurnaktį padalijamas į dvi dienas."""
+    if iki == nuo:
+        return []
+    if iki > nuo:
+        return [(diena, nuo, iki)]
+    eilutes = [(diena, nuo, PAROS_MINUTES)]
+    if iki:
+        eilutes.append(((diena + 1) % 7, 0, iki))
+    return eilutes
+
+
+def store_intervals(store):
+    """Grąžina ([(diena, rusis, nuo, iki), ...], [neatpažinti laukai])."""
+    neatpazinti = []
+
+    def nuskaityti(laukas):
+        try:
+            return parse(getattr(store, laukas))
+        except Neatpazinta:
+            neatpazinti.append(laukas)
+            return None
+
+    dienos = {}
+    for laukas, savaites_dienos in (('darbo_laikas', DARBO_DIENOS),
+                                     ('sestadienio_darbo_laikas', (5,)),
+                                     ('sekmadienio_darbo_laikas', (6,))):
+        intervalai = nuskaityti(laukas)
+        if intervalai is not None:
+            for diena in savaites_dienos:
+                dienos[diena] = intervalai
+
+    def rows(diena, rusis, intervalai):
+        eilutes = []
+        for nuo, iki in intervalai:
+            if iki is None:
+                # Vienas laikas: iki tos dienos darbo pabaigos, jei ji vėliau, kitaip iki paros pabaigos
+                pabaigos = [i for n, i in dienos.get(diena) or [] if i is not None and i > nuo]
+                iki = pabaigos[-1] if pabaigos else PAROS_MINUTES
+            eilutes += [(d, rusis, n, i) for d, n, i in day_rows(diena, nuo, iki)]
+        return eilutes
+
+    eilutes = []
+    for diena, intervalai in dienos.items():
+        eilutes += rows(diena, DARBO, intervalai)
+
+    priemimas = nuskaityti('darbuotoju_darbo_laikas')
+    if priemimas is not None:
+        for diena in [d for d, intervalai in dienos.items() if intervalai] or DARBO_DIENOS:
+            eilutes += rows(diena, PRIEMIMO, priemimas)
+    return eilutes, neatpazinti
+
+
+def upgrade():
+    store_hours = op.create_table('store_hours',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('store_id', sa.Integer(), nullable=False),
+    sa.Column('diena', sa.SmallInteger(), nullable=False),
+    sa.Column('rusis', sa.String(length=10), nullable=False),
+    sa.Column('nuo', sa.SmallInteger(), nullable=False),
+    sa.Column('iki', sa.SmallInteger(), nullable=False),
+    sa.ForeignKeyConstraint(['store_id'], ['store.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_store_hours_store_id', 'store_hours', ['store_id'], unique=False)
+    op.create_index('ix_store_hours_rusis_diena_nuo', 'store_hours', ['rusis', 'diena', 'nuo', 'iki'], unique=False)
+
+    # Tas pats skaidymas kaip pridedant ar redaguojant parduotuvę (kopija viršuje)
+    parduotuves = op.get_bind().execute(sa.text(
+        "SELECT id, pavadinimas, darbo_laikas, sestadienio_darbo_laikas, sekmadienio_darbo_laikas, "
+        "darbuotoju_darbo_laikas FROM store"
+    )).all()
+    eilutes = []
+    for store in parduotuves:
+        intervalai, neatpazinti = store_intervals(store)
+        eilutes += [
+            {'store_id': store.id, 'diena': diena, 'rusis': rusis, 'nuo': nuo, 'iki': iki}
+            for diena, rusis, nuo, iki in intervalai
+        ]
+        for laukas in neatpazinti:
+            logger.warning("Parduotuvė #%d %s: neatpažintas %s %r", store.id, store.pavadinimas,
+                           laukas, getattr(store, laukas))
+    if eilutes:
+        op.bulk_insert(store_hours, eilutes)
+
+
+def downgrade():
+    op.drop_index('ix_store_hours_rusis_diena_nuo', table_name='store_hours')
+    op.drop_index('ix_store_hours_store_id', table_name='store_hours')
+    op.drop_table('store_hours')
@@ -0,0 +1,32 @@
+"""Widen user.password_hash for scrypt hashes
+
+Revision ID: fb4d8eb3d9c3
+Revises: 8440e90bbcd7
+Create Date: 2026-10-18 11:26:40.551903
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'fb4d8eb3d9c3'
+down_revision = '8440e90bbcd7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('user', schema=None) as batch_op:
+        batch_op.alter_column('password_hash',
+               existing_type=sa.String(length=128),
+               type_=sa.String(length=256),
+               existing_nullable=False)
+
+
+def downgrade():
+    with op.batch_alter_table('user', schema=None) as batch_op:
+        batch_op.alter_column('password_hash',
+               existing_type=sa.String(length=256),
+               type_=sa.String(length=128),
+               existing_nullable=False)
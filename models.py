@@ -1,6 +1,11 @@
+import json
+from contextlib import contextmanager
+from datetime import datetime
+from flask import has_request_context, request
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import UserMixin
-from werkzeug.security import generate_password_hash, check_password_hash
+from sqlalchemy import event
+import passwords
 
 db = SQLAlchemy()
 
@@ -8,20 +13,50 @@ class User(UserMixin, db.Model):
     id = db.Column(db.Integer, primary_key=True)
     username = db.Column(db.String(80), unique=True, nullable=False)
     email = db.Column(db.String(120), unique=True, nullable=False)
-    password_hash = db.Column(db.String(128), nullable=False)
+    password_hash = db.Column(db.String(256), nullable=False)
     is_admin = db.Column(db.Boolean, default=False)
-    ride_results = db.relationship('RideResult', backref='user', lazy='dynamic')
+    # Pažymėtas ištrintu – duomenys trinami fone (user_purge.py)
+    istrinta = db.Column(db.DateTime)
+    ride_results = db.relationship('RideResult', backref='user', lazy='dynamic', passive_deletes=True)
 
     def set_password(self, password):
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = passwords.hash_password(password)
 
     def check_password(self, password):
-        return check_password_hash(self.password_hash, password)
+        """Patikrina slaptažodį; jei maiša sukurta senu metodu, ją pakeičia (commit daro kviečiantysis)."""
+        if not passwords.verify(self.password_hash, password):
+            return False
+        if passwords.needs_rehash(self.password_hash):
+            self.set_password(password)
+        return True
+
+class Vehicle(db.Model):
+    """Parko automobilis (registras vietoj kode įrašyto sąrašo, žr. vehicles.py).
+
+    Neaktyvus automobilis nebesiūlomas naujiems reisams, bet lieka seniems.
+    """
+    __tablename__ = 'vehicle'
+    id = db.Column(db.Integer, primary_key=True)
+    numeris = db.Column(db.String(20), unique=True, nullable=False)
+    aktyvus = db.Column(db.Boolean, nullable=False, default=True)
+    pastaba = db.Column(db.String(200))
+    sukurta = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<Vehicle {self.numeris}>'
 
 class RideResult(db.Model):
+    __table_args__ = (
+        # Beveik visos užklausos filtruoja pagal vartotoją ir mėnesį arba datą
+        db.Index('ix_ride_result_user_menesis_data', 'user_id', 'menesis', 'data'),
+        db.Index('ix_ride_result_user_data', 'user_id', 'data'),
+        db.Index('ix_ride_result_vehicle_data', 'vehicle_id', 'data'),
+    )
     id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id', ondelete='CASCADE'), nullable=False)
     data = db.Column(db.Date, nullable=False)
+    vehicle_id = db.Column(db.Integer, db.ForeignKey('vehicle.id'), nullable=False)
+    # Automobilio numerio kopija sąrašams ir eksportui be JOIN (numeris registre nekeičiamas)
     auto_nr = db.Column(db.String(20), nullable=False)
     tasku_kiekis = db.Column(db.Float, nullable=False)
     km_kiekis = db.Column(db.Float, nullable=False)
@@ -32,6 +67,103 @@ class RideResult(db.Model):
     menesis = db.Column(db.String(7), nullable=False)
     savaitgalis = db.Column(db.Boolean, default=False)
 
+class MonthlyTotal(db.Model):
+    # Materializuotos vartotojo mėnesio sumos, atnaujinamos kartu su ride_result
+    __tablename__ = 'monthly_total'
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id', ondelete='CASCADE'), primary_key=True)
+    menesis = db.Column(db.String(7), primary_key=True)
+    irasu_kiekis = db.Column(db.Integer, nullable=False, default=0)
+    tasku_kiekis = db.Column(db.Float, nullable=False, default=0)
+    km_kiekis = db.Column(db.Float, nullable=False, default=0)
+    pakrautos_paletes = db.Column(db.Float, nullable=False, default=0)
+    tara = db.Column(db.Float, nullable=False, default=0)
+    atgalines_paletes = db.Column(db.Float, nullable=False, default=0)
+    eur_uz_reisa = db.Column(db.Float, nullable=False, default=0)
+
+class VehicleMonthlyTotal(db.Model):
+    # Tos pačios sumos dar ir pagal automobilį – parko suvestinei (fleet.py)
+    __tablename__ = 'vehicle_monthly_total'
+    __table_args__ = (
+        # Suvestinė vienam vairuotojui ar automobiliui (PK tinka mėnesių intervalui)
+        db.Index('ix_vehicle_monthly_total_user_menesis', 'user_id', 'menesis'),
+        db.Index('ix_vehicle_monthly_total_vehicle_menesis', 'vehicle_id', 'menesis'),
+    )
+    menesis = db.Column(db.String(7), primary_key=True)
+    vehicle_id = db.Column(db.Integer, db.ForeignKey('vehicle.id'), primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id', ondelete='CASCADE'), primary_key=True)
+    irasu_kiekis = db.Column(db.Integer, nullable=False, default=0)
+    tasku_kiekis = db.Column(db.Float, nullable=False, default=0)
+    km_kiekis = db.Column(db.Float, nullable=False, default=0)
+    pakrautos_paletes = db.Column(db.Float, nullable=False, default=0)
+    tara = db.Column(db.Float, nullable=False, default=0)
+    atgalines_paletes = db.Column(db.Float, nullable=False, default=0)
+    eur_uz_reisa = db.Column(db.Float, nullable=False, default=0)
+
+class PayRate(db.Model):
+    """Įkainių versija, galiojanti nuo galioja_nuo iki kitos versijos pradžios."""
+    __tablename__ = 'pay_rate'
+    id = db.Column(db.Integer, primary_key=True)
+    galioja_nuo = db.Column(db.Date, unique=True, nullable=False)
+    km_kiekis = db.Column(db.Float, nullable=False)
+    tasku_kiekis = db.Column(db.Float, nullable=False)
+    pakrautos_paletes = db.Column(db.Float, nullable=False)
+    tara = db.Column(db.Float, nullable=False)
+    atgalines_paletes = db.Column(db.Float, nullable=False)
+    savaitgalio_koef = db.Column(db.Float, nullable=False)
+    pastaba = db.Column(db.String(200))
+    sukurta = db.Column(db.DateTime, default=datetime.utcnow)
+
+class BackgroundJob(db.Model):
+    """Ilgai trunkantis darbas (pvz. reisų perskaičiavimas), vykdomas dalimis.
+
+    Po kiekvienos dalies išsaugomas paskutinis_id, todėl nutrūkusį darbą
+    galima tęsti nuo tos vietos.
+    """
+    __tablename__ = 'background_job'
+    id = db.Column(db.Integer, primary_key=True)
+    tipas = db.Column(db.String(50), nullable=False)
+    busena = db.Column(db.String(20), nullable=False, default='laukia')
+    parametrai = db.Column(db.Text, nullable=False, default='{}')
+    paskutinis_id = db.Column(db.Integer, nullable=False, default=0)
+    apdorota = db.Column(db.Integer, nullable=False, default=0)
+    pakeista = db.Column(db.Integer, nullable=False, default=0)
+    viso = db.Column(db.Integer)
+    klaida = db.Column(db.Text)
+    sukurta = db.Column(db.DateTime, default=datetime.utcnow)
+    atnaujinta = db.Column(db.DateTime, default=datetime.utcnow)
+
+    @property
+    def params(self):
+        return json.loads(self.parametrai or '{}')
+
+    @property
+    def progresas(self):
+        if not self.viso:
+            return 100.0 if self.busena == 'baigta' else 0.0
+        return min(100.0, 100.0 * self.apdorota / self.viso)
+
+class OutboundMail(db.Model):
+    """Siunčiamas el. laiškas eilėje (mail_queue.py)."""
+    __tablename__ = 'outbound_mail'
+    id = db.Column(db.Integer, primary_key=True)
+    gavejas = db.Column(db.String(120), nullable=False)
+    siuntejas = db.Column(db.String(120))
+    tema = db.Column(db.String(200), nullable=False)
+    tekstas = db.Column(db.Text, nullable=False)
+    busena = db.Column(db.String(20), nullable=False, default='laukia')
+    bandymai = db.Column(db.Integer, nullable=False, default=0)
+    kitas_bandymas = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    # Siunčiančio worker'io žymė, kad tas pats laiškas nebūtų paimtas dviejų
+    paimta = db.Column(db.String(32))
+    klaida = db.Column(db.Text)
+    sukurta = db.Column(db.DateTime, default=datetime.utcnow)
+    atnaujinta = db.Column(db.DateTime, default=datetime.utcnow)
+    issiusta = db.Column(db.DateTime)
+
+    __table_args__ = (
+        db.Index('ix_outbound_mail_busena_kitas', 'busena', 'kitas_bandymas'),
+    )
+
 class Store(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     pavadinimas = db.Column(db.String(100), nullable=False)
@@ -42,9 +174,135 @@ class Store(db.Model):
     sestadienio_darbo_laikas = db.Column(db.String(100))
     sekmadienio_darbo_laikas = db.Column(db.String(100))
     google_maps_nuoroda = db.Column(db.String(500))
+    # Iš google_maps_nuoroda arba apskritis (geo.update_coordinates)
+    platuma = db.Column(db.Float)
+    ilguma = db.Column(db.Float)
+    valandos = db.relationship('StoreHours', backref='store', lazy='dynamic', cascade='all, delete-orphan')
 
     def __repr__(self):
         return f'<Store {self.pavadinimas}>'
 
+class StoreHours(db.Model):
+    """Darbo ar prekių priėmimo intervalas [nuo, iki) minutėmis, savaitės dienai (0 – pirmadienis).
+
+    Kuriama iš Store tekstinių laukų (store_hours.sync), ranka neredaguojama.
+    """
+    __tablename__ = 'store_hours'
+    id = db.Column(db.Integer, primary_key=True)
+    store_id = db.Column(db.Integer, db.ForeignKey('store.id', ondelete='CASCADE'), nullable=False, index=True)
+    diena = db.Column(db.SmallInteger, nullable=False)
+    rusis = db.Column(db.String(10), nullable=False)
+    nuo = db.Column(db.SmallInteger, nullable=False)
+    iki = db.Column(db.SmallInteger, nullable=False)
+
+    __table_args__ = (
+        db.Index('ix_store_hours_rusis_diena_nuo', 'rusis', 'diena', 'nuo', 'iki'),
+    )
+
+class DataVersion(db.Model):
+    """Pakeitimų skaitiklis HTTP ETag'ams (versions.py): 'rides:<user_id>', 'stores'.
+
+    Didinamas toje pačioje transakcijoje kaip ir duomenų pakeitimas.
+    """
+    __tablename__ = 'data_version'
+    raktas = db.Column(db.String(50), primary_key=True)
+    versija = db.Column(db.Integer, nullable=False, default=0)
+    pakeista = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+# SQLite nustatymai, taikomi kiekvienam naujam prisijungimui (None – nekeisti)
+SQLITE_DEFAULTS = {
+    'SQLITE_JOURNAL_MODE': 'WAL',
+    'SQLITE_SYNCHRONOUS': 'NORMAL',
+    'SQLITE_BUSY_TIMEOUT': 5000,            # ms
+    'SQLITE_MMAP_SIZE': 256 * 1024 * 1024,  # baitai
+    'SQLITE_CACHE_SIZE': -64000,            # neigiamas – KiB
+    'SQLITE_BEGIN_MODE': 'IMMEDIATE',       # rašančių transakcijų pradžia (skaitančios – DEFERRED)
+    'SQLITE_FOREIGN_KEYS': True,            # be jo SQLite netikrina FK ir nevykdo ON DELETE CASCADE
+    'SQLITE_POOL_SIZE': 5,
+    'SQLITE_MAX_OVERFLOW': 10,
+    'SQLITE_POOL_TIMEOUT': 30,
+}
+
+# HTTP metodai, kurių užklausos duomenų nekeičia
+SAUGUS_METODAI = ('GET', 'HEAD', 'OPTIONS')
+# GET maršrutai, kurie vis dėlto keičia duomenis
+RASYMAI_PER_GET = {'main.delete'}
+
+def write_request():
+    """Ar vykdoma rašanti HTTP užklausa (ne GET/HEAD/OPTIONS arba RASYMAI_PER_GET)."""
+    return has_request_context() and (
+        request.method not in SAUGUS_METODAI or request.endpoint in RASYMAI_PER_GET
+    )
+
+def _writes(conn):
+    """Ar transakcija gali rašyti: rašančios užklausos ir kodas be užklausos (CLI, darbų ir laiškų gijos)."""
+    if conn.get_execution_options().get('tik_skaitymas'):
+        return False
+    return write_request() or not has_request_context()
+
+@contextmanager
+def read_connection():
+    """Atskiras skaitymo prisijungimas ilgai užklausai (pvz. eksportui), nepriklausomas nuo sesijos.
+
+    Su SQLite jo transakcija visada DEFERRED: WAL režimu skaitytojas netrukdo
+    rašantiems, kad ir kiek laiko truktų skaitymas.
+    """
+    with db.engine.connect() as conn:
+        conn.execution_options(tik_skaitymas=True)
+        yield conn
+
 def init_app(app):
-    db.init_app(app)
\ No newline at end of file
+    sqlite = app.config['SQLALCHEMY_DATABASE_URI'].startswith('sqlite')
+    if sqlite:
+        for raktas, reiksme in SQLITE_DEFAULTS.items():
+            app.config.setdefault(raktas, reiksme)
+        options = app.config.setdefault('SQLALCHEMY_ENGINE_OPTIONS', {})
+        options.setdefault('pool_size', app.config['SQLITE_POOL_SIZE'])
+        options.setdefault('max_overflow', app.config['SQLITE_MAX_OVERFLOW'])
+        options.setdefault('pool_timeout', app.config['SQLITE_POOL_TIMEOUT'])
+        if app.config['SQLITE_BEGIN_MODE']:
+            # pysqlite pats transakcijų nepradeda – BEGIN siunčiame patys
+            options.setdefault('connect_args', {}).setdefault('isolation_level', None)
+    else:
+        # PostgreSQL/MySQL: tikriname prisijungimą prieš naudojimą ir periodiškai jį atnaujiname
+        options = app.config.setdefault('SQLALCHEMY_ENGINE_OPTIONS', {})
+        options.setdefault('pool_size', 5)
+        options.setdefault('max_overflow', 10)
+        options.setdefault('pool_pre_ping', True)
+        options.setdefault('pool_recycle', 1800)
+
+    db.init_app(app)
+
+    if sqlite:
+        with app.app_context():
+            configure_sqlite_engine(db.engine, app.config)
+
+def configure_sqlite_engine(engine, config):
+    pragmos = []
+    if config['SQLITE_JOURNAL_MODE']:
+        pragmos.append(f"PRAGMA journal_mode={config['SQLITE_JOURNAL_MODE']}")
+    if config['SQLITE_SYNCHRONOUS']:
+        pragmos.append(f"PRAGMA synchronous={config['SQLITE_SYNCHRONOUS']}")
+    if config['SQLITE_BUSY_TIMEOUT'] is not None:
+        pragmos.append(f"PRAGMA busy_timeout={int(config['SQLITE_BUSY_TIMEOUT'])}")
+    if config['SQLITE_MMAP_SIZE'] is not None:
+        pragmos.append(f"PRAGMA mmap_size={int(config['SQLITE_MMAP_SIZE'])}")
+    if config['SQLITE_CACHE_SIZE'] is not None:
+        pragmos.append(f"PRAGMA cache_size={int(config['SQLITE_CACHE_SIZE'])}")
+    if config['SQLITE_FOREIGN_KEYS'] is not None:
+        pragmos.append(f"PRAGMA foreign_keys={'ON' if config['SQLITE_FOREIGN_KEYS'] else 'OFF'}")
+
+    @event.listens_for(engine, 'connect')
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for pragma in pragmos:
+            cursor.execute(pragma)
+        cursor.close()
+
+    begin_mode = config['SQLITE_BEGIN_MODE']
+    if begin_mode:
+        # Rašymo užraktas imamas tik rašančioms transakcijoms; GET užklausų skaitymai
+        # lieka DEFERRED ir WAL režimu vyksta lygiagrečiai su vienu rašančiuoju
+        @event.listens_for(engine, 'begin')
+        def _begin(conn):
+            conn.exec_driver_sql(f"BEGIN {begin_mode if _writes(conn) else 'DEFERRED'}")
\ No newline at end of file
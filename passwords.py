@@ -0,0 +1,74 @@
+"""Slaptažodžių maišos.
+
+Metodas ir druskos ilgis imami iš konfigūracijos (PASSWORD_HASH_METHOD,
+PASSWORD_SALT_LENGTH), pvz. 'scrypt:16384:8:1' arba 'pbkdf2:sha256:600000'.
+Pakeitus metodą senos maišos lieka galioti, o prisijungiant slaptažodis
+permaišomas nauju metodu (User.check_password).
+
+Kai PASSWORD_HASH_WORKERS > 0, maišos skaičiuojamos bendrame tiek gijų
+dydžio baseine: vienu metu skaičiuojamų maišų kiekis ribojamas (scrypt
+kiekvienai naudoja ~32 MB atminties), o kitos užklausos laukia eilėje.
+Tai tik riba, ne darbas fone: užklausos gija laukia rezultato, todėl su
+sinchroniniais gunicorn worker'iais worker'is užimtas visą maišos (ir
+eilės) laiką. hashlib scrypt ir pbkdf2 skaičiuodami atleidžia GIL, todėl
+su keliomis gijomis (gunicorn --threads) maišos skaičiuojamos lygiagrečiai.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from flask import current_app
+from werkzeug.security import generate_password_hash, check_password_hash
+
+DEFAULT_METHOD = 'scrypt'
+DEFAULT_SALT_LENGTH = 16
+
+_lock = threading.Lock()
+_pool = {'vykdytojas': None, 'dydis': 0}
+# Konfigūruotas metodas -> pilnas jo pavadinimas maišoje ('scrypt' -> 'scrypt:32768:8:1')
+_prefixes = {}
+
+
+def _config():
+    config = current_app.config
+    return (config.get('PASSWORD_HASH_METHOD', DEFAULT_METHOD),
+            config.get('PASSWORD_SALT_LENGTH', DEFAULT_SALT_LENGTH),
+            config.get('PASSWORD_HASH_WORKERS', 0))
+
+
+def _executor(dydis):
+    if _pool['dydis'] != dydis:
+        with _lock:
+            if _pool['dydis'] != dydis:
+                if _pool['vykdytojas'] is not None:
+                    _pool['vykdytojas'].shutdown(wait=False)
+                _pool['vykdytojas'] = ThreadPoolExecutor(max_workers=dydis, thread_name_prefix='password-hash')
+                _pool['dydis'] = dydis
+    return _pool['vykdytojas']
+
+
+def _run(funkcija, *argumentai):
+    dydis = _config()[2]
+    if not dydis:
+        return funkcija(*argumentai)
+    # Užklausos gija laukia – baseinas tik riboja lygiagrečių maišų kiekį
+    return _executor(dydis).submit(funkcija, *argumentai).result()
+
+
+def hash_password(password):
+    metodas, druska, _ = _config()
+    return _run(generate_password_hash, password, metodas, druska)
+
+
+def verify(password_hash, password):
+    return _run(check_password_hash, password_hash, password)
+
+
+def method_prefix(metodas):
+    if metodas not in _prefixes:
+        # Trumpą pavadinimą išskleidžia pati werkzeug (numatyti parametrai priklauso nuo versijos)
+        _prefixes[metodas] = generate_password_hash('', metodas, 1).split('$', 1)[0]
+    return _prefixes[metodas]
+
+
+def needs_rehash(password_hash):
+    """Ar maiša sukurta kitu metodu ar parametrais nei dabar nustatyti."""
+    return password_hash.split('$', 1)[0] != method_prefix(_config()[0])
@@ -0,0 +1,113 @@
+"""Apmokėjimo už reisą skaičiavimas.
+
+Įkainiai laikomi pay_rate lentelėje: kiekviena eilutė – versija, galiojanti
+nuo galioja_nuo iki kitos versijos pradžios, todėl įkainiams pakeisti
+nereikia diegimo, o seni mėnesiai skaičiuojami pagal tuo metu galiojusius
+įkainius. Lentelė laikoma procese ir atnaujinama kas RATES_CACHE_TTL
+sekundžių arba iškart po pakeitimo (invalidate).
+
+Savaitgalį viskas, išskyrus tarą, dauginama iš savaitgalio_koef.
+"""
+import bisect
+import threading
+import time
+from collections import namedtuple
+from datetime import date
+from flask import current_app
+from models import db, PayRate
+
+LAUKAI = ('km_kiekis', 'tasku_kiekis', 'pakrautos_paletes', 'tara', 'atgalines_paletes')
+
+Ikainis = namedtuple('Ikainis', ('galioja_nuo',) + LAUKAI + ('savaitgalio_koef',))
+
+# Naudojama, kai lentelė tuščia (tokie pat kaip pradinėje migracijoje)
+NUMATYTASIS = Ikainis(date(2000, 1, 1), 0.1, 1.7, 0.64, 0.5, 0.64, 1.2)
+DEFAULT_TTL = 60
+
+_lock = threading.Lock()
+_cache = {'ikainiai': None, 'pradzios': None, 'galioja_iki': 0.0}
+
+
+def invalidate():
+    _cache['galioja_iki'] = 0.0
+
+
+def load_rates():
+    eilutes = PayRate.query.order_by(PayRate.galioja_nuo).all()
+    return [Ikainis(e.galioja_nuo, *(getattr(e, laukas) for laukas in LAUKAI), e.savaitgalio_koef) for e in eilutes]
+
+
+def effective_rates():
+    """Grąžina (ikainiai, pradzios) – versijos pagal galioja_nuo ir jų pradžių datos."""
+    if _cache['galioja_iki'] < time.monotonic():
+        with _lock:
+            if _cache['galioja_iki'] < time.monotonic():
+                ikainiai = load_rates() or [NUMATYTASIS]
+                _cache['ikainiai'] = ikainiai
+                _cache['pradzios'] = [ikainis.galioja_nuo for ikainis in ikainiai]
+                _cache['galioja_iki'] = time.monotonic() + current_app.config.get('RATES_CACHE_TTL', DEFAULT_TTL)
+    return _cache['ikainiai'], _cache['pradzios']
+
+
+def rate_for(data):
+    ikainiai, pradzios = effective_rates()
+    # Reisams iki pirmosios versijos taikome pirmąją
+    return ikainiai[max(bisect.bisect_right(pradzios, data) - 1, 0)]
+
+
+def compute(batch):
+    """Apskaičiuoja eur_uz_reisa visai partijai vienu praėjimu.
+
+    batch – stulpelių žodynas: {'data': [...], 'km_kiekis': [...],
+    'tasku_kiekis': [...], 'pakrautos_paletes': [...], 'tara': [...],
+    'atgalines_paletes': [...], 'savaitgalis': [...]}. Grąžina sąrašą ta
+    pačia eilės tvarka. Kiekvienai eilutei taikoma jos datą galiojusi versija.
+    """
+    ikainiai, pradzios = effective_rates()
+    pagal_data = {}
+    rezultatai = []
+    for data, k, t, p, ta, a, savaitgalis in zip(
+        batch['data'], batch['km_kiekis'], batch['tasku_kiekis'], batch['pakrautos_paletes'],
+        batch['tara'], batch['atgalines_paletes'], batch['savaitgalis']
+    ):
+        ikainis = pagal_data.get(data)
+        if ikainis is None:
+            ikainis = pagal_data[data] = ikainiai[max(bisect.bisect_right(pradzios, data) - 1, 0)]
+        eur = (
+            k * ikainis.km_kiekis + t * ikainis.tasku_kiekis + p * ikainis.pakrautos_paletes +
+            ta * ikainis.tara + a * ikainis.atgalines_paletes
+        )
+        if savaitgalis:
+            eur = (eur - ta * ikainis.tara) * ikainis.savaitgalio_koef + ta * ikainis.tara
+        rezultatai.append(eur)
+    return rezultatai
+
+
+def compute_one(data, km_kiekis, tasku_kiekis, pakrautos_paletes, tara, atgalines_paletes, savaitgalis):
+    return compute({
+        'data': [data], 'km_kiekis': [km_kiekis], 'tasku_kiekis': [tasku_kiekis],
+        'pakrautos_paletes': [pakrautos_paletes], 'tara': [tara],
+        'atgalines_paletes': [atgalines_paletes], 'savaitgalis': [savaitgalis],
+    })[0]
+
+
+def add_rate(galioja_nuo, pastaba=None, pakeisti=False, **reiksmes):
+    """Įrašo naują įkainių versiją. Nenurodyti įkainiai perimami iš tuo metu galiojusios.
+
+    Jei versija tai datai jau yra, ValueError, nebent pakeisti=True.
+    """
+    esama = PayRate.query.filter_by(galioja_nuo=galioja_nuo).first()
+    if esama is not None and not pakeisti:
+        raise ValueError(f'Įkainiai nuo {galioja_nuo} jau yra')
+    ankstesni = rate_for(galioja_nuo)._asdict()
+    del ankstesni['galioja_nuo']
+    ankstesni.update({laukas: reiksme for laukas, reiksme in reiksmes.items() if reiksme is not None})
+
+    irasas = esama or PayRate(galioja_nuo=galioja_nuo)
+    for laukas, reiksme in ankstesni.items():
+        setattr(irasas, laukas, reiksme)
+    irasas.pastaba = pastaba
+    db.session.add(irasas)
+    db.session.commit()
+    invalidate()
+    return irasas
@@ -0,0 +1,90 @@
+"""Reisų eur_uz_reisa perskaičiavimas pagal dabartinius įkainius (pay_rate).
+
+Reisai imami dalimis pagal id (keyset – WHERE id > paskutinis_id ORDER BY
+id LIMIT n), kiekvienai daliai suma skaičiuojama vienu rates.compute
+praėjimu, o pasikeitę įrašai atnaujinami vienu executemany UPDATE. Kartu
+toje pačioje trumpoje transakcijoje pakeičiamos monthly_total sumos ir
+darbo eiga, todėl lentelė neužrakinama ilgam, o nutrūkęs darbas tęsiamas
+nuo paskutinės išsaugotos dalies.
+"""
+import time
+from datetime import date
+from sqlalchemy import bindparam, func, select, update
+from models import db, RideResult
+import jobs
+import rates
+import totals
+
+TIPAS = 'reprice'
+CHUNK_SIZE = 2000
+
+
+def ride_filters(parametrai):
+    salygos = []
+    if parametrai.get('nuo'):
+        salygos.append(RideResult.data >= date.fromisoformat(parametrai['nuo']))
+    if parametrai.get('iki'):
+        salygos.append(RideResult.data <= date.fromisoformat(parametrai['iki']))
+    if parametrai.get('user_id'):
+        salygos.append(RideResult.user_id == parametrai['user_id'])
+    return salygos
+
+
+def create_reprice_job(nuo=None, iki=None, user_id=None, chunk_size=CHUNK_SIZE, pauze=0.0):
+    """nuo, iki – datos YYYY-MM-DD imtinai; pauze – sekundės tarp dalių."""
+    parametrai = {'nuo': nuo, 'iki': iki, 'user_id': user_id, 'chunk_size': chunk_size, 'pauze': pauze}
+    viso = db.session.scalar(select(func.count(RideResult.id)).where(*ride_filters(parametrai)))
+    return jobs.create_job(TIPAS, parametrai, viso)
+
+
+def reprice_chunk(job, salygos, chunk_size):
+    """Perskaičiuoja vieną dalį. Grąžina apdorotų įrašų skaičių (0 – darbas baigtas)."""
+    eilutes = db.session.execute(
+        select(
+            RideResult.id, RideResult.user_id, RideResult.menesis, RideResult.vehicle_id, RideResult.data,
+            *[getattr(RideResult, laukas) for laukas in rates.LAUKAI],
+            RideResult.savaitgalis, RideResult.eur_uz_reisa
+        )
+        .where(RideResult.id > job.paskutinis_id, *salygos)
+        .order_by(RideResult.id)
+        .limit(chunk_size)
+        # PostgreSQL: dalies eilutės užrakinamos, kad edit() jų nepakeistų tarp SELECT ir UPDATE
+        .with_for_update()
+    ).all()
+    if not eilutes:
+        return 0
+
+    stulpeliai = {laukas: [getattr(e, laukas) for e in eilutes] for laukas in ('data',) + rates.LAUKAI}
+    stulpeliai['savaitgalis'] = [e.savaitgalis for e in eilutes]
+
+    pakeitimai = []
+    pokyciai = {}
+    for eilute, eur in zip(eilutes, rates.compute(stulpeliai)):
+        if eur == eilute.eur_uz_reisa:
+            continue
+        pakeitimai.append({'k_id': eilute.id, 'p_eur': eur})
+        suma = pokyciai.setdefault((eilute.user_id, eilute.menesis, eilute.vehicle_id), {'eur_uz_reisa': 0.0})
+        suma['eur_uz_reisa'] += eur - (eilute.eur_uz_reisa or 0)
+
+    if pakeitimai:
+        lentele = RideResult.__table__
+        db.session.execute(
+            update(lentele).where(lentele.c.id == bindparam('k_id')).values(eur_uz_reisa=bindparam('p_eur')),
+            pakeitimai
+        )
+        totals.apply_deltas(pokyciai)
+    jobs.save_progress(job, eilutes[-1].id, len(eilutes), len(pakeitimai))
+    return len(eilutes)
+
+
+@jobs.handler(TIPAS)
+def run_reprice(job):
+    parametrai = job.params
+    salygos = ride_filters(parametrai)
+    chunk_size = parametrai.get('chunk_size') or CHUNK_SIZE
+    pauze = parametrai.get('pauze') or 0
+    # Įkainiai imami iš DB, ne iš kito proceso talpyklos
+    rates.invalidate()
+    while reprice_chunk(job, salygos, chunk_size):
+        if pauze:
+            time.sleep(pauze)
@@ -0,0 +1,102 @@
+"""Reisų eksportas (CSV / XLSX) algalapiams.
+
+Eilutės skaitomos serverio pusės kursoriumi (yield_per) ir iškart
+rašomos į išvestį, todėl atminties sunaudojimas nepriklauso nuo to, ar
+eksportuojamas vienas vairuotojo mėnuo, ar visa įmonės metų istorija.
+Kursorius atidaromas atskiru skaitymo prisijungimu (models.read_connection),
+ne užklausos sesija: kol siunčiamas didelis failas, SQLite rašymo užraktas
+nelaikomas ir vairuotojai gali toliau pildyti reisus.
+Stulpeliai sutampa su ride_import, tad eksportą galima importuoti atgal.
+"""
+import csv
+import io
+import tempfile
+from sqlalchemy import select
+from models import User, RideResult, read_connection
+
+STULPELIAI = ('vartotojas', 'data', 'auto_nr', 'km_kiekis', 'tasku_kiekis', 'pakrautos_paletes',
+              'tara', 'atgalines_paletes', 'savaitgalis', 'eur_uz_reisa')
+YIELD_PER = 2000
+# Tiek CSV eilučių sukaupiama prieš išsiunčiant gabalą klientui
+CSV_GABALAS = 500
+XLSX_GABALAS = 64 * 1024
+
+MIMETYPES = {
+    'csv': 'text/csv; charset=utf-8',
+    'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+}
+
+
+def rides_query(user_id=None, nuo=None, iki=None):
+    """nuo, iki – mėnesiai YYYY-MM imtinai; user_id=None – visi vartotojai."""
+    uzklausa = (
+        select(
+            User.username, RideResult.data, RideResult.auto_nr, RideResult.km_kiekis,
+            RideResult.tasku_kiekis, RideResult.pakrautos_paletes, RideResult.tara,
+            RideResult.atgalines_paletes, RideResult.savaitgalis, RideResult.eur_uz_reisa
+        )
+        .join(User, User.id == RideResult.user_id)
+        .order_by(User.username, RideResult.data, RideResult.id)
+    )
+    if user_id is not None:
+        uzklausa = uzklausa.where(RideResult.user_id == user_id)
+    if nuo:
+        uzklausa = uzklausa.where(RideResult.menesis >= nuo)
+    if iki:
+        uzklausa = uzklausa.where(RideResult.menesis <= iki)
+    return uzklausa
+
+
+def iter_rows(uzklausa):
+    with read_connection() as conn:
+        rezultatas = conn.execute(uzklausa.execution_options(yield_per=YIELD_PER))
+        for vartotojas, data, *kiti, savaitgalis, eur in rezultatas:
+            yield (vartotojas, data.isoformat(), *kiti, 'taip' if savaitgalis else 'ne', round(eur or 0, 2))
+
+
+def iter_csv(eilutes):
+    """Grąžina CSV baitų gabalus po CSV_GABALAS eilučių."""
+    buferis = io.StringIO()
+    rasytojas = csv.writer(buferis)
+    # BOM – kad Excel teisingai parodytų lietuviškas raides
+    buferis.write('﻿')
+    rasytojas.writerow(STULPELIAI)
+    for i, eilute in enumerate(eilutes, start=1):
+        rasytojas.writerow(eilute)
+        if i % CSV_GABALAS == 0:
+            yield buferis.getvalue().encode('utf-8')
+            buferis.seek(0)
+            buferis.truncate()
+    yield buferis.getvalue().encode('utf-8')
+
+
+def write_xlsx(eilutes, failas):
+    # openpyxl importuojame tik prireikus
+    from openpyxl import Workbook
+    knyga = Workbook(write_only=True)
+    lapas = knyga.create_sheet('Reisai')
+    lapas.append(STULPELIAI)
+    for eilute in eilutes:
+        lapas.append(eilute)
+    knyga.save(failas)
+
+
+def iter_xlsx(eilutes):
+    """XLSX yra zip archyvas, todėl knyga rašoma į laikiną failą ir tada siunčiama gabalais."""
+    with tempfile.TemporaryFile() as failas:
+        write_xlsx(eilutes, failas)
+        failas.seek(0)
+        while True:
+            gabalas = failas.read(XLSX_GABALAS)
+            if not gabalas:
+                break
+            yield gabalas
+
+
+def export_file(formatas, eilutes, failas):
+    """Įrašo eksportą į atidarytą dvejetainį failą (CLI)."""
+    if formatas == 'xlsx':
+        write_xlsx(eilutes, failas)
+        return
+    for gabalas in iter_csv(eilutes):
+        failas.write(gabalas)
@@ -0,0 +1,215 @@
+"""Reisų importas iš CSV arba XLSX failų.
+
+Failas skaitomas eilutė po eilutės, eilutės tikrinamos srautu ir kaupiamos
+partijomis po CHUNK_SIZE. Kiekvienai partijai eur_uz_reisa suskaičiuojamas
+vienu praėjimu (rates.compute), įrašai įterpiami vienu executemany ir
+kartu su monthly_total pokyčiais įrašomi vienoje transakcijoje.
+
+Pirmoje eilutėje – stulpelių pavadinimai: data, auto_nr, km_kiekis,
+tasku_kiekis, pakrautos_paletes, tara, atgalines_paletes, savaitgalis
+ir (nebūtinas) vartotojas. auto_nr turi būti automobilių registre
+(vehicle), kitaip eilutė praleidžiama.
+"""
+import csv
+import io
+import logging
+import time
+from datetime import date, datetime
+from sqlalchemy import insert
+from models import db, RideResult
+import rates
+import totals
+import vehicles
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 5000
+# Daugiau klaidų ataskaitoje nerodome, bet skaičiuojame
+MAX_KLAIDU = 100
+
+SKAICIAI = ('km_kiekis', 'tasku_kiekis', 'pakrautos_paletes', 'tara', 'atgalines_paletes')
+PRIVALOMI = ('data', 'auto_nr') + SKAICIAI
+TAIP = {'1', 'true', 'taip', 'yes', 't', 'x'}
+NE = {'', '0', 'false', 'ne', 'no', 'f'}
+
+
+def detect_format(failo_vardas):
+    vardas = (failo_vardas or '').lower()
+    if vardas.endswith('.xlsx'):
+        return 'xlsx'
+    if vardas.endswith('.csv'):
+        return 'csv'
+    raise ValueError('Palaikomi tik .csv ir .xlsx failai')
+
+
+def read_csv(failas):
+    tekstas = io.TextIOWrapper(failas, encoding='utf-8-sig', newline='')
+    pavyzdys = tekstas.read(4096)
+    tekstas.seek(0)
+    try:
+        dialektas = csv.Sniffer().sniff(pavyzdys, delimiters=',;\t')
+    except csv.Error:
+        dialektas = csv.excel
+    skaitytuvas = csv.reader(tekstas, dialektas)
+    antraste = next(skaitytuvas, None)
+    if antraste is None:
+        return
+    yield [stulpelis.strip().lower() for stulpelis in antraste]
+    yield from skaitytuvas
+
+
+def read_xlsx(failas):
+    # openpyxl importuojame tik prireikus – jo nereikia kiekvienam worker'iui
+    from openpyxl import load_workbook
+    knyga = load_workbook(failas, read_only=True, data_only=True)
+    try:
+        eilutes = knyga.active.iter_rows(values_only=True)
+        antraste = next(eilutes, None)
+        if antraste is None:
+            return
+        yield [str(stulpelis or '').strip().lower() for stulpelis in antraste]
+        yield from eilutes
+    finally:
+        knyga.close()
+
+
+def parse_date(reiksme):
+    if isinstance(reiksme, datetime):
+        return reiksme.date()
+    if isinstance(reiksme, date):
+        return reiksme
+    return date.fromisoformat(str(reiksme).strip())
+
+
+def parse_number(reiksme):
+    if reiksme is None or reiksme == '':
+        return 0.0
+    if isinstance(reiksme, (int, float)):
+        skaicius = float(reiksme)
+    else:
+        skaicius = float(str(reiksme).strip().replace(',', '.') or 0)
+    if skaicius < 0:
+        raise ValueError('neigiama reikšmė')
+    return skaicius
+
+
+def parse_bool(reiksme):
+    if isinstance(reiksme, bool):
+        return reiksme
+    tekstas = str(reiksme if reiksme is not None else '').strip().lower()
+    if tekstas in TAIP:
+        return True
+    if tekstas in NE:
+        return False
+    raise ValueError(f'netinkama reikšmė "{reiksme}"')
+
+
+def parse_row(eilute, user_id, vartotojai, automobiliai):
+    """Grąžina RideResult stulpelių žodyną arba kelia ValueError su priežastimi."""
+    for laukas in ('data', 'auto_nr'):
+        if eilute.get(laukas) in (None, ''):
+            raise ValueError(f'trūksta lauko {laukas}')
+    try:
+        data = parse_date(eilute['data'])
+    except ValueError:
+        raise ValueError(f'netinkama data "{eilute["data"]}"')
+
+    irasas = {
+        'user_id': user_id,
+        'data': data,
+        'menesis': data.strftime('%Y-%m'),
+        'auto_nr': vehicles.normalize(eilute['auto_nr']),
+    }
+    if irasas['auto_nr'] not in automobiliai:
+        raise ValueError(f'nežinomas automobilis "{irasas["auto_nr"]}"')
+    irasas['vehicle_id'] = automobiliai[irasas['auto_nr']]
+    for laukas in SKAICIAI:
+        try:
+            irasas[laukas] = parse_number(eilute.get(laukas))
+        except ValueError as e:
+            raise ValueError(f'{laukas}: {e}')
+    try:
+        irasas['savaitgalis'] = parse_bool(eilute.get('savaitgalis'))
+    except ValueError as e:
+        raise ValueError(f'savaitgalis: {e}')
+
+    vardas = str(eilute.get('vartotojas') or '').strip()
+    if vardas:
+        if vartotojai is None:
+            raise ValueError('stulpelį vartotojas gali naudoti tik administratorius')
+        if vardas not in vartotojai:
+            raise ValueError(f'nežinomas vartotojas "{vardas}"')
+        irasas['user_id'] = vartotojai[vardas]
+    elif irasas['user_id'] is None:
+        raise ValueError('nenurodytas vartotojas')
+    return irasas
+
+
+def write_chunk(irasai):
+    """Įrašo partiją ir jos mėnesių sumas vienoje transakcijoje."""
+    stulpeliai = {laukas: [irasas[laukas] for irasas in irasai] for laukas in ('data',) + SKAICIAI + ('savaitgalis',)}
+    for irasas, eur in zip(irasai, rates.compute(stulpeliai)):
+        irasas['eur_uz_reisa'] = eur
+
+    sumos = {}
+    for irasas in irasai:
+        raktas = (irasas['user_id'], irasas['menesis'], irasas['vehicle_id'])
+        suma = sumos.setdefault(raktas, dict(totals.tuscia_suma(), irasu_kiekis=0))
+        suma['irasu_kiekis'] += 1
+        for laukas in totals.SUMUOJAMI_LAUKAI:
+            suma[laukas] += irasas[laukas]
+
+    try:
+        db.session.execute(insert(RideResult), irasai)
+        totals.apply_deltas(sumos)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+
+def import_rides(failas, formatas, user_id=None, vartotojai=None, chunk_size=CHUNK_SIZE):
+    """Importuoja reisus iš atidaryto dvejetainio failo.
+
+    user_id – kam priskirti eilutes be stulpelio vartotojas; vartotojai –
+    {username: id}, jei leidžiama importuoti kitų vartotojų reisus.
+    Netinkamos eilutės praleidžiamos ir grąžinamos ataskaitoje.
+    """
+    skaitytuvas = read_xlsx(failas) if formatas == 'xlsx' else read_csv(failas)
+    pradzia = time.perf_counter()
+    rezultatas = {'importuota': 0, 'praleista': 0, 'klaidos': []}
+
+    antraste = next(skaitytuvas, None)
+    if antraste is None:
+        raise ValueError('Failas tuščias')
+    truksta = [laukas for laukas in PRIVALOMI if laukas not in antraste]
+    if truksta:
+        raise ValueError(f'Trūksta stulpelių: {", ".join(truksta)}')
+
+    # Importuojant istoriją tinka ir neaktyvūs automobiliai
+    automobiliai = vehicles.id_map()
+    partija = []
+    for eilutes_nr, reiksmes in enumerate(skaitytuvas, start=2):
+        if not any(reiksme not in (None, '') for reiksme in reiksmes):
+            continue
+        try:
+            partija.append(parse_row(dict(zip(antraste, reiksmes)), user_id, vartotojai, automobiliai))
+        except ValueError as e:
+            rezultatas['praleista'] += 1
+            if len(rezultatas['klaidos']) < MAX_KLAIDU:
+                rezultatas['klaidos'].append((eilutes_nr, str(e)))
+            continue
+        if len(partija) >= chunk_size:
+            write_chunk(partija)
+            rezultatas['importuota'] += len(partija)
+            partija = []
+    if partija:
+        write_chunk(partija)
+        rezultatas['importuota'] += len(partija)
+
+    rezultatas['trukme'] = time.perf_counter() - pradzia
+    logger.info(
+        "Importuota reisų: %d, praleista: %d, %.1f s",
+        rezultatas['importuota'], rezultatas['praleista'], rezultatas['trukme']
+    )
+    return rezultatas
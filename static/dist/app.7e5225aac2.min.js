@@ -0,0 +1,2 @@
+(function(){'use strict';const{useState,useEffect}=React;function App({initialData,initialBendraSuma,initialSelectedMonth}){const[selectedMonth,setSelectedMonth]=useState(initialSelectedMonth);const[showForm,setShowForm]=useState(false);const[visiIrasai,setVisiIrasai]=useState(initialData);const[bendraSuma,setBendraSuma]=useState(initialBendraSuma);useEffect(()=>{const ctx=document.getElementById("myChart").getContext("2d");new Chart(ctx,{type:"bar",data:{labels:visiIrasai.map((irasas)=>irasas.data),datasets:[{label:"U\u017Edarbis (\u20AC)",data:visiIrasai.map((irasas)=>irasas.eur_uz_reisa),backgroundColor:"rgba(75, 192, 192, 0.6)",borderColor:"rgba(75, 192, 192, 1)",borderWidth:1}]},options:{scales:{y:{beginAtZero:true}}}});},[visiIrasai]);return React.createElement("div",{className:"container mx-auto px-4 py-8"});}
+window.RivonaApp=App;})();
\ No newline at end of file
@@ -0,0 +1,2 @@
+(function(){'use strict';const pageData=JSON.parse(document.getElementById("page-data").textContent);const irasas=pageData.irasas;function EditForm(){const[isSavaitgalis,setIsSavaitgalis]=React.useState(irasas.savaitgalis);const[automobiliai,setAutomobiliai]=React.useState(null);React.useEffect(()=>{fetch(pageData.vehicles_url,{credentials:"same-origin"}).then((response)=>response.json()).then((sarasas)=>setAutomobiliai(sarasas.filter((automobilis)=>automobilis.aktyvus||automobilis.id===irasas.vehicle_id))).catch(()=>alert("Nepavyko \u012Fkelti automobili\u0173 s\u0105ra\u0161o."));},[]);const handleSavaitgalisToggle=()=>{setIsSavaitgalis(!isSavaitgalis);};return React.createElement("div",{className:"container mt-5"},React.createElement("h1",{className:"mb-4"},"Redaguoti \u012Fra\u0161\u0105"),React.createElement("form",{action:pageData.action_url,method:"POST",className:"mb-4"},React.createElement("div",{className:"form-row"},React.createElement("div",{className:"form-group col-md-6"},React.createElement("label",{htmlFor:"data"},"Data:"),React.createElement("input",{type:"date",id:"data",name:"data",className:"form-control",defaultValue:irasas.data,required:true})),React.createElement("div",{className:"form-group col-md-6"},React.createElement("label",{htmlFor:"vehicle_id"},"Automobilio numeris:"),automobiliai?React.createElement("select",{id:"vehicle_id",name:"vehicle_id",className:"form-control",defaultValue:irasas.vehicle_id,required:true},automobiliai.map((automobilis)=>React.createElement("option",{key:automobilis.id,value:automobilis.id},automobilis.numeris))):React.createElement("select",{id:"vehicle_id",className:"form-control",disabled:true},React.createElement("option",null,irasas.auto_nr)))),React.createElement("div",{className:"form-row"},React.createElement("div",{className:"form-group col-md-4"},React.createElement("label",{htmlFor:"km_kiekis"},"Kilometr\u0173 kiekis:"),React.createElement("input",{type:"number",step:"0.01",id:"km_kiekis",name:"km_kiekis",className:"form-control",defaultValue:irasas.km_kiekis,required:true})),React.createElement("div",{className:"form-group col-md-4"},React.createElement("label",{htmlFor:"tasku_kiekis"},"Ta\u0161k\u0173 kiekis:"),React.createElement("input",{type:"number",step:"0.01",id:"tasku_kiekis",name:"tasku_kiekis",className:"form-control",defaultValue:irasas.tasku_kiekis,required:true})),React.createElement("div",{className:"form-group col-md-4"},React.createElement("label",{htmlFor:"pakrautos_paletes"},"Pakrautos palet\u0117s:"),React.createElement("input",{type:"number",step:"0.01",id:"pakrautos_paletes",name:"pakrautos_paletes",className:"form-control",defaultValue:irasas.pakrautos_paletes,required:true}))),React.createElement("div",{className:"form-row"},React.createElement("div",{className:"form-group col-md-4"},React.createElement("label",{htmlFor:"atgalines_paletes"},"Atgalin\u0117s palet\u0117s:"),React.createElement("input",{type:"number",step:"0.01",id:"atgalines_paletes",name:"atgalines_paletes",className:"form-control",defaultValue:irasas.atgalines_paletes,required:true})),React.createElement("div",{className:"form-group col-md-4"},React.createElement("label",{htmlFor:"tara"},"Tara:"),React.createElement("input",{type:"number",step:"0.01",id:"tara",name:"tara",className:"form-control",defaultValue:irasas.tara,required:true})),React.createElement("div",{className:"form-group col-md-4"},React.createElement("label",null,"Savaitgalis:"),React.createElement("button",{type:"button",className:`btn btn-block weekend-button ${isSavaitgalis ? "active" : ""}`,onClick:handleSavaitgalisToggle,title:"Savaitgal\u012F mokami papildomi 20% nuo atlikt\u0173 darb\u0173"},"Savaitgalis"),React.createElement("input",{type:"hidden",name:"savaitgalis",value:isSavaitgalis?"true":"false"}))),React.createElement("button",{type:"submit",className:"btn btn-primary"},"Atnaujinti \u012Fra\u0161\u0105")),React.createElement("a",{href:pageData.index_url,className:"btn btn-secondary"},"Gr\u012F\u017Eti"));}
+ReactDOM.render(React.createElement(EditForm,null),document.getElementById("root"));})();
\ No newline at end of file
@@ -0,0 +1,3 @@
+(function(){'use strict';const pageData=JSON.parse(document.getElementById("page-data").textContent);const{BarChart,Bar,XAxis,YAxis,CartesianGrid,Tooltip,Legend,ResponsiveContainer}=Recharts;const ChartComponent=({data,dataKey,title,color})=>React.createElement("div",null,React.createElement("h3",null,title),React.createElement(ResponsiveContainer,{width:"100%",height:300},React.createElement(BarChart,{data},React.createElement(CartesianGrid,{strokeDasharray:"3 3"}),React.createElement(XAxis,{dataKey:"menesis"}),React.createElement(YAxis,null),React.createElement(Tooltip,{formatter:(value)=>dataKey==="eur_uz_reisa"?`${value.toFixed(2)} \u20AC`:value.toFixed(2)}),React.createElement(Legend,null),React.createElement(Bar,{dataKey,fill:color,name:title}))));function Charts({chartData}){return React.createElement("div",null,React.createElement(ChartComponent,{data:chartData,dataKey:"km_kiekis",title:"Kilometr\u0173 kiekis",color:"#8884d8"}),React.createElement(ChartComponent,{data:chartData,dataKey:"tasku_kiekis",title:"Ta\u0161k\u0173 kiekis",color:"#82ca9d"}),React.createElement(ChartComponent,{data:chartData,dataKey:"pakrautos_paletes",title:"Pakrautos palet\u0117s",color:"#ffc658"}),React.createElement(ChartComponent,{data:chartData,dataKey:"tara",title:"Tara",color:"#ff8042"}),React.createElement(ChartComponent,{data:chartData,dataKey:"atgalines_paletes",title:"Atgalin\u0117s palet\u0117s",color:"#a4de6c"}),React.createElement(ChartComponent,{data:chartData,dataKey:"eur_uz_reisa",title:"EUR u\u017E reis\u0105",color:"#8dd1e1"}));}
+function App(){const[automobiliai,setAutomobiliai]=React.useState([]);const[filtrai,setFiltrai]=React.useState({nuo:"",iki:"",vehicle_id:""});const[chartData,setChartData]=React.useState([]);const[klaida,setKlaida]=React.useState(null);React.useEffect(()=>{fetch(pageData.vehicles_url,{credentials:"same-origin"}).then((response)=>response.json()).then(setAutomobiliai).catch(()=>setKlaida("Nepavyko gauti automobili\u0173 s\u0105ra\u0161o."));},[]);React.useEffect(()=>{const params=new URLSearchParams();Object.entries(filtrai).forEach(([raktas,reiksme])=>{if(reiksme){params.append(raktas,reiksme);}});fetch(pageData.api_url+"?"+params.toString(),{credentials:"same-origin"}).then((response)=>response.json()).then((response)=>{if(response.success){setChartData(response.menesiai);setKlaida(null);}else{setKlaida(response.message);}}).catch(()=>setKlaida("Nepavyko gauti grafik\u0173 duomen\u0173."));},[filtrai]);const handleFilterChange=(event)=>{const{name,value}=event.target;setFiltrai((prev)=>({...prev,[name]:value}));};return React.createElement("div",{className:"container mt-5"},React.createElement("h1",{className:"mb-4"},"Reis\u0173 Rezultat\u0173 Grafikai"),React.createElement("a",{href:"/",className:"btn btn-primary mb-3"},"Gr\u012F\u017Eti \u012F pagrindin\u012F puslap\u012F"),React.createElement("div",{className:"form-row mb-3"},React.createElement("div",{className:"form-group col-md-4"},React.createElement("label",{htmlFor:"nuo"},"Nuo:"),React.createElement("input",{type:"date",id:"nuo",name:"nuo",className:"form-control",value:filtrai.nuo,onChange:handleFilterChange})),React.createElement("div",{className:"form-group col-md-4"},React.createElement("label",{htmlFor:"iki"},"Iki:"),React.createElement("input",{type:"date",id:"iki",name:"iki",className:"form-control",value:filtrai.iki,onChange:handleFilterChange})),React.createElement("div",{className:"form-group col-md-4"},React.createElement("label",{htmlFor:"vehicle_id"},"Automobilio numeris:"),React.createElement("select",{id:"vehicle_id",name:"vehicle_id",className:"form-control",value:filtrai.vehicle_id,onChange:handleFilterChange},React.createElement("option",{value:""},"Visi"),automobiliai.map((automobilis)=>React.createElement("option",{key:automobilis.id,value:automobilis.id},automobilis.numeris))))),klaida&&React.createElement("div",{className:"alert alert-danger"},klaida),React.createElement(Charts,{chartData}));}
+ReactDOM.render(React.createElement(App,null),document.getElementById("root"));})();
\ No newline at end of file
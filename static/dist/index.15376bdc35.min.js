@@ -0,0 +1,6 @@
+(function(){'use strict';const pageData=JSON.parse(document.getElementById("page-data").textContent);function Clock(){const[time,setTime]=React.useState(new Date());React.useEffect(()=>{const timer=setInterval(()=>{setTime(new Date());},1e3);return()=>{clearInterval(timer);};},[]);const formatTime=(date)=>{const options={timeZone:"Europe/Vilnius",hour:"2-digit",minute:"2-digit",second:"2-digit",hour12:false};return date.toLocaleTimeString("lt-LT",options);};return React.createElement("div",{id:"clock"},formatTime(time));}
+const PAGE_SIZE=50;function App(){const[visiIrasai,setVisiIrasai]=React.useState([]);const[kitas,setKitas]=React.useState(null);const[kraunama,setKraunama]=React.useState(false);const[kryptis,setKryptis]=React.useState("desc");const pabaiga=React.useRef(null);const[bendraSuma,setBendraSuma]=React.useState(pageData.bendra_suma);const[selectedMonth,setSelectedMonth]=React.useState(pageData.selected_month);const[isSavaitgalis,setIsSavaitgalis]=React.useState(false);const[currentDate,setCurrentDate]=React.useState("");const[automobiliai,setAutomobiliai]=React.useState([]);const user=pageData.user;React.useEffect(()=>{fetch(pageData.vehicles_url,{credentials:"same-origin"}).then((response)=>response.json()).then((sarasas)=>setAutomobiliai(sarasas.filter((automobilis)=>automobilis.aktyvus))).catch(()=>alert("Nepavyko \u012Fkelti automobili\u0173 s\u0105ra\u0161o."));},[]);React.useEffect(()=>{const today=new Date();const formattedDate=today.toISOString().split("T")[0];setCurrentDate(formattedDate);},[]);const loadPage=(po,dabartineKryptis)=>{setKraunama(true);const params=new URLSearchParams({menesis:pageData.selected_month,kryptis:dabartineKryptis,limit:PAGE_SIZE});if(po){params.set("po",po);}
+return fetch(`${pageData.rides_url}?${params}`).then((response)=>response.json()).then((atsakymas)=>{if(!atsakymas.success){throw new Error(atsakymas.message);}
+setVisiIrasai((prevIrasai)=>po?[...prevIrasai,...atsakymas.irasai]:atsakymas.irasai);setKitas(atsakymas.kitas);}).catch((error)=>{console.error("Klaida kraunant \u012Fra\u0161us:",error);alert("Nepavyko \u012Fkelti \u012Fra\u0161\u0173.");}).finally(()=>setKraunama(false));};React.useEffect(()=>{loadPage(null,kryptis);},[kryptis]);React.useEffect(()=>{if(!kitas||kraunama||!pabaiga.current||!("IntersectionObserver"in window)){return;}
+const stebetojas=new IntersectionObserver((irasai)=>{if(irasai[0].isIntersecting){stebetojas.disconnect();loadPage(kitas,kryptis);}},{rootMargin:"300px"});stebetojas.observe(pabaiga.current);return()=>stebetojas.disconnect();},[kitas,kraunama,kryptis]);const toggleKryptis=()=>{setKryptis((prev)=>prev==="desc"?"asc":"desc");};const handleMonthChange=(event)=>{setSelectedMonth(event.target.value);};const handleSavaitgalisToggle=()=>{setIsSavaitgalis(!isSavaitgalis);};const handleSubmit=(event)=>{event.preventDefault();const form=event.target;const formData=new FormData(form);$.ajax({type:"POST",url:pageData.index_url,data:formData,processData:false,contentType:false,success:function(response){if(response.success){setVisiIrasai((prevIrasai)=>[response.newRecord,...prevIrasai]);setBendraSuma((prevSuma)=>({tasku_kiekis:prevSuma.tasku_kiekis+response.newRecord.tasku_kiekis,km_kiekis:prevSuma.km_kiekis+response.newRecord.km_kiekis,pakrautos_paletes:prevSuma.pakrautos_paletes+response.newRecord.pakrautos_paletes,tara:prevSuma.tara+response.newRecord.tara,atgalines_paletes:prevSuma.atgalines_paletes+response.newRecord.atgalines_paletes,eur_uz_reisa:prevSuma.eur_uz_reisa+response.newRecord.eur_uz_reisa}));form.reset();setIsSavaitgalis(false);alert(response.message);}else{alert("Klaida: "+response.message);}},error:function(jqXHR,textStatus,errorThrown){console.error("AJAX klaida:",textStatus,errorThrown);alert("\u012Evyko klaida. Bandykite dar kart\u0105.");}});};const handleDelete=(id)=>{if(confirm("Ar tikrai norite i\u0161trinti \u0161\u012F \u012Fra\u0161\u0105?")){$.ajax({url:"/delete/"+id,type:"GET",dataType:"json",success:function(response){if(response.success){setVisiIrasai((prevIrasai)=>prevIrasai.filter((irasas)=>irasas.id!==id));setBendraSuma(response.newTotal);alert(response.message);}else{alert("Klaida: "+response.message);}},error:function(xhr,status,error){console.error("Klaida:",error);alert("\u012Evyko klaida bandant i\u0161trinti \u012Fra\u0161\u0105.");}});}};return React.createElement("div",{className:"container mt-5"},React.createElement(Clock,null),React.createElement("h1",{className:"mb-4"},"Reis\u0173 Rezultatai"),React.createElement("div",{className:"mb-3"},React.createElement("a",{href:"/logout",className:"btn btn-danger mr-2"},"Atsijungti"),React.createElement("a",{href:"/grafikai",className:"btn btn-info mr-2"},"Per\u017Ei\u016Br\u0117ti grafikus"),React.createElement("a",{href:"/import",className:"btn btn-secondary mr-2"},"Importuoti reisus"),React.createElement("a",{href:"/store_catalog",className:"btn btn-success mr-2"},"Parduotuvi\u0173 ir atgalini\u0173 katalogas"),user.is_admin&&React.createElement("a",{href:"/admin",className:"btn btn-warning"},"Administratoriaus skydelis")),React.createElement("form",{action:"/",method:"GET",className:"mb-4"},React.createElement("div",{className:"form-group"},React.createElement("label",{htmlFor:"month"},"Pasirinkite m\u0117nes\u012F:"),React.createElement("input",{type:"month",id:"month",name:"month",className:"form-control",value:selectedMonth,onChange:handleMonthChange})),React.createElement("button",{type:"submit",className:"btn btn-primary"},"Filtruoti"),React.createElement("a",{href:`${pageData.export_url}?nuo=${selectedMonth}&iki=${selectedMonth}&format=csv`,className:"btn btn-outline-secondary ml-2"},"Atsisi\u0173sti CSV"),React.createElement("a",{href:`${pageData.export_url}?nuo=${selectedMonth}&iki=${selectedMonth}&format=xlsx`,className:"btn btn-outline-secondary ml-2"},"Atsisi\u0173sti XLSX")),React.createElement("h2",null,"Prid\u0117ti nauj\u0105 \u012Fra\u0161\u0105"),React.createElement("form",{onSubmit:handleSubmit,className:"mb-4"},React.createElement("div",{className:"form-row"},React.createElement("div",{className:"form-group col-md-6"},React.createElement("label",{htmlFor:"data"},"Data:"),React.createElement("input",{type:"date",id:"data",name:"data",className:"form-control",required:true,value:currentDate})),React.createElement("div",{className:"form-group col-md-6"},React.createElement("label",{htmlFor:"vehicle_id"},"Automobilio numeris:"),React.createElement("select",{id:"vehicle_id",name:"vehicle_id",className:"form-control",required:true},automobiliai.map((automobilis)=>React.createElement("option",{key:automobilis.id,value:automobilis.id},automobilis.numeris))))),React.createElement("div",{className:"form-row"},React.createElement("div",{className:"form-group col-md-4"},React.createElement("label",{htmlFor:"km_kiekis"},"Kilometr\u0173 kiekis:"),React.createElement("input",{type:"number",step:"0.01",id:"km_kiekis",name:"km_kiekis",className:"form-control",required:true})),React.createElement("div",{className:"form-group col-md-4"},React.createElement("label",{htmlFor:"tasku_kiekis"},"Ta\u0161k\u0173 kiekis:"),React.createElement("input",{type:"number",step:"0.01",id:"tasku_kiekis",name:"tasku_kiekis",className:"form-control",required:true})),React.createElement("div",{className:"form-group col-md-4"},React.createElement("label",{htmlFor:"pakrautos_paletes"},"Pakrautos palet\u0117s:"),React.createElement("input",{type:"number",step:"0.01",id:"pakrautos_paletes",name:"pakrautos_paletes",className:"form-control",required:true}))),React.createElement("div",{className:"form-row"},React.createElement("div",{className:"form-group col-md-4"},React.createElement("label",{htmlFor:"atgalines_paletes"},"Atgalin\u0117s palet\u0117s:"),React.createElement("input",{type:"number",step:"0.01",id:"atgalines_paletes",name:"atgalines_paletes",className:"form-control",required:true})),React.createElement("div",{className:"form-group col-md-4"},React.createElement("label",{htmlFor:"tara"},"Tara:"),React.createElement("input",{type:"number",step:"0.01",id:"tara",name:"tara",className:"form-control",required:true})),React.createElement("div",{className:"form-group col-md-4"},React.createElement("label",null,"Savaitgalis:"),React.createElement("button",{type:"button",className:`btn btn-block weekend-button ${isSavaitgalis ? "active" : ""}`,onClick:handleSavaitgalisToggle,title:"Savaitgal\u012F mokami papildomi 20% nuo atlikt\u0173 darb\u0173"},"Savaitgalis"),React.createElement("input",{type:"hidden",name:"savaitgalis",value:isSavaitgalis?"true":"false"}))),React.createElement("button",{type:"submit",className:"btn btn-success"},"Prid\u0117ti \u012Fra\u0161\u0105")),React.createElement("div",{className:"mb-4"},React.createElement("h2",null,"Bendra suma"),React.createElement("div",{className:"table-container"},React.createElement("table",{className:"table table-bordered table-responsive-stack"},React.createElement("thead",{className:"table-responsive-stack-thead"},React.createElement("tr",null,React.createElement("th",null,"Ta\u0161k\u0173 kiekis"),React.createElement("th",null,"Kilometr\u0173 kiekis"),React.createElement("th",null,"Pakrautos palet\u0117s"),React.createElement("th",null,"Tara"),React.createElement("th",null,"Atgalin\u0117s palet\u0117s"),React.createElement("th",null,"EUR u\u017E reis\u0105"))),React.createElement("tbody",null,React.createElement("tr",null,React.createElement("td",{"data-label":"Ta\u0161k\u0173 kiekis"},bendraSuma.tasku_kiekis.toFixed(2)),React.createElement("td",{"data-label":"Kilometr\u0173 kiekis"},bendraSuma.km_kiekis.toFixed(2)),React.createElement("td",{"data-label":"Pakrautos palet\u0117s"},bendraSuma.pakrautos_paletes.toFixed(2)),React.createElement("td",{"data-label":"Tara"},bendraSuma.tara.toFixed(2)),React.createElement("td",{"data-label":"Atgalin\u0117s palet\u0117s"},bendraSuma.atgalines_paletes.toFixed(2)),React.createElement("td",{"data-label":"EUR u\u017E reis\u0105"},bendraSuma.eur_uz_reisa.toFixed(2))))))),React.createElement("h2",null,"\u012Era\u0161\u0173 s\u0105ra\u0161as"),React.createElement("div",{className:"table-container"},React.createElement("table",{className:"table table-striped table-responsive-stack"},React.createElement("thead",{className:"table-responsive-stack-thead"},React.createElement("tr",null,React.createElement("th",{onClick:toggleKryptis,style:{cursor:"pointer"},title:"Keisti rikiavim\u0105"},"Data ",kryptis==="desc"?"\u25BC":"\u25B2"),React.createElement("th",null,"Auto Nr."),React.createElement("th",null,"Ta\u0161kai"),React.createElement("th",null,"KM"),React.createElement("th",null,"Palet\u0117s"),React.createElement("th",null,"Tara"),React.createElement("th",null,"Atg. palet\u0117s"),React.createElement("th",null,"EUR"),React.createElement("th",null,"Savaitgalis"),React.createElement("th",null,"Veiksmai"))),React.createElement("tbody",null,visiIrasai.map((irasas)=>React.createElement("tr",{key:irasas.id,id:`row-${irasas.id}`},React.createElement("td",{"data-label":"Data"},irasas.data),React.createElement("td",{"data-label":"Auto Nr."},irasas.auto_nr),React.createElement("td",{"data-label":"Ta\u0161kai"},irasas.tasku_kiekis.toFixed(2)),React.createElement("td",{"data-label":"KM"},irasas.km_kiekis.toFixed(2)),React.createElement("td",{"data-label":"Palet\u0117s"},irasas.pakrautos_paletes.toFixed(2)),React.createElement("td",{"data-label":"Tara"},irasas.tara.toFixed(2)),React.createElement("td",{"data-label":"Atg. palet\u0117s"},irasas.atgalines_paletes.toFixed(2)),React.createElement("td",{"data-label":"EUR"},irasas.eur_uz_reisa.toFixed(2)),React.createElement("td",{"data-label":"Savaitgalis"},irasas.savaitgalis?"Taip":"Ne"),React.createElement("td",{"data-label":"Veiksmai"},React.createElement("a",{href:`/edit/${irasas.id}`,className:"btn btn-sm btn-warning mr-2"},"Redaguoti"),React.createElement("button",{onClick:()=>handleDelete(irasas.id),className:"btn btn-sm btn-danger"},"I\u0161trinti")))))),React.createElement("div",{ref:pabaiga}),kraunama&&React.createElement("p",{className:"text-muted"},"Kraunama..."),!kraunama&&kitas&&React.createElement("button",{onClick:()=>loadPage(kitas,kryptis),className:"btn btn-outline-primary mb-4"},"Rodyti daugiau"),!kraunama&&!kitas&&visiIrasai.length===0&&React.createElement("p",{className:"text-muted"},"\u0160\u012F m\u0117nes\u012F \u012Fra\u0161\u0173 n\u0117ra.")));}
+ReactDOM.render(React.createElement(App,null),document.getElementById("root"));})();
\ No newline at end of file
@@ -1,5 +1,5 @@
-import React, { useState, useEffect } from 'react';
-import Chart from 'chart.js/auto';
+// React ir Chart imami iš globalių UMD skriptų (žr. build_assets.py)
+const { useState, useEffect } = React;
 
 function App({ initialData, initialBendraSuma, initialSelectedMonth }) {
     const [selectedMonth, setSelectedMonth] = useState(initialSelectedMonth);
@@ -40,4 +40,4 @@ function App({ initialData, initialBendraSuma, initialSelectedMonth }) {
     );
 }
 
-export default App;
\ No newline at end of file
+window.RivonaApp = App;
\ No newline at end of file
@@ -0,0 +1,91 @@
+const pageData = JSON.parse(document.getElementById('page-data').textContent);
+const irasas = pageData.irasas;
+
+function EditForm() {
+    const [isSavaitgalis, setIsSavaitgalis] = React.useState(irasas.savaitgalis);
+    const [automobiliai, setAutomobiliai] = React.useState(null);
+
+    // Siūlomi aktyvūs automobiliai ir šio įrašo automobilis, net jei jis nebenaudojamas
+    React.useEffect(() => {
+        fetch(pageData.vehicles_url, { credentials: 'same-origin' })
+            .then(response => response.json())
+            .then(sarasas => setAutomobiliai(sarasas.filter(
+                automobilis => automobilis.aktyvus || automobilis.id === irasas.vehicle_id
+            )))
+            .catch(() => alert('Nepavyko įkelti automobilių sąrašo.'));
+    }, []);
+
+    const handleSavaitgalisToggle = () => {
+        setIsSavaitgalis(!isSavaitgalis);
+    };
+
+    return (
+        <div className="container mt-5">
+            <h1 className="mb-4">Redaguoti įrašą</h1>
+            <form action={pageData.action_url} method="POST" className="mb-4">
+                <div className="form-row">
+                    <div className="form-group col-md-6">
+                        <label htmlFor="data">Data:</label>
+                        <input type="date" id="data" name="data" className="form-control" defaultValue={irasas.data} required />
+                    </div>
+                    <div className="form-group col-md-6">
+                        <label htmlFor="vehicle_id">Automobilio numeris:</label>
+                        {/* defaultValue pritaikomas tik pirmam atvaizdavimui, todėl select piešiamas gavus sąrašą */}
+                        {automobiliai ? (
+                            <select id="vehicle_id" name="vehicle_id" className="form-control" defaultValue={irasas.vehicle_id} required>
+                                {automobiliai.map(automobilis => (
+                                    <option key={automobilis.id} value={automobilis.id}>{automobilis.numeris}</option>
+                                ))}
+                            </select>
+                        ) : (
+                            <select id="vehicle_id" className="form-control" disabled>
+                                <option>{irasas.auto_nr}</option>
+                            </select>
+                        )}
+                    </div>
+                </div>
+                <div className="form-row">
+                    <div className="form-group col-md-4">
+                        <label htmlFor="km_kiekis">Kilometrų kiekis:</label>
+                        <input type="number" step="0.01" id="km_kiekis" name="km_kiekis" className="form-control" defaultValue={irasas.km_kiekis} required />
+                    </div>
+                    <div className="form-group col-md-4">
+                        <label htmlFor="tasku_kiekis">Taškų kiekis:</label>
+                        <input type="number" step="0.01" id="tasku_kiekis" name="tasku_kiekis" className="form-control" defaultValue={irasas.tasku_kiekis} required />
+                    </div>
+                    <div className="form-group col-md-4">
+                        <label htmlFor="pakrautos_paletes">Pakrautos paletės:</label>
+                        <input type="number" step="0.01" id="pakrautos_paletes" name="pakrautos_paletes" className="form-control" defaultValue={irasas.pakrautos_paletes} required />
+                    </div>
+                </div>
+                <div className="form-row">
+                    <div className="form-group col-md-4">
+                        <label htmlFor="atgalines_paletes">Atgalinės paletės:</label>
+                        <input type="number" step="0.01" id="atgalines_paletes" name="atgalines_paletes" className="form-control" defaultValue={irasas.atgalines_paletes} required />
+                    </div>
+                    <div className="form-group col-md-4">
+                        <label htmlFor="tara">Tara:</label>
+                        <input type="number" step="0.01" id="tara" name="tara" className="form-control" defaultValue={irasas.tara} required />
+                    </div>
+                    <div className="form-group col-md-4">
+                        <label>Savaitgalis:</label>
+                        <button 
+                            type="button"
+                            className={`btn btn-block weekend-button ${isSavaitgalis ? 'active' : ''}`}
+                            onClick={handleSavaitgalisToggle}
+                            title="Savaitgalį mokami papildomi 20% nuo atliktų darbų"
+                        >
+                            Savaitgalis
+                        </button>
+                        <input type="hidden" name="savaitgalis" value={isSavaitgalis ? 'true' : 'false'} />
+                    </div>
+                </div>
+                <button type="submit" className="btn btn-primary">Atnaujinti įrašą</button>
+            </form>
+            <a href={pageData.index_url} className="btn btn-secondary">Grįžti</a>
+        </div>
+    );
+}
+
+ReactDOM.render(<EditForm />, document.getElementById('root'));
+    
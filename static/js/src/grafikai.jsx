@@ -0,0 +1,104 @@
+const pageData = JSON.parse(document.getElementById('page-data').textContent);
+
+const { BarChart, Bar, XAxis, YAxis, CartesianGrid, Tooltip, Legend, ResponsiveContainer } = Recharts;
+
+const ChartComponent = ({ data, dataKey, title, color }) => (
+    <div>
+        <h3>{title}</h3>
+        <ResponsiveContainer width="100%" height={300}>
+            <BarChart data={data}>
+                <CartesianGrid strokeDasharray="3 3" />
+                <XAxis dataKey="menesis" />
+                <YAxis />
+                <Tooltip formatter={(value) => dataKey === 'eur_uz_reisa' ? `${value.toFixed(2)} €` : value.toFixed(2)} />
+                <Legend />
+                <Bar dataKey={dataKey} fill={color} name={title} />
+            </BarChart>
+        </ResponsiveContainer>
+    </div>
+);
+
+function Charts({ chartData }) {
+    return (
+        <div>
+            <ChartComponent data={chartData} dataKey="km_kiekis" title="Kilometrų kiekis" color="#8884d8" />
+            <ChartComponent data={chartData} dataKey="tasku_kiekis" title="Taškų kiekis" color="#82ca9d" />
+            <ChartComponent data={chartData} dataKey="pakrautos_paletes" title="Pakrautos paletės" color="#ffc658" />
+            <ChartComponent data={chartData} dataKey="tara" title="Tara" color="#ff8042" />
+            <ChartComponent data={chartData} dataKey="atgalines_paletes" title="Atgalinės paletės" color="#a4de6c" />
+            <ChartComponent data={chartData} dataKey="eur_uz_reisa" title="EUR už reisą" color="#8dd1e1" />
+        </div>
+    );
+}
+
+function App() {
+    const [automobiliai, setAutomobiliai] = React.useState([]);
+    const [filtrai, setFiltrai] = React.useState({ nuo: '', iki: '', vehicle_id: '' });
+    const [chartData, setChartData] = React.useState([]);
+    const [klaida, setKlaida] = React.useState(null);
+
+    // Filtre rodomi ir nebenaudojami automobiliai – jų reisai lieka grafikuose
+    React.useEffect(() => {
+        fetch(pageData.vehicles_url, { credentials: 'same-origin' })
+            .then(response => response.json())
+            .then(setAutomobiliai)
+            .catch(() => setKlaida('Nepavyko gauti automobilių sąrašo.'));
+    }, []);
+
+    React.useEffect(() => {
+        // Mėnesių sumos skaičiuojamos serveryje, čia gaunamos tik agreguotos eilutės
+        const params = new URLSearchParams();
+        Object.entries(filtrai).forEach(([raktas, reiksme]) => {
+            if (reiksme) {
+                params.append(raktas, reiksme);
+            }
+        });
+        fetch(pageData.api_url + '?' + params.toString(), { credentials: 'same-origin' })
+            .then(response => response.json())
+            .then(response => {
+                if (response.success) {
+                    setChartData(response.menesiai);
+                    setKlaida(null);
+                } else {
+                    setKlaida(response.message);
+                }
+            })
+            .catch(() => setKlaida('Nepavyko gauti grafikų duomenų.'));
+    }, [filtrai]);
+
+    const handleFilterChange = (event) => {
+        const { name, value } = event.target;
+        setFiltrai(prev => ({ ...prev, [name]: value }));
+    };
+
+    return (
+        <div className="container mt-5">
+            <h1 className="mb-4">Reisų Rezultatų Grafikai</h1>
+            <a href="/" className="btn btn-primary mb-3">Grįžti į pagrindinį puslapį</a>
+            <div className="form-row mb-3">
+                <div className="form-group col-md-4">
+                    <label htmlFor="nuo">Nuo:</label>
+                    <input type="date" id="nuo" name="nuo" className="form-control" value={filtrai.nuo} onChange={handleFilterChange} />
+                </div>
+                <div className="form-group col-md-4">
+                    <label htmlFor="iki">Iki:</label>
+                    <input type="date" id="iki" name="iki" className="form-control" value={filtrai.iki} onChange={handleFilterChange} />
+                </div>
+                <div className="form-group col-md-4">
+                    <label htmlFor="vehicle_id">Automobilio numeris:</label>
+                    <select id="vehicle_id" name="vehicle_id" className="form-control" value={filtrai.vehicle_id} onChange={handleFilterChange}>
+                        <option value="">Visi</option>
+                        {automobiliai.map(automobilis => (
+                            <option key={automobilis.id} value={automobilis.id}>{automobilis.numeris}</option>
+                        ))}
+                    </select>
+                </div>
+            </div>
+            {klaida && <div className="alert alert-danger">{klaida}</div>}
+            <Charts chartData={chartData} />
+        </div>
+    );
+}
+
+ReactDOM.render(<App />, document.getElementById('root'));
+    
@@ -0,0 +1,351 @@
+const pageData = JSON.parse(document.getElementById('page-data').textContent);
+
+function Clock() {
+    const [time, setTime] = React.useState(new Date());
+
+    React.useEffect(() => {
+        const timer = setInterval(() => {
+            setTime(new Date());
+        }, 1000);
+
+        return () => {
+            clearInterval(timer);
+        };
+    }, []);
+
+    const formatTime = (date) => {
+        const options = {
+            timeZone: 'Europe/Vilnius',
+            hour: '2-digit',
+            minute: '2-digit',
+            second: '2-digit',
+            hour12: false
+        };
+        return date.toLocaleTimeString('lt-LT', options);
+    };
+
+    return <div id="clock">{formatTime(time)}</div>;
+}
+
+const PAGE_SIZE = 50;
+
+function App() {
+    const [visiIrasai, setVisiIrasai] = React.useState([]);
+    const [kitas, setKitas] = React.useState(null);
+    const [kraunama, setKraunama] = React.useState(false);
+    const [kryptis, setKryptis] = React.useState('desc');
+    const pabaiga = React.useRef(null);
+    const [bendraSuma, setBendraSuma] = React.useState(pageData.bendra_suma);
+    const [selectedMonth, setSelectedMonth] = React.useState(pageData.selected_month);
+    const [isSavaitgalis, setIsSavaitgalis] = React.useState(false);
+    const [currentDate, setCurrentDate] = React.useState('');
+    const [automobiliai, setAutomobiliai] = React.useState([]);
+    const user = pageData.user;
+
+    // Automobilių sąrašas su ETag – naršyklė jį perklausia ir dažniausiai gauna 304
+    React.useEffect(() => {
+        fetch(pageData.vehicles_url, { credentials: 'same-origin' })
+            .then(response => response.json())
+            .then(sarasas => setAutomobiliai(sarasas.filter(automobilis => automobilis.aktyvus)))
+            .catch(() => alert('Nepavyko įkelti automobilių sąrašo.'));
+    }, []);
+
+    React.useEffect(() => {
+        const today = new Date();
+        const formattedDate = today.toISOString().split('T')[0];
+        setCurrentDate(formattedDate);
+    }, []);
+
+    // Įrašai kraunami puslapiais; po – ankstesnio puslapio "kitas" žymeklis
+    const loadPage = (po, dabartineKryptis) => {
+        setKraunama(true);
+        const params = new URLSearchParams({
+            menesis: pageData.selected_month,
+            kryptis: dabartineKryptis,
+            limit: PAGE_SIZE
+        });
+        if (po) {
+            params.set('po', po);
+        }
+        return fetch(`${pageData.rides_url}?${params}`)
+            .then(response => response.json())
+            .then(atsakymas => {
+                if (!atsakymas.success) {
+                    throw new Error(atsakymas.message);
+                }
+                setVisiIrasai(prevIrasai => po ? [...prevIrasai, ...atsakymas.irasai] : atsakymas.irasai);
+                setKitas(atsakymas.kitas);
+            })
+            .catch(error => {
+                console.error('Klaida kraunant įrašus:', error);
+                alert('Nepavyko įkelti įrašų.');
+            })
+            .finally(() => setKraunama(false));
+    };
+
+    React.useEffect(() => {
+        loadPage(null, kryptis);
+    }, [kryptis]);
+
+    // Kitas puslapis kraunamas, kai lentelės pabaiga pasirodo ekrane
+    React.useEffect(() => {
+        if (!kitas || kraunama || !pabaiga.current || !('IntersectionObserver' in window)) {
+            return;
+        }
+        const stebetojas = new IntersectionObserver(irasai => {
+            if (irasai[0].isIntersecting) {
+                stebetojas.disconnect();
+                loadPage(kitas, kryptis);
+            }
+        }, { rootMargin: '300px' });
+        stebetojas.observe(pabaiga.current);
+        return () => stebetojas.disconnect();
+    }, [kitas, kraunama, kryptis]);
+
+    const toggleKryptis = () => {
+        setKryptis(prev => prev === 'desc' ? 'asc' : 'desc');
+    };
+
+    const handleMonthChange = (event) => {
+        setSelectedMonth(event.target.value);
+    };
+
+    const handleSavaitgalisToggle = () => {
+        setIsSavaitgalis(!isSavaitgalis);
+    };
+
+    const handleSubmit = (event) => {
+        event.preventDefault();
+        const form = event.target;
+        const formData = new FormData(form);
+        
+        $.ajax({
+            type: 'POST',
+            url: pageData.index_url,
+            data: formData,
+            processData: false,
+            contentType: false,
+            success: function(response) {
+                if (response.success) {
+                    // Pridėti naują įrašą į sąrašo pradžią
+                    setVisiIrasai(prevIrasai => [response.newRecord, ...prevIrasai]);
+                    // Atnaujinti bendrą sumą
+                    setBendraSuma(prevSuma => ({
+                        tasku_kiekis: prevSuma.tasku_kiekis + response.newRecord.tasku_kiekis,
+                        km_kiekis: prevSuma.km_kiekis + response.newRecord.km_kiekis,
+                        pakrautos_paletes: prevSuma.pakrautos_paletes + response.newRecord.pakrautos_paletes,
+                        tara: prevSuma.tara + response.newRecord.tara,
+                        atgalines_paletes: prevSuma.atgalines_paletes + response.newRecord.atgalines_paletes,
+                        eur_uz_reisa: prevSuma.eur_uz_reisa + response.newRecord.eur_uz_reisa
+                    }));
+                    // Išvalyti formos laukus
+                    form.reset();
+                    setIsSavaitgalis(false);
+                    alert(response.message);
+                } else {
+                    alert('Klaida: ' + response.message);
+                }
+            },
+            error: function(jqXHR, textStatus, errorThrown) {
+                console.error("AJAX klaida:", textStatus, errorThrown);
+                alert('Įvyko klaida. Bandykite dar kartą.');
+            }
+        });
+    };
+
+    const handleDelete = (id) => {
+        if (confirm('Ar tikrai norite ištrinti šį įrašą?')) {
+            $.ajax({
+                url: '/delete/' + id,
+                type: 'GET',
+                dataType: 'json',
+                success: function(response) {
+                    if (response.success) {
+                        // Pašaliname įrašą iš sąrašo
+                        setVisiIrasai(prevIrasai => prevIrasai.filter(irasas => irasas.id !== id));
+                        
+                        // Atnaujiname bendrą sumą
+                        setBendraSuma(response.newTotal);
+                        
+                        alert(response.message);
+                    } else {
+                        alert('Klaida: ' + response.message);
+                    }
+                },
+                error: function(xhr, status, error) {
+                    console.error('Klaida:', error);
+                    alert('Įvyko klaida bandant ištrinti įrašą.');
+                }
+            });
+        }
+    };
+
+    return (
+        <div className="container mt-5">
+            <Clock />
+            <h1 className="mb-4">Reisų Rezultatai</h1>
+            
+            <div className="mb-3">
+                <a href="/logout" className="btn btn-danger mr-2">Atsijungti</a>
+                <a href="/grafikai" className="btn btn-info mr-2">Peržiūrėti grafikus</a>
+                <a href="/import" className="btn btn-secondary mr-2">Importuoti reisus</a>
+                <a href="/store_catalog" className="btn btn-success mr-2">Parduotuvių ir atgalinių katalogas</a>
+                {user.is_admin && (
+                    <a href="/admin" className="btn btn-warning">Administratoriaus skydelis</a>
+                )}
+            </div>
+
+            <form action="/" method="GET" className="mb-4">
+                <div className="form-group">
+                    <label htmlFor="month">Pasirinkite mėnesį:</label>
+                    <input 
+                        type="month" 
+                        id="month" 
+                        name="month" 
+                        className="form-control" 
+                        value={selectedMonth}
+                        onChange={handleMonthChange}
+                    />
+                </div>
+                <button type="submit" className="btn btn-primary">Filtruoti</button>
+                <a href={`${pageData.export_url}?nuo=${selectedMonth}&iki=${selectedMonth}&format=csv`} className="btn btn-outline-secondary ml-2">Atsisiųsti CSV</a>
+                <a href={`${pageData.export_url}?nuo=${selectedMonth}&iki=${selectedMonth}&format=xlsx`} className="btn btn-outline-secondary ml-2">Atsisiųsti XLSX</a>
+            </form>
+
+            <h2>Pridėti naują įrašą</h2>
+            <form onSubmit={handleSubmit} className="mb-4">
+                <div className="form-row">
+                    <div className="form-group col-md-6">
+                        <label htmlFor="data">Data:</label>
+                        <input type="date" id="data" name="data" className="form-control" required value={currentDate} />
+                    </div>
+                    <div className="form-group col-md-6">
+                        <label htmlFor="vehicle_id">Automobilio numeris:</label>
+                        <select id="vehicle_id" name="vehicle_id" className="form-control" required>
+                            {automobiliai.map(automobilis => (
+                                <option key={automobilis.id} value={automobilis.id}>{automobilis.numeris}</option>
+                            ))}
+                        </select>
+                    </div>
+                </div>
+                <div className="form-row">
+                    <div className="form-group col-md-4">
+                        <label htmlFor="km_kiekis">Kilometrų kiekis:</label>
+                        <input type="number" step="0.01" id="km_kiekis" name="km_kiekis" className="form-control" required />
+                    </div>
+                    <div className="form-group col-md-4">
+                        <label htmlFor="tasku_kiekis">Taškų kiekis:</label>
+                        <input type="number" step="0.01" id="tasku_kiekis" name="tasku_kiekis" className="form-control" required />
+                    </div>
+                    <div className="form-group col-md-4">
+                        <label htmlFor="pakrautos_paletes">Pakrautos paletės:</label>
+                        <input type="number" step="0.01" id="pakrautos_paletes" name="pakrautos_paletes" className="form-control" required />
+                    </div>
+                </div>
+                <div className="form-row">
+                    <div className="form-group col-md-4">
+                        <label htmlFor="atgalines_paletes">Atgalinės paletės:</label>
+                        <input type="number" step="0.01" id="atgalines_paletes" name="atgalines_paletes" className="form-control" required />
+                    </div>
+                    <div className="form-group col-md-4">
+                        <label htmlFor="tara">Tara:</label>
+                        <input type="number" step="0.01" id="tara" name="tara" className="form-control" required />
+                    </div>
+                    <div className="form-group col-md-4">
+                        <label>Savaitgalis:</label>
+                        <button 
+                            type="button"
+                            className={`btn btn-block weekend-button ${isSavaitgalis ? 'active' : ''}`}
+                            onClick={handleSavaitgalisToggle}
+                            title="Savaitgalį mokami papildomi 20% nuo atliktų darbų"
+                        >
+                            Savaitgalis
+                        </button>
+                        <input type="hidden" name="savaitgalis" value={isSavaitgalis ? 'true' : 'false'} />
+                    </div>
+                </div>
+                <button type="submit" className="btn btn-success">Pridėti įrašą</button>
+            </form>
+
+            <div className="mb-4">
+                <h2>Bendra suma</h2>
+                <div className="table-container">
+                    <table className="table table-bordered table-responsive-stack">
+                        <thead className="table-responsive-stack-thead">
+                            <tr>
+                                <th>Taškų kiekis</th>
+                                <th>Kilometrų kiekis</th>
+                                <th>Pakrautos paletės</th>
+                                <th>Tara</th>
+                                <th>Atgalinės paletės</th>
+                                <th>EUR už reisą</th>
+                            </tr>
+                        </thead>
+                        <tbody>
+                            <tr>
+                                <td data-label="Taškų kiekis">{bendraSuma.tasku_kiekis.toFixed(2)}</td>
+                                <td data-label="Kilometrų kiekis">{bendraSuma.km_kiekis.toFixed(2)}</td>
+                                <td data-label="Pakrautos paletės">{bendraSuma.pakrautos_paletes.toFixed(2)}</td>
+                                <td data-label="Tara">{bendraSuma.tara.toFixed(2)}</td>
+                                <td data-label="Atgalinės paletės">{bendraSuma.atgalines_paletes.toFixed(2)}</td>
+                                <td data-label="EUR už reisą">{bendraSuma.eur_uz_reisa.toFixed(2)}</td>
+                            </tr>
+                        </tbody>
+                    </table>
+                </div>
+            </div>
+
+            <h2>Įrašų sąrašas</h2>
+            <div className="table-container">
+                <table className="table table-striped table-responsive-stack">
+                    <thead className="table-responsive-stack-thead">
+                        <tr>
+                            <th onClick={toggleKryptis} style={{ cursor: 'pointer' }} title="Keisti rikiavimą">
+                                Data {kryptis === 'desc' ? '▼' : '▲'}
+                            </th>
+                            <th>Auto Nr.</th>
+                            <th>Taškai</th>
+                            <th>KM</th>
+                            <th>Paletės</th>
+                            <th>Tara</th>
+                            <th>Atg. paletės</th>
+                            <th>EUR</th>
+                            <th>Savaitgalis</th>
+                            <th>Veiksmai</th>
+                        </tr>
+                    </thead>
+                    <tbody>
+                        {visiIrasai.map(irasas => (
+                            <tr key={irasas.id} id={`row-${irasas.id}`}>
+                                <td data-label="Data">{irasas.data}</td>
+                                <td data-label="Auto Nr.">{irasas.auto_nr}</td>
+                                <td data-label="Taškai">{irasas.tasku_kiekis.toFixed(2)}</td>
+                                <td data-label="KM">{irasas.km_kiekis.toFixed(2)}</td>
+                                <td data-label="Paletės">{irasas.pakrautos_paletes.toFixed(2)}</td>
+                                <td data-label="Tara">{irasas.tara.toFixed(2)}</td>
+                                <td data-label="Atg. paletės">{irasas.atgalines_paletes.toFixed(2)}</td>
+                                <td data-label="EUR">{irasas.eur_uz_reisa.toFixed(2)}</td>
+                                <td data-label="Savaitgalis">{irasas.savaitgalis ? 'Taip' : 'Ne'}</td>
+                                <td data-label="Veiksmai">
+                                    <a href={`/edit/${irasas.id}`} className="btn btn-sm btn-warning mr-2">Redaguoti</a>
+                                    <button onClick={() => handleDelete(irasas.id)} className="btn btn-sm btn-danger">Ištrinti</button>
+                                </td>
+                            </tr>
+                        ))}
+                    </tbody>
+                </table>
+                <div ref={pabaiga}></div>
+                {kraunama && <p className="text-muted">Kraunama...</p>}
+                {!kraunama && kitas && (
+                    <button onClick={() => loadPage(kitas, kryptis)} className="btn btn-outline-primary mb-4">Rodyti daugiau</button>
+                )}
+                {!kraunama && !kitas && visiIrasai.length === 0 && (
+                    <p className="text-muted">Šį mėnesį įrašų nėra.</p>
+                )}
+            </div>
+        </div>
+    );
+}
+
+ReactDOM.render(<App />, document.getElementById('root'));
+    
@@ -0,0 +1,163 @@
+"""Parduotuvių darbo laikas kaip intervalai.
+
+Laisvo teksto laukai verčiami į store_hours eilutes: savaitės diena
+(0 – pirmadienis), rūšis ir [nuo, iki) minutėmis nuo paros pradžios, todėl
+"kas dirba dabar" – viena indeksuota užklausa, be teksto skaidymo.
+
+  darbo_laikas              – I–V darbo laikas
+  sestadienio_darbo_laikas  – VI
+  sekmadienio_darbo_laikas  – VII
+  darbuotoju_darbo_laikas   – prekių priėmimas: tomis dienomis, kai
+                              parduotuvė dirba (be žinomo laiko – I–V)
+
+Atpažįstama: '07–22', '7.00-22.00', '07:00 - 22:00', '8-12, 13-17',
+'22-06' (per vidurnaktį), '24/7' ar 'visą parą', 'nedirba'. Vienas laikas
+('06:00') – pradžia, pabaiga imama iš tos dienos darbo laiko, o jo nežinant –
+paros pabaiga. Tuščia, '?' ir neatpažintas tekstas – laikas nežinomas
+(eilučių nėra).
+"""
+import re
+from datetime import datetime
+from zoneinfo import ZoneInfo
+from flask import current_app
+from sqlalchemy import delete, insert
+from models import db, Store, StoreHours
+
+DARBO = 'darbo'
+PRIEMIMO = 'priemimo'
+RUSYS = (DARBO, PRIEMIMO)
+PAROS_MINUTES = 24 * 60
+DARBO_DIENOS = range(5)
+
+LAIKAS = r'(\d{1,2})(?:[.:](\d{2}))?'
+INTERVALAS = re.compile(LAIKAS + r'\s*[-–—]\s*' + LAIKAS)
+VIENAS_LAIKAS = re.compile(r'^\s*' + LAIKAS + r'\s*$')
+VISA_PARA = re.compile(r'^\s*(24/7|24\s*h|visą parą|visa para)\s*$', re.I)
+NEDIRBA = re.compile(r'^\s*(nedirba|uždaryta|uzdaryta|ne)\s*\.?\s*$', re.I)
+
+
+class Neatpazinta(ValueError):
+    pass
+
+
+def minutes(valandos, minutes_):
+    valandos, minutes_ = int(valandos), int(minutes_ or 0)
+    if valandos > 24 or minutes_ > 59 or (valandos == 24 and minutes_):
+        raise Neatpazinta(f"Neteisingas laikas {valandos}:{minutes_:02d}")
+    return valandos * 60 + minutes_
+
+
+def parse(tekstas):
+    """Grąžina [(nuo, iki), ...] minutėmis; iki gali būti None (žinoma tik pradžia).
+
+    None – laikas nežinomas, [] – nedirba. iki < nuo reiškia darbą per vidurnaktį.
+    Neatpažintam tekstui – Neatpazinta.
+    """
+    tekstas = (tekstas or '').strip()
+    if not tekstas or tekstas.strip('?') == '':
+        return None
+    if NEDIRBA.match(tekstas):
+        return []
+    if VISA_PARA.match(tekstas):
+        return [(0, PAROS_MINUTES)]
+    vienas = VIENAS_LAIKAS.match(tekstas)
+    if vienas:
+        return [(minutes(*vienas.groups()), None)]
+    intervalai = [
+        (minutes(v1, m1), minutes(v2, m2))
+        for v1, m1, v2, m2 in INTERVALAS.findall(tekstas)
+    ]
+    # Likęs tekstas turi būti tik skyrikliai, kitaip kažko nesupratome
+    if not intervalai or re.sub(r'[\s,;]', '', INTERVALAS.sub('', tekstas)):
+        raise Neatpazinta(f"Neatpažintas darbo laikas: {tekstas!r}")
+    return intervalai
+
+
+def day_rows(diena, nuo, iki):
+    """(diena, nuo, iki) eilutės; intervalas per vidurnaktį padalijamas į dvi dienas."""
+    if iki == nuo:
+        return []
+    if iki > nuo:
+        return [(diena, nuo, iki)]
+    eilutes = [(diena, nuo, PAROS_MINUTES)]
+    if iki:
+        eilutes.append(((diena + 1) % 7, 0, iki))
+    return eilutes
+
+
+def store_intervals(store):
+    """Grąžina ([(diena, rusis, nuo, iki), ...], [neatpažinti laukai])."""
+    neatpazinti = []
+
+    def nuskaityti(laukas):
+        try:
+            return parse(getattr(store, laukas))
+        except Neatpazinta:
+            neatpazinti.append(laukas)
+            return None
+
+    dienos = {}
+    for laukas, savaites_dienos in (('darbo_laikas', DARBO_DIENOS),
+                                     ('sestadienio_darbo_laikas', (5,)),
+                                     ('sekmadienio_darbo_laikas', (6,))):
+        intervalai = nuskaityti(laukas)
+        if intervalai is not None:
+            for diena in savaites_dienos:
+                dienos[diena] = intervalai
+
+    def rows(diena, rusis, intervalai):
+        eilutes = []
+        for nuo, iki in intervalai:
+            if iki is None:
+                # Vienas laikas: iki tos dienos darbo pabaigos, jei ji vėliau, kitaip iki paros pabaigos
+                pabaigos = [i for n, i in dienos.get(diena) or [] if i is not None and i > nuo]
+                iki = pabaigos[-1] if pabaigos else PAROS_MINUTES
+            eilutes += [(d, rusis, n, i) for d, n, i in day_rows(diena, nuo, iki)]
+        return eilutes
+
+    eilutes = []
+    for diena, intervalai in dienos.items():
+        eilutes += rows(diena, DARBO, intervalai)
+
+    priemimas = nuskaityti('darbuotoju_darbo_laikas')
+    if priemimas is not None:
+        for diena in [d for d, intervalai in dienos.items() if intervalai] or DARBO_DIENOS:
+            eilutes += rows(diena, PRIEMIMO, priemimas)
+    return eilutes, neatpazinti
+
+
+def sync(store):
+    """Perrašo parduotuvės store_hours eilutes pagal jos tekstinius laukus (be commit).
+
+    Grąžina neatpažintų laukų sąrašą.
+    """
+    eilutes, neatpazinti = store_intervals(store)
+    db.session.execute(delete(StoreHours).where(StoreHours.store_id == store.id))
+    if eilutes:
+        db.session.execute(insert(StoreHours), [
+            {'store_id': store.id, 'diena': diena, 'rusis': rusis, 'nuo': nuo, 'iki': iki}
+            for diena, rusis, nuo, iki in eilutes
+        ])
+    return neatpazinti
+
+
+def local_now():
+    return datetime.now(ZoneInfo(current_app.config.get('STORE_TIMEZONE', 'Europe/Vilnius')))
+
+
+def open_at(laikas, rusis=DARBO):
+    """Parduotuvės, kurios laiku `laikas` dirba (DARBO) arba priima prekes (PRIEMIMO)."""
+    minute = laikas.hour * 60 + laikas.minute
+    return (
+        Store.query
+        .join(StoreHours, StoreHours.store_id == Store.id)
+        .filter(
+            StoreHours.rusis == rusis,
+            StoreHours.diena == laikas.weekday(),
+            StoreHours.nuo <= minute,
+            StoreHours.iki > minute,
+        )
+        .distinct()
+        .order_by(Store.pavadinimas)
+        .all()
+    )
@@ -0,0 +1,154 @@
+"""Parduotuvių autocomplete indeksas procese.
+
+Pavadinimų ir adresų trigramos laikomos atmintyje (trigrama -> parduotuvių
+sąrašas), todėl paieška vykdoma be DB užklausos. Tekstas lyginamas be
+diakritikos ir didžiųjų raidžių, o atitikimas vertinamas pagal tai, kokią
+užklausos trigramų dalį turi parduotuvė – taip randama ir su rašybos
+klaida ("maksima" -> "Maxima"). Paskutinis žodis laikomas nebaigtu, kad
+veiktų kaip prefiksas.
+
+Indeksas sukuriamas pirmą kartą jo prireikus ir perkuriamas, kai pasikeičia
+talpyklos srities 'stores' versija arba praėjus MAX_AGE sekundžių. Atskiro
+invalidavimo nėra: visi parduotuvių rašymai (store_routes pridėjimas,
+redagavimas, trynimas ir komanda geocode-stores) po commit kviečia
+cache.bump('stores'), o get_index() prieš kiekvieną paiešką palygina tą
+versiją. Su Redis tai mato visi worker'iai ir CLI procesai; be Redis (ar
+Redis nepasiekus) kiti procesai pakeitimą pamato per MAX_AGE.
+"""
+import math
+import re
+import threading
+import time
+import unicodedata
+from extensions import cache
+from models import Store
+
+# Ta pati sritis kaip store_routes.STORES_CACHE
+SRITIS = 'stores'
+MAX_AGE = 300
+# Mažiausia užklausos trigramų dalis, kurią turi turėti rezultatas
+SLENKSTIS = 0.4
+# Kiek vieno lygio atitikmenų (abėcėlės tvarka) rikiuojama pagal pavadinimo atitikimą
+RANK_CAP = 200
+ZODIS = re.compile(r'\w+')
+
+_lock = threading.Lock()
+_index = {'indeksas': None, 'versija': None, 'sukurta': 0.0}
+
+
+def fold(tekstas):
+    """'Šiaulių g.' -> 'siauliu g.'"""
+    skaidytas = unicodedata.normalize('NFKD', tekstas or '')
+    return ''.join(c for c in skaidytas if not unicodedata.combining(c)).casefold()
+
+
+def trigrams(zodis, baigtas=True):
+    # Kaip pg_trgm: du tarpai prieš žodį ir vienas po jo
+    zodis = '  ' + zodis + (' ' if baigtas else '')
+    return {zodis[i:i + 3] for i in range(len(zodis) - 2)}
+
+
+def text_trigrams(tekstas):
+    rezultatas = set()
+    for zodis in ZODIS.findall(fold(tekstas)):
+        rezultatas |= trigrams(zodis)
+    return rezultatas
+
+
+class StoreIndex:
+    def __init__(self, parduotuves):
+        """parduotuves – (id, pavadinimas, adresas) sąrašas, rikiuotas pagal pavadinimą."""
+        self.parduotuves = []
+        self.pavadinimai = []
+        sarasai = {}
+        for nr, (store_id, pavadinimas, adresas) in enumerate(parduotuves):
+            self.parduotuves.append({'id': store_id, 'pavadinimas': pavadinimas, 'adresas': adresas})
+            self.pavadinimai.append(fold(pavadinimas))
+            for trigrama in text_trigrams(pavadinimas) | text_trigrams(adresas):
+                sarasai.setdefault(trigrama, []).append(nr)
+        # Trigrama -> bitų aibė (int), kur bitas nr reiškia parduotuvę nr
+        self.trigramos = {}
+        for trigrama, numeriai in sarasai.items():
+            bitai = bytearray(len(self.parduotuves) // 8 + 1)
+            for nr in numeriai:
+                bitai[nr >> 3] |= 1 << (nr & 7)
+            self.trigramos[trigrama] = int.from_bytes(bitai, 'little')
+        self.visi = (1 << len(self.parduotuves)) - 1
+
+    def __len__(self):
+        return len(self.parduotuves)
+
+    def search(self, query, limit=20):
+        zodziai = ZODIS.findall(fold(query))
+        if not zodziai:
+            return []
+        uzklausa = set()
+        for i, zodis in enumerate(zodziai):
+            uzklausa |= trigrams(zodis, baigtas=i < len(zodziai) - 1)
+
+        # lygiai[j] – parduotuvės, turinčios bent j užklausos trigramų
+        n = len(uzklausa)
+        lygiai = [self.visi] + [0] * (n + 1)
+        for k, trigrama in enumerate(uzklausa, 1):
+            bitai = self.trigramos.get(trigrama, 0)
+            if bitai:
+                for j in range(k, 0, -1):
+                    lygiai[j] |= lygiai[j - 1] & bitai
+
+        fraze = ' '.join(zodziai)
+        rezultatai = []
+        for j in range(n, max(math.ceil(SLENKSTIS * n), 1) - 1, -1):
+            numeriai = set_bits(lygiai[j] & ~lygiai[j + 1], RANK_CAP)
+            # Tame pačiame lygyje pirmiau tie, kurių pavadinimas prasideda ar turi užklausą
+            numeriai.sort(key=lambda nr: (
+                0 if self.pavadinimai[nr].startswith(fraze) else 1 if fraze in self.pavadinimai[nr] else 2,
+                len(self.pavadinimai[nr])
+            ))
+            rezultatai.extend(self.parduotuves[nr] for nr in numeriai)
+            if len(rezultatai) >= limit:
+                break
+        return rezultatai[:limit]
+
+
+def set_bits(bitai, kiek):
+    """Pirmųjų kiek įjungtų bitų numeriai."""
+    eilute = bin(bitai)[:1:-1]
+    numeriai = []
+    nr = eilute.find('1')
+    while nr != -1 and len(numeriai) < kiek:
+        numeriai.append(nr)
+        nr = eilute.find('1', nr + 1)
+    return numeriai
+
+
+def build():
+    eilutes = Store.query.with_entities(Store.id, Store.pavadinimas, Store.adresas).order_by(Store.pavadinimas).all()
+    return StoreIndex(eilutes)
+
+
+def current_version():
+    try:
+        return cache.backend.version(SRITIS)
+    except Exception:
+        # Be talpyklos liekame prie MAX_AGE
+        return _index['versija']
+
+
+def _stale(versija):
+    return (_index['indeksas'] is None or _index['versija'] != versija
+            or _index['sukurta'] + MAX_AGE < time.monotonic())
+
+
+def get_index():
+    versija = current_version()
+    if _stale(versija):
+        with _lock:
+            if _stale(versija):
+                _index['indeksas'] = build()
+                _index['versija'] = versija
+                _index['sukurta'] = time.monotonic()
+    return _index['indeksas']
+
+
+def autocomplete(query, limit=20):
+    return get_index().search(query, limit)
@@ -1,35 +1,104 @@
+from datetime import datetime
 from flask import Blueprint, render_template, request, jsonify, flash, redirect, url_for
 from flask_login import login_required, current_user
 from models import db, Store
-from sqlalchemy import or_
+from extensions import cache
+from store_search import search_stores
+import store_index
+import geo
+import store_hours
+import versions
 
 store_bp = Blueprint('store', __name__)
 
+# Talpyklos sritis; kiekvienas parduotuvių pakeitimas ją invaliduoja
+STORES_CACHE = 'stores'
+AUTOCOMPLETE_LIMIT = 20
+AUTOCOMPLETE_MAX = 50
+NEARBY_LIMIT = 10
+NEARBY_MAX = 100
+
 @store_bp.route('/store_catalog')
 @login_required
 def store_catalog():
-    return render_template('store_catalog.html')
+    # Sąrašas kraunamas atskirai, puslapis priklauso tik nuo šablono ir teisių
+    zyme = versions.stamp([], current_user.is_admin, sablonas='store_catalog.html')
+    atsakymas = versions.not_modified(zyme)
+    if atsakymas is not None:
+        return atsakymas
+    return versions.with_stamp(render_template('store_catalog.html'), zyme)
 
 @store_bp.route('/get_store_list')
 @login_required
 def get_store_list():
-    stores = Store.query.all()
-    store_list = [f"{store.pavadinimas} - {store.adresas}" for store in stores]
-    return jsonify(store_list)
+    zyme = versions.stamp([versions.STORES])
+    atsakymas = versions.not_modified(zyme)
+    if atsakymas is not None:
+        return atsakymas
+
+    def sarasas():
+        return [f"{store.pavadinimas} - {store.adresas}" for store in Store.query.all()]
+    return versions.with_stamp(jsonify(cache.cached(STORES_CACHE, 'list', sarasas)), zyme)
 
 @store_bp.route('/store/search')
 @login_required
 def store_search():
     query = request.args.get('query', '')
-    stores = Store.query.filter(or_(
-        Store.pavadinimas.ilike(f'%{query}%'),
-        Store.adresas.ilike(f'%{query}%'),
-        Store.apskritis.ilike(f'%{query}%')
-    )).all()
+
+    stores = cache.cached(STORES_CACHE, f'search:{query}', lambda: search_stores(query))
     if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
-        return render_template('store_search_results.html', stores=stores, query=query)
+        # Tik rezultatų fragmentas, be viso HTML dokumento
+        return render_template('store_search_results.html', stores=stores, query=query, ajax=True)
     return render_template('store_catalog.html', stores=stores, query=query)
 
+@store_bp.route('/store/autocomplete')
+@login_required
+def store_autocomplete():
+    # Atsakoma iš atminties indekso, be DB užklausos
+    query = request.args.get('q', '')
+    limit = max(min(request.args.get('limit', AUTOCOMPLETE_LIMIT, type=int), AUTOCOMPLETE_MAX), 1)
+    return jsonify([
+        dict(store, url=url_for('store.store_detail', store_id=store['id']))
+        for store in store_index.autocomplete(query, limit)
+    ])
+
+@store_bp.route('/store/nearby')
+@login_required
+def store_nearby():
+    # ?lat=54.68&lng=25.27[&n=10][&radius_km=20] – artimiausios pagal atstumą, su atstumas_km
+    platuma = request.args.get('lat', type=float)
+    ilguma = request.args.get('lng', type=float)
+    kiek = request.args.get('n', NEARBY_LIMIT, type=int)
+    spindulys = request.args.get('radius_km', type=float)
+    if platuma is None or ilguma is None or not geo.valid(platuma, ilguma):
+        return jsonify({"success": False, "message": "Nurodykite teisingas lat ir lng koordinates"}), 400
+    if spindulys is not None and spindulys < 0:
+        return jsonify({"success": False, "message": "radius_km negali būti neigiamas"}), 400
+    stores = geo.nearby(platuma, ilguma, max(min(kiek, NEARBY_MAX), 1), spindulys)
+    return jsonify([dict(store, url=url_for('store.store_detail', store_id=store['id'])) for store in stores])
+
+@store_bp.route('/store/open')
+@login_required
+def store_open():
+    # ?at=2026-10-20T06:30 (numatyta – dabar, STORE_TIMEZONE) &rusis=darbo|priemimo
+    rusis = request.args.get('rusis', store_hours.DARBO)
+    if rusis not in store_hours.RUSYS:
+        return jsonify({"success": False, "message": "rusis turi būti darbo arba priemimo"}), 400
+    try:
+        laikas = datetime.fromisoformat(request.args['at']) if request.args.get('at') else store_hours.local_now()
+    except ValueError:
+        return jsonify({"success": False, "message": "at turi būti YYYY-MM-DDTHH:MM"}), 400
+    stores = store_hours.open_at(laikas, rusis)
+    return jsonify({
+        'laikas': laikas.strftime('%Y-%m-%d %H:%M'),
+        'rusis': rusis,
+        'parduotuves': [
+            {'id': store.id, 'pavadinimas': store.pavadinimas, 'adresas': store.adresas,
+             'url': url_for('store.store_detail', store_id=store.id)}
+            for store in stores
+        ],
+    })
+
 @store_bp.route('/store/<int:store_id>')
 @login_required
 def store_detail(store_id):
@@ -54,8 +123,13 @@ def add_store():
             sekmadienio_darbo_laikas=request.form['sekmadienio_darbo_laikas'],
             google_maps_nuoroda=request.form['google_maps_nuoroda']
         )
+        geo.update_coordinates(new_store)
         db.session.add(new_store)
+        db.session.flush()
+        store_hours.sync(new_store)
+        versions.bump(versions.STORES)
         db.session.commit()
+        cache.bump(STORES_CACHE)
         flash('Nauja parduotuvė sėkmingai pridėta!', 'success')
         return redirect(url_for('store.store_catalog'))
     return render_template('add_store.html')
@@ -69,6 +143,8 @@ def edit_store(store_id):
     
     store = Store.query.get_or_404(store_id)
     if request.method == 'POST':
+        # Koordinatės perskaičiuojamos tik pasikeitus jų šaltiniui (išskleistos --resolve neprarandamos)
+        saltinis = (store.google_maps_nuoroda, store.apskritis)
         store.pavadinimas = request.form['pavadinimas']
         store.adresas = request.form['adresas']
         store.apskritis = request.form['apskritis']
@@ -77,7 +153,12 @@ def edit_store(store_id):
         store.sestadienio_darbo_laikas = request.form['sestadienio_darbo_laikas']
         store.sekmadienio_darbo_laikas = request.form['sekmadienio_darbo_laikas']
         store.google_maps_nuoroda = request.form['google_maps_nuoroda']
+        if (store.google_maps_nuoroda, store.apskritis) != saltinis:
+            geo.update_coordinates(store)
+        store_hours.sync(store)
+        versions.bump(versions.STORES)
         db.session.commit()
+        cache.bump(STORES_CACHE)
         flash('Parduotuvės informacija atnaujinta!', 'success')
         return redirect(url_for('store.store_detail', store_id=store.id))
     return render_template('edit_store.html', store=store)
@@ -91,6 +172,8 @@ def delete_store(store_id):
     
     store = Store.query.get_or_404(store_id)
     db.session.delete(store)
+    versions.bump(versions.STORES)
     db.session.commit()
+    cache.bump(STORES_CACHE)
     flash('Parduotuvė ištrinta!', 'success')
     return redirect(url_for('store.store_catalog'))
\ No newline at end of file
@@ -0,0 +1,65 @@
+"""Parduotuvių paieška.
+
+SQLite – per FTS5 lentelę store_fts (kuriama migracijoje, sinchronizuojama
+trigeriais): kiekvienas užklausos žodis ieškomas kaip žodžio pradžia, be
+diakritikos ("siaul" randa "Šiauliai"), rezultatai rikiuojami pagal bm25,
+kur pavadinimo atitikimas sveria daugiausia.
+
+Kitose DB arba kai store_fts nėra (pvz. DB sukurta su create_all) – ILIKE
+per visus tris stulpelius, kaip anksčiau.
+"""
+import re
+from sqlalchemy import inspect, or_, text
+from models import db, Store
+
+RESULT_LIMIT = 50
+# bm25 svoriai: pavadinimas, adresas, apskritis
+SVORIAI = (10.0, 5.0, 1.0)
+ZODIS = re.compile(r'\w+')
+
+_fts = {}
+
+
+def fts_available():
+    raktas = str(db.engine.url)
+    if raktas not in _fts:
+        # Per sesijos prisijungimą – rašančioje užklausoje antras prisijungimas lauktų jos užrakto
+        _fts[raktas] = db.engine.dialect.name == 'sqlite' and inspect(db.session.connection()).has_table('store_fts')
+    return _fts[raktas]
+
+
+def match_expression(query):
+    """'Šiaul maxi' -> '"Šiaul"* AND "maxi"*' (None, jei žodžių nėra)."""
+    zodziai = ZODIS.findall(query)
+    if not zodziai:
+        return None
+    return ' AND '.join(f'"{zodis}"*' for zodis in zodziai)
+
+
+def search_fts(query, limit):
+    israiska = match_expression(query)
+    if israiska is None:
+        return []
+    eilutes = db.session.execute(text(f"""
+        SELECT store.id, store.pavadinimas, store.adresas
+        FROM store_fts JOIN store ON store.id = store_fts.rowid
+        WHERE store_fts MATCH :israiska
+        ORDER BY bm25(store_fts, {', '.join(map(str, SVORIAI))})
+        LIMIT :limit
+    """), {'israiska': israiska, 'limit': limit})
+    return [{'id': e.id, 'pavadinimas': e.pavadinimas, 'adresas': e.adresas} for e in eilutes]
+
+
+def search_like(query, limit):
+    stores = Store.query.filter(or_(
+        Store.pavadinimas.ilike(f'%{query}%'),
+        Store.adresas.ilike(f'%{query}%'),
+        Store.apskritis.ilike(f'%{query}%')
+    )).order_by(Store.pavadinimas).limit(limit).all()
+    return [{'id': store.id, 'pavadinimas': store.pavadinimas, 'adresas': store.adresas} for store in stores]
+
+
+def search_stores(query, limit=RESULT_LIMIT):
+    if fts_available():
+        return search_fts(query, limit)
+    return search_like(query, limit)
@@ -0,0 +1,196 @@
+from sqlalchemy import bindparam, func, insert, update
+from models import db, RideResult, MonthlyTotal, VehicleMonthlyTotal
+import versions
+
+# Laukai, kurių sumos laikomos monthly_total ir vehicle_monthly_total lentelėse
+SUMUOJAMI_LAUKAI = ('tasku_kiekis', 'km_kiekis', 'pakrautos_paletes', 'tara', 'atgalines_paletes', 'eur_uz_reisa')
+MENESIO_RAKTAS = ('user_id', 'menesis')
+AUTO_RAKTAS = ('user_id', 'menesis', 'vehicle_id')
+
+
+def tuscia_suma():
+    return {laukas: 0.0 for laukas in SUMUOJAMI_LAUKAI}
+
+
+def get_totals(user_id, menesis):
+    suma = db.session.get(MonthlyTotal, (user_id, menesis))
+    if suma is None:
+        return tuscia_suma()
+    return {laukas: float(getattr(suma, laukas) or 0) for laukas in SUMUOJAMI_LAUKAI}
+
+
+def add_ride(irasas, zenklas=1):
+    """Prideda įrašą prie jo mėnesio ir automobilio mėnesio sumų (zenklas=-1 – atima).
+
+    Kviečiama toje pačioje transakcijoje kaip ir ride_result pakeitimas,
+    todėl commit'as įrašo abu arba nė vieno. Kartu didinamas vartotojo
+    reisų skaitiklis (versions.py).
+    """
+    pokyciai = {laukas: zenklas * float(getattr(irasas, laukas) or 0) for laukas in SUMUOJAMI_LAUKAI}
+    apply_delta(irasas.user_id, irasas.menesis, pokyciai, zenklas)
+    _apply_table_deltas(
+        VehicleMonthlyTotal.__table__, AUTO_RAKTAS,
+        {(irasas.user_id, irasas.menesis, irasas.vehicle_id): dict(pokyciai, irasu_kiekis=zenklas)}
+    )
+    versions.bump(versions.rides_key(irasas.user_id))
+
+
+def remove_ride(irasas):
+    add_ride(irasas, -1)
+
+
+def apply_delta(user_id, menesis, pokyciai, irasu_pokytis=0):
+    if db.session.get(MonthlyTotal, (user_id, menesis)) is None:
+        db.session.add(MonthlyTotal(user_id=user_id, menesis=menesis, irasu_kiekis=0, **tuscia_suma()))
+        db.session.flush()
+
+    # Didiname SQL pusėje, kad lygiagrečios užklausos neprarastų viena kitos pokyčių
+    reiksmes = {'irasu_kiekis': MonthlyTotal.irasu_kiekis + irasu_pokytis}
+    for laukas, pokytis in pokyciai.items():
+        reiksmes[laukas] = getattr(MonthlyTotal, laukas) + pokytis
+    db.session.execute(
+        update(MonthlyTotal)
+        .where(MonthlyTotal.user_id == user_id, MonthlyTotal.menesis == menesis)
+        .values(**reiksmes)
+        .execution_options(synchronize_session='fetch')
+    )
+
+
+
+def apply_deltas(pokyciai):
+    """Daugelio mėnesių pokyčiai vienu kartu (importui, perskaičiavimui).
+
+    pokyciai – {(user_id, menesis, vehicle_id): {'irasu_kiekis': n, laukas: pokytis, ...}}.
+    Pridedama prie vehicle_monthly_total ir, sudėjus automobilius, prie
+    monthly_total.
+    """
+    if not pokyciai:
+        return
+    menesiu = {}
+    for (user_id, menesis, _), suma in pokyciai.items():
+        bendra = menesiu.setdefault((user_id, menesis), {})
+        for laukas, pokytis in suma.items():
+            bendra[laukas] = bendra.get(laukas, 0) + pokytis
+    _apply_table_deltas(MonthlyTotal.__table__, MENESIO_RAKTAS, menesiu)
+    _apply_table_deltas(VehicleMonthlyTotal.__table__, AUTO_RAKTAS, pokyciai)
+    versions.bump(*[versions.rides_key(user_id) for user_id, _ in menesiu])
+
+
+def _apply_table_deltas(lentele, raktas, pokyciai):
+    """Trūkstamos eilutės įterpiamos vienu executemany, sumos didinamos
+    vienu executemany UPDATE, vis tiek SQL pusėje."""
+    esami = set(db.session.execute(
+        db.select(*[lentele.c[stulpelis] for stulpelis in raktas])
+        .where(*[lentele.c[stulpelis].in_({r[i] for r in pokyciai}) for i, stulpelis in enumerate(raktas)])
+    ).tuples())
+    nauji = [
+        dict(zip(raktas, r), irasu_kiekis=0, **tuscia_suma())
+        for r in pokyciai if r not in esami
+    ]
+    if nauji:
+        db.session.execute(insert(lentele), nauji)
+
+    laukai = ('irasu_kiekis',) + SUMUOJAMI_LAUKAI
+    db.session.execute(
+        update(lentele)
+        .where(*[lentele.c[stulpelis] == bindparam(f'k_{stulpelis}') for stulpelis in raktas])
+        .values({laukas: lentele.c[laukas] + bindparam(f'p_{laukas}') for laukas in laukai}),
+        [
+            dict({f'k_{stulpelis}': r[i] for i, stulpelis in enumerate(raktas)},
+                 **{f'p_{laukas}': suma.get(laukas, 0) for laukas in laukai})
+            for r, suma in pokyciai.items()
+        ]
+    )
+
+def compute_from_rides(user_id=None, raktas=MENESIO_RAKTAS):
+    """Suskaičiuoja sumas tiesiai iš ride_result (GROUP BY raktas, pvz. user_id, menesis)."""
+    stulpeliai = [getattr(RideResult, stulpelis) for stulpelis in raktas]
+    uzklausa = db.session.query(
+        *stulpeliai,
+        func.count(RideResult.id),
+        *[func.coalesce(func.sum(getattr(RideResult, laukas)), 0) for laukas in SUMUOJAMI_LAUKAI]
+    ).group_by(*stulpeliai)
+    if user_id is not None:
+        uzklausa = uzklausa.filter(RideResult.user_id == user_id)
+
+    n = len(raktas)
+    sumos = {}
+    for eilute in uzklausa:
+        sumos[tuple(eilute[:n])] = dict(
+            irasu_kiekis=eilute[n],
+            **{laukas: float(reiksme) for laukas, reiksme in zip(SUMUOJAMI_LAUKAI, eilute[n + 1:])}
+        )
+    return sumos
+
+
+def find_mismatches(tolerancija=1e-6):
+    """Grąžina (lentelė, raktas, laukas, knygoje, is_irasu) skirtumų sąrašą."""
+    skirtumai = []
+    for modelis, raktas in ((MonthlyTotal, MENESIO_RAKTAS), (VehicleMonthlyTotal, AUTO_RAKTAS)):
+        tikros = compute_from_rides(raktas=raktas)
+        knygoje = {tuple(getattr(s, stulpelis) for stulpelis in raktas): s for s in modelis.query.all()}
+        for r in sorted(set(tikros) | set(knygoje)):
+            tikra = tikros.get(r, dict(irasu_kiekis=0, **tuscia_suma()))
+            eilute = knygoje.get(r)
+            for laukas in ('irasu_kiekis',) + SUMUOJAMI_LAUKAI:
+                reiksme = getattr(eilute, laukas) if eilute is not None else 0
+                if abs((reiksme or 0) - tikra[laukas]) > tolerancija:
+                    skirtumai.append((modelis.__tablename__, r, laukas, reiksme, tikra[laukas]))
+    return skirtumai
+
+
+def rebuild():
+    """Perrašo monthly_total ir vehicle_monthly_total pagal ride_result. Grąžina eilučių skaičių."""
+    eiluciu = 0
+    # Sumos puslapiuose gali pasikeisti – seni ETag'ai nebegalioja
+    vartotojai = set(db.session.scalars(db.select(MonthlyTotal.user_id).distinct()))
+    for modelis, raktas in ((MonthlyTotal, MENESIO_RAKTAS), (VehicleMonthlyTotal, AUTO_RAKTAS)):
+        sumos = compute_from_rides(raktas=raktas)
+        vartotojai |= {r[0] for r in sumos}
+        modelis.query.delete()
+        db.session.add_all([
+            modelis(**dict(zip(raktas, r)), **reiksmes)
+            for r, reiksmes in sumos.items()
+        ])
+        eiluciu += len(sumos)
+    versions.bump(*[versions.rides_key(user_id) for user_id in vartotojai])
+    db.session.commit()
+    return eiluciu
+
+
+def monthly_series(user_id, nuo=None, iki=None, vehicle_id=None):
+    """Vartotojo sumos pagal mėnesius grafikams.
+
+    Be datų filtro skaitoma iš monthly_total (arba vehicle_monthly_total,
+    jei nurodytas automobilis), su datomis – GROUP BY menesis per
+    ride_result (naudoja user_id indeksus).
+    """
+    if nuo is None and iki is None:
+        knyga = MonthlyTotal if vehicle_id is None else VehicleMonthlyTotal
+        uzklausa = knyga.query.filter(knyga.user_id == user_id, knyga.irasu_kiekis > 0)
+        if vehicle_id is not None:
+            uzklausa = uzklausa.filter(knyga.vehicle_id == vehicle_id)
+        eilutes = uzklausa.order_by(knyga.menesis).all()
+        return [
+            dict(menesis=eilute.menesis, irasu_kiekis=eilute.irasu_kiekis,
+                 **{laukas: float(getattr(eilute, laukas) or 0) for laukas in SUMUOJAMI_LAUKAI})
+            for eilute in eilutes
+        ]
+
+    uzklausa = db.session.query(
+        RideResult.menesis,
+        func.count(RideResult.id),
+        *[func.coalesce(func.sum(getattr(RideResult, laukas)), 0) for laukas in SUMUOJAMI_LAUKAI]
+    ).filter(RideResult.user_id == user_id)
+    if nuo is not None:
+        uzklausa = uzklausa.filter(RideResult.data >= nuo)
+    if iki is not None:
+        uzklausa = uzklausa.filter(RideResult.data <= iki)
+    if vehicle_id is not None:
+        uzklausa = uzklausa.filter(RideResult.vehicle_id == vehicle_id)
+
+    return [
+        dict(menesis=eilute[0], irasu_kiekis=eilute[1],
+             **{laukas: float(reiksme) for laukas, reiksme in zip(SUMUOJAMI_LAUKAI, eilute[2:])})
+        for eilute in uzklausa.group_by(RideResult.menesis).order_by(RideResult.menesis)
+    ]
@@ -0,0 +1,96 @@
+"""Prisijungusio vartotojo talpykla flask_login user_loader'iui.
+
+Kiekvienai užklausai user_loader anksčiau darė User.query.get(). Dabar procese laikoma vartotojo kopija (CachedUser: id, username, email,
+is_admin) USER_CACHE_TTL sekundžių.
+
+Ištrintu pažymėtas vartotojas (user.istrinta) neįkeliamas – jo sesija
+nebegalioja. Pakeitus vartotoją (trynimas, administratoriaus ar slaptažodžio
+atstatymas) kviečiama invalidate(): išvaloma šio proceso kopija ir
+padidinama 'users' talpyklos srities versija – su CACHE_REDIS_URL ją mato
+visi worker'iai, be jo kiti procesai atsinaujina po TTL.
+
+Todėl kopija tinka tik skaitymui ir rodymui. Rašančios užklausos
+(models.write_request: ne GET, taip pat RASYMAI_PER_GET) vartotoją visada įkelia iš DB, o administratoriaus
+teisės tikrinamos per confirmed_admin() – ištrintas ar teisių netekęs
+vartotojas nieko nepakeis ir kitame worker'yje.
+"""
+import threading
+import time
+from flask import current_app
+from flask_login import UserMixin, current_user
+from extensions import cache
+from models import db, User, write_request
+
+SRITIS = 'users'
+DEFAULT_TTL = 60
+
+_lock = threading.Lock()
+# user_id -> (CachedUser, srities versija, galioja_iki)
+_users = {}
+
+
+class CachedUser(UserMixin):
+    """Vartotojo kopija be sesijos; ORM objektui – db.session.get(User, current_user.id)."""
+
+    def __init__(self, id, username, email, is_admin):
+        self.id = id
+        self.username = username
+        self.email = email
+        self.is_admin = is_admin
+
+    def __repr__(self):
+        return f'<CachedUser {self.username}>'
+
+
+def _version():
+    try:
+        return cache.backend.version(SRITIS)
+    except Exception:
+        return None
+
+
+def load(user_id):
+    ttl = current_app.config.get('USER_CACHE_TTL', DEFAULT_TTL)
+    if not ttl:
+        user = db.session.get(User, user_id)
+        return user if user is not None and user.istrinta is None else None
+    if write_request():
+        return confirm(user_id)
+    irasas = _users.get(user_id)
+    if irasas is not None and irasas[1] == _version() and irasas[2] > time.monotonic():
+        return irasas[0]
+    return confirm(user_id)
+
+
+def confirm(user_id):
+    """Vartotojas iš DB (atnaujinama ir šio proceso kopija); ištrintas ar nerastas – None."""
+    versija = _version()
+    user = db.session.get(User, user_id)
+    if user is None or user.istrinta is not None:
+        with _lock:
+            _users.pop(user_id, None)
+        return None
+    kopija = CachedUser(user.id, user.username, user.email, bool(user.is_admin))
+    ttl = current_app.config.get('USER_CACHE_TTL', DEFAULT_TTL)
+    if ttl:
+        with _lock:
+            _users[user_id] = (kopija, versija, time.monotonic() + ttl)
+    return kopija
+
+
+def confirmed_admin():
+    """Ar prisijungęs vartotojas tebėra administratorius – tikrinama DB, ne kopija."""
+    if not current_user.is_authenticated:
+        return False
+    user = confirm(current_user.id)
+    return user is not None and user.is_admin
+
+
+def invalidate(user_id=None):
+    """Pamiršta vartotoją (None – visus) šiame procese ir kituose per srities versiją."""
+    with _lock:
+        if user_id is None:
+            _users.clear()
+        else:
+            _users.pop(user_id, None)
+    cache.bump(SRITIS)
@@ -0,0 +1,66 @@
+"""Vartotojo ir visų jo duomenų trynimas fone.
+
+Administratoriui ištrynus vartotoją, šis iškart pažymimas ištrintu
+(user.istrinta) – nebegali prisijungti ir nerodomas – o reisai trinami
+foniniu darbu dalimis: SELECT id ... WHERE user_id = ? ORDER BY data, id
+LIMIT n, tada DELETE ... WHERE id IN. Dalis imama indekso (user_id, data)
+tvarka – su WHERE id > paskutinis_id ORDER BY id kiekvienai daliai būtų
+rikiuojami visi likę vartotojo reisai. Ištrintos eilutės iš indekso
+išnyksta, todėl kita dalis vėl imama nuo pradžios, o nutrūkęs darbas tiesiog
+tęsiamas; paskutinis_id rodo tik eigą. Kiekviena dalis – atskira
+trumpa transakcija, todėl kiti vairuotojai gali rašyti ir trynimo metu, o
+eiga matoma administratoriaus skydelyje. Pabaigoje ištrinamos monthly_total,
+vehicle_monthly_total sumos ir pats vartotojas; per ON DELETE CASCADE kartu išnyksta ir reisai,
+įrašyti po paskutinės dalies.
+"""
+import time
+from sqlalchemy import delete, func, select
+from models import db, User, RideResult, MonthlyTotal, VehicleMonthlyTotal
+import jobs
+import user_cache
+
+TIPAS = 'purge_user'
+CHUNK_SIZE = 2000
+# Sekundės tarp dalių: SQLite be jų kitų rašymų busy_timeout laukimas vis prasilenkia su
+# tarpu tarp dalių ir jie laukia viso trynimo
+PAUSE = 0.05
+
+
+def create_purge_job(user, chunk_size=None, pauze=None):
+    """chunk_size, pauze – None: CHUNK_SIZE, PAUSE vykdymo metu."""
+    parametrai = {'user_id': user.id, 'username': user.username, 'chunk_size': chunk_size, 'pauze': pauze}
+    viso = db.session.scalar(select(func.count(RideResult.id)).where(RideResult.user_id == user.id))
+    return jobs.create_job(TIPAS, parametrai, viso)
+
+
+def purge_chunk(job, user_id, chunk_size):
+    """Ištrina vieną reisų dalį. Grąžina ištrintų įrašų skaičių (0 – reisų neliko)."""
+    ids = db.session.scalars(
+        select(RideResult.id)
+        .where(RideResult.user_id == user_id)
+        .order_by(RideResult.data, RideResult.id)
+        .limit(chunk_size)
+    ).all()
+    if not ids:
+        return 0
+    db.session.execute(
+        delete(RideResult).where(RideResult.id.in_(ids)).execution_options(synchronize_session=False)
+    )
+    jobs.save_progress(job, max(ids), len(ids), len(ids))
+    return len(ids)
+
+
+@jobs.handler(TIPAS)
+def run_purge(job):
+    parametrai = job.params
+    user_id = parametrai['user_id']
+    chunk_size = parametrai.get('chunk_size') or CHUNK_SIZE
+    pauze = PAUSE if parametrai.get('pauze') is None else parametrai['pauze']
+    while purge_chunk(job, user_id, chunk_size):
+        if pauze:
+            time.sleep(pauze)
+    db.session.execute(delete(MonthlyTotal).where(MonthlyTotal.user_id == user_id))
+    db.session.execute(delete(VehicleMonthlyTotal).where(VehicleMonthlyTotal.user_id == user_id))
+    db.session.execute(delete(User).where(User.id == user_id, User.istrinta.is_not(None)))
+    db.session.commit()
+    user_cache.invalidate(user_id)
@@ -0,0 +1,93 @@
+"""Automobilių registras (vehicle).
+
+Anksčiau automobilių numeriai buvo sąrašas main_routes.CAR_NUMBERS, kurį
+kiekvienas puslapis įdėdavo į HTML, o ride_result.auto_nr buvo laisvas
+tekstas. Dabar reisas rodo į automobilį per ride_result.vehicle_id, o
+sumos pagal automobilį (vehicle_monthly_total, parko suvestinė, grafikų
+filtras) skaičiuojamos pagal sveikąjį vehicle_id.
+
+Pasirinkimo sąrašą formos gauna iš /api/vehicles (su ETag). Sąrašas
+laikomas talpyklos srityje 'vehicles', kurią invaliduoja kiekvienas
+registro pakeitimas (invalidate()). Be Redis kiti worker'iai jį mato tik
+po TTL, todėl talpykla naudojama tik rodymui – ar reisą galima įrašyti su
+šiuo automobiliu, resolve() ir id_map() tikrina DB.
+"""
+import hashlib
+import json
+import re
+from sqlalchemy import select
+from extensions import cache
+from models import db, Vehicle
+
+SRITIS = 'vehicles'
+NUMERIO_FORMATAS = re.compile(r'^[A-Z0-9-]{2,20}$')
+
+
+def normalize(numeris):
+    return re.sub(r'\s+', '', str(numeris or '')).upper()
+
+
+def validate(numeris):
+    """Sutvarkytas numeris; neteisingas – ValueError."""
+    numeris = normalize(numeris)
+    if not NUMERIO_FORMATAS.match(numeris):
+        raise ValueError(f'Neteisingas automobilio numeris "{numeris}"')
+    return numeris
+
+
+def _picker():
+    automobiliai = [
+        {'id': v.id, 'numeris': v.numeris, 'aktyvus': v.aktyvus}
+        for v in db.session.scalars(select(Vehicle).order_by(Vehicle.numeris))
+    ]
+    etag = hashlib.sha1(json.dumps(automobiliai, sort_keys=True).encode()).hexdigest()[:16]
+    return {'etag': etag, 'automobiliai': automobiliai}
+
+
+def picker():
+    """{'etag': ..., 'automobiliai': [{'id', 'numeris', 'aktyvus'}, ...]} rūšiuota pagal numerį."""
+    return cache.cached(SRITIS, 'picker', _picker)
+
+
+def resolve(vehicle_id=None, numeris=None, tik_aktyvus=True, leisti_id=None):
+    """Randa automobilį DB pagal id arba numerį. Grąžina (id, numeris).
+
+    tik_aktyvus – neaktyvūs atmetami, išskyrus leisti_id (pvz. redaguojamo
+    reiso esamą automobilį). Nerastas – ValueError.
+    """
+    uzklausa = select(Vehicle.id, Vehicle.numeris, Vehicle.aktyvus)
+    if vehicle_id not in (None, ''):
+        try:
+            vehicle_id = int(vehicle_id)
+        except (TypeError, ValueError):
+            raise ValueError(f'Neteisingas automobilio id "{vehicle_id}"')
+        automobilis = db.session.execute(uzklausa.where(Vehicle.id == vehicle_id)).first()
+    else:
+        numeris = normalize(numeris)
+        automobilis = db.session.execute(uzklausa.where(Vehicle.numeris == numeris)).first()
+    if automobilis is None:
+        raise ValueError(f'Nežinomas automobilis "{vehicle_id or numeris}"')
+    if tik_aktyvus and not automobilis.aktyvus and automobilis.id != leisti_id:
+        raise ValueError(f'Automobilis {automobilis.numeris} nebenaudojamas')
+    return automobilis.id, automobilis.numeris
+
+
+def id_map():
+    """Numeris -> id visiems (ir neaktyviems) automobiliams iš DB – vieną kartą importui."""
+    return dict(db.session.execute(select(Vehicle.numeris, Vehicle.id)).all())
+
+
+def ensure(numeriai, aktyvus=True):
+    """Įrašo trūkstamus automobilius (su commit). Grąžina numeris -> id."""
+    numeriai = {validate(numeris) for numeris in numeriai}
+    esami = set(db.session.scalars(select(Vehicle.numeris).where(Vehicle.numeris.in_(numeriai))))
+    nauji = [Vehicle(numeris=numeris, aktyvus=aktyvus) for numeris in sorted(numeriai - esami)]
+    if nauji:
+        db.session.add_all(nauji)
+        db.session.commit()
+        invalidate()
+    return dict(db.session.execute(select(Vehicle.numeris, Vehicle.id).where(Vehicle.numeris.in_(numeriai))).all())
+
+
+def invalidate():
+    cache.bump(SRITIS)
@@ -0,0 +1,112 @@
+"""Pakeitimų skaitikliai ir sąlyginiai HTTP atsakymai (ETag, Last-Modified, 304).
+
+Puslapiai ir API anksčiau kiekvieno apsilankymo metu skaičiuodavo ir
+siųsdavo visą turinį. Dabar kiekvienam duomenų rinkiniui lentelėje
+data_version laikomas skaitiklis:
+
+  'rides:<user_id>' – didinamas su kiekvienu vartotojo reisų pakeitimu
+                      (totals.py, kurį kviečia visi ride_result rašymai);
+  'stores'          – su parduotuvių pakeitimais.
+
+Skaitiklis didinamas toje pačioje transakcijoje kaip ir duomenys.
+Maršrutas pirmiausia nuskaito savo skaitiklius (PK užklausa) ir, jei
+naršyklės If-None-Match sutampa, grąžina 304 neliesdamas pačių duomenų.
+
+ETag'ą sudaro skaitikliai ir kitos atsakymą lemiančios dalys (parametrai,
+vartotojas). HTML puslapiams pridedama šablono ir front-end failų
+(manifest) maiša, kad po diegimo naršyklė gautų naują puslapį.
+"""
+import hashlib
+import json
+from datetime import datetime
+from flask import current_app, make_response, request
+from sqlalchemy import insert, select, update
+from werkzeug.http import is_resource_modified
+from models import db, DataVersion
+import assets
+
+STORES = 'stores'
+
+# šablono vardas -> maiša (procese; debug režimu skaičiuojama kaskart)
+_sablonai = {}
+
+
+def rides_key(user_id):
+    return f'rides:{user_id}'
+
+
+def bump(*raktai):
+    """Padidina skaitiklius. Be commit – įrašoma kartu su duomenų pakeitimu."""
+    raktai = set(raktai)
+    if not raktai:
+        return
+    esami = set(db.session.scalars(select(DataVersion.raktas).where(DataVersion.raktas.in_(raktai))))
+    dabar = datetime.utcnow()
+    nauji = [{'raktas': raktas, 'versija': 0, 'pakeista': dabar} for raktas in sorted(raktai - esami)]
+    if nauji:
+        db.session.execute(insert(DataVersion), nauji)
+    db.session.execute(
+        update(DataVersion)
+        .where(DataVersion.raktas.in_(raktai))
+        .values(versija=DataVersion.versija + 1, pakeista=dabar)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def current(*raktai):
+    """{raktas: (versija, pakeista)}; dar nekeisti – (0, None)."""
+    if not raktai:
+        return {}
+    eilutes = {
+        eilute.raktas: (eilute.versija, eilute.pakeista)
+        for eilute in db.session.execute(
+            select(DataVersion.raktas, DataVersion.versija, DataVersion.pakeista)
+            .where(DataVersion.raktas.in_(raktai))
+        )
+    }
+    return {raktas: eilutes.get(raktas, (0, None)) for raktas in raktai}
+
+
+def _template_hash(vardas):
+    if vardas not in _sablonai or current_app.debug:
+        saltinis = current_app.jinja_env.loader.get_source(current_app.jinja_env, vardas)[0]
+        manifest = json.dumps(assets.load_manifest(), sort_keys=True)
+        _sablonai[vardas] = hashlib.sha1((saltinis + manifest).encode()).hexdigest()[:12]
+    return _sablonai[vardas]
+
+
+def stamp(raktai, *dalys, sablonas=None):
+    """Atsakymo žymė (etag, pakeista) pagal skaitiklius ir kitas dalis.
+
+    Skaitikliai nuskaitomi prieš duomenis: jei tarp jų kas nors įrašoma,
+    atsakymas tik naujesnis už žymę, todėl kitą kartą grąžinamas 200, ne
+    klaidingas 304.
+    """
+    versijos = current(*raktai)
+    turinys = [[raktas, versija] for raktas, (versija, _) in sorted(versijos.items())] + list(dalys)
+    if sablonas is not None:
+        turinys += [sablonas, _template_hash(sablonas)]
+    etag = hashlib.sha1(json.dumps(turinys, sort_keys=True, default=str).encode()).hexdigest()[:20]
+    pakeista = max((pakeista for _, pakeista in versijos.values() if pakeista), default=None)
+    return etag, pakeista
+
+
+def not_modified(zyme):
+    """304 atsakymas, jei naršyklės kopija dar tinka, kitaip None."""
+    etag, pakeista = zyme
+    if request.method not in ('GET', 'HEAD'):
+        return None
+    if is_resource_modified(request.environ, etag=etag, last_modified=pakeista):
+        return None
+    return with_stamp(current_app.response_class(status=304), zyme)
+
+
+def with_stamp(atsakymas, zyme):
+    """Prideda ETag, Last-Modified ir Cache-Control: naršyklė kaskart klausia, bet gali gauti 304."""
+    etag, pakeista = zyme
+    atsakymas = make_response(atsakymas)
+    atsakymas.set_etag(etag)
+    if pakeista is not None:
+        atsakymas.last_modified = pakeista
+    atsakymas.headers['Cache-Control'] = 'private, no-cache'
+    return atsakymas